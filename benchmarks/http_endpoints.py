@@ -0,0 +1,430 @@
+"""
+HTTP benchmark of the main endpoints: latency percentiles, throughput, database
+round trips and allocations per request.
+
+Drives the real app factory, `src.app.get_app`, either in-process through
+`httpx.ASGITransport` or over a socket through uvicorn, and compares the results
+with the committed baseline in `benchmarks/baselines/http_endpoints.json`. Latency
+and throughput baselines are only meaningful on the machine that recorded them;
+refresh them with `--update-baseline` after an intended change.
+
+It needs a migrated database configured through the usual environment variables;
+every user it creates is deleted when it finishes.
+
+Usage:
+    python -m benchmarks.http_endpoints [--mode in-process|uvicorn]
+        [--concurrency N] [--requests N] [--scenario NAME ...] [--update-baseline]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import socket
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Union
+from uuid import uuid4
+
+import httpx
+import uvicorn
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from src.app import get_app
+from src.configs.envs import Config
+from src.database.models.user_types import UserType
+from src.database.models.users import User
+from src.database.session import db, init_db
+from src.utils.auth_util import get_password_hash
+from src.utils.enums import UserTypeEnum
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "http_endpoints.json"
+PASSWORD = "B3nchmark!Password"
+WARMUP_REQUESTS = 5
+ALLOCATION_SAMPLES = 20
+
+# Metrics compared with the baseline, and whether a higher value is better.
+COMPARED_METRICS = {
+    "errors": False,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "throughput_rps": True,
+    "round_trips_per_request": False,
+    "allocated_kib_per_request": False,
+}
+# Metrics that must not grow at all, whatever the tolerance.
+STRICT_METRICS = {"errors", "round_trips_per_request"}
+# Scenarios hashing a password, which hold a hashing pool slot for most of the
+# request. They run at most at the pool's concurrency: beyond it, requests only
+# queue for a slot and the latencies measure the queue, up to its timeout.
+HASHING_SCENARIOS = {"login", "register"}
+
+
+class StatementCounter:
+    """Counts statements sent to the database through any engine."""
+
+    def __init__(self):
+        self.count = 0
+        event.listen(Engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+class BenchmarkContext:
+    """State shared by the scenarios of a run."""
+
+    def __init__(self):
+        self.run_id = uuid4().hex[:12]
+        self.email = f"benchmark-{self.run_id}@example.com"
+        self.token: Union[str, None] = None
+        self._registered = itertools.count()
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    def next_email(self) -> str:
+        return f"benchmark-{self.run_id}-{next(self._registered)}@example.com"
+
+
+Scenario = Callable[[httpx.AsyncClient, BenchmarkContext], Awaitable[httpx.Response]]
+
+
+async def login(client: httpx.AsyncClient, ctx: BenchmarkContext) -> httpx.Response:
+    return await client.post(
+        "/auth/token", data={"username": ctx.email, "password": PASSWORD}
+    )
+
+
+async def me(client: httpx.AsyncClient, ctx: BenchmarkContext) -> httpx.Response:
+    return await client.get("/user/me", headers=ctx.headers)
+
+
+async def verify_token(
+    client: httpx.AsyncClient, ctx: BenchmarkContext
+) -> httpx.Response:
+    return await client.get(
+        "/auth/verify-token", params={"action": "can_read_own"}, headers=ctx.headers
+    )
+
+
+async def list_users(
+    client: httpx.AsyncClient, ctx: BenchmarkContext
+) -> httpx.Response:
+    return await client.get("/user/", params={"limit": 100}, headers=ctx.headers)
+
+
+async def register(client: httpx.AsyncClient, ctx: BenchmarkContext) -> httpx.Response:
+    return await client.post(
+        "/user/register",
+        json={
+            "name": "Benchmark User",
+            "email": ctx.next_email(),
+            "password": PASSWORD,
+        },
+    )
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    "login": login,
+    "me": me,
+    "verify_token": verify_token,
+    "list_users": list_users,
+    "register": register,
+}
+
+
+@dataclass
+class ScenarioResult:
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput_rps: float
+    round_trips_per_request: float
+    allocated_kib_per_request: float
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    ctx: BenchmarkContext,
+    scenario: Scenario,
+    requests: int,
+    concurrency: int,
+    counter: StatementCounter,
+) -> ScenarioResult:
+    for _ in range(WARMUP_REQUESTS):
+        await scenario(client, ctx)
+
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def worker() -> None:
+        nonlocal errors
+        for _ in remaining:
+            started_at = time.perf_counter()
+            response = await scenario(client, ctx)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    statements_before = counter.count
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started_at
+    round_trips = (counter.count - statements_before) / requests
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return ScenarioResult(
+        requests=requests,
+        errors=errors,
+        p50_ms=round(quantiles[49], 3),
+        p95_ms=round(quantiles[94], 3),
+        p99_ms=round(quantiles[98], 3),
+        throughput_rps=round(requests / elapsed, 1),
+        round_trips_per_request=round(round_trips, 2),
+        allocated_kib_per_request=round(
+            await measure_allocations(client, ctx, scenario), 1
+        ),
+    )
+
+
+async def measure_allocations(
+    client: httpx.AsyncClient, ctx: BenchmarkContext, scenario: Scenario
+) -> float:
+    """
+    Mean peak of memory allocated while serving one request, in KiB.
+
+    Requests are sent one at a time so the peaks do not overlap. The figure
+    includes the client's own allocations.
+    """
+    samples: List[int] = []
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOCATION_SAMPLES):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            await scenario(client, ctx)
+            samples.append(tracemalloc.get_traced_memory()[1] - before)
+    finally:
+        tracemalloc.stop()
+    return statistics.fmean(samples) / 1024
+
+
+async def create_benchmark_user(ctx: BenchmarkContext) -> None:
+    engine = init_db(
+        db_url=Config.DATABASE.DB_URL, engine_args=Config.DATABASE.ENGINE_ARGS
+    )
+    async with db(commit_on_exit=True):
+        user_type = await UserType.get_by_title(UserTypeEnum.ADMIN)
+        await User.new(
+            name="Benchmark Admin",
+            email=ctx.email,
+            password=get_password_hash(PASSWORD),
+            user_type_id=user_type.id,
+        )
+    await engine.dispose()
+
+
+async def delete_benchmark_users(ctx: BenchmarkContext) -> None:
+    engine = init_db(
+        db_url=Config.DATABASE.DB_URL, engine_args=Config.DATABASE.ENGINE_ARGS
+    )
+    async with db(commit_on_exit=True):
+        users = await User.get_all(User.email.like(f"benchmark-{ctx.run_id}%"))
+        await User.delete_many([user.id for user in users])
+    await engine.dispose()
+
+
+class UvicornThread:
+    """Serves the app with uvicorn on a free local port, in a background thread."""
+
+    def __init__(self):
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+        self.server = uvicorn.Server(
+            uvicorn.Config(
+                get_app,
+                factory=True,
+                host="127.0.0.1",
+                port=self.port,
+                log_level="warning",
+            )
+        )
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    def __enter__(self) -> str:
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("uvicorn failed to start.")
+            time.sleep(0.05)
+        return f"http://127.0.0.1:{self.port}"
+
+    def __exit__(self, *exc_info):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+def scenario_concurrency(name: str, concurrency: int) -> int:
+    if name in HASHING_SCENARIOS:
+        return min(concurrency, Config.AUTH.PASSWORD_HASHING_MAX_CONCURRENCY)
+    return concurrency
+
+
+async def run(
+    mode: str, scenarios: List[str], requests: int, concurrency: int
+) -> Dict[str, ScenarioResult]:
+    ctx = BenchmarkContext()
+    counter = StatementCounter()
+    await create_benchmark_user(ctx)
+    results: Dict[str, ScenarioResult] = {}
+    limits = httpx.Limits(max_connections=concurrency)
+    try:
+        with ExitStack() as stack:
+            if mode == "in-process":
+                client = httpx.AsyncClient(
+                    transport=httpx.ASGITransport(app=get_app()),
+                    base_url="http://test",
+                    limits=limits,
+                )
+            else:
+                base_url = stack.enter_context(UvicornThread())
+                client = httpx.AsyncClient(base_url=base_url, limits=limits)
+            async with client:
+                response = await login(client, ctx)
+                response.raise_for_status()
+                ctx.token = response.json()["access_token"]
+                for name in scenarios:
+                    results[name] = await run_scenario(
+                        client,
+                        ctx,
+                        SCENARIOS[name],
+                        requests,
+                        scenario_concurrency(name, concurrency),
+                        counter,
+                    )
+                    print_result(name, results[name])
+    finally:
+        await delete_benchmark_users(ctx)
+    return results
+
+
+def print_result(name: str, result: ScenarioResult) -> None:
+    print(
+        f"{name:<13} p50={result.p50_ms:.2f}ms p95={result.p95_ms:.2f}ms "
+        f"p99={result.p99_ms:.2f}ms {result.throughput_rps:.1f} req/s "
+        f"round trips/req={result.round_trips_per_request:.2f} "
+        f"alloc={result.allocated_kib_per_request:.1f}KiB "
+        f"errors={result.errors}/{result.requests}"
+    )
+
+
+def compare_with_baseline(
+    baseline: Dict[str, Dict[str, float]],
+    results: Dict[str, ScenarioResult],
+    tolerance: float,
+) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Errors and round trips per request must not grow at all; the other metrics
+    may get worse by up to `tolerance` (a fraction of the baseline value).
+
+    Returns:
+        list[str]: A description of every regression found.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        current = asdict(result)
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            expected = baseline[name].get(metric)
+            if expected is None:
+                continue
+            if metric in STRICT_METRICS:
+                # Compared as is: these are often zero in the baseline.
+                if current[metric] > expected:
+                    regressions.append(
+                        f"{name}.{metric}: {expected} -> {current[metric]}"
+                    )
+                continue
+            if not expected:
+                continue
+            change = (current[metric] - expected) / expected
+            worse = -change if higher_is_better else change
+            if worse > tolerance:
+                regressions.append(
+                    f"{name}.{metric}: {expected} -> {current[metric]} "
+                    f"({change:+.1%})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--mode", choices=("in-process", "uvicorn"), default="in-process"
+    )
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument(
+        "--scenario", action="append", choices=SCENARIOS, dest="scenarios"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        run(
+            args.mode,
+            args.scenarios or list(SCENARIOS),
+            args.requests,
+            args.concurrency,
+        )
+    )
+
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.update_baseline:
+        baselines[args.mode] = {
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "scenarios": {
+                **baselines.get(args.mode, {}).get("scenarios", {}),
+                **{name: asdict(result) for name, result in results.items()},
+            },
+        }
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if args.mode not in baselines:
+        print(f"No {args.mode} baseline in {args.baseline}, nothing to compare.")
+        return 0
+    regressions = compare_with_baseline(
+        baselines[args.mode]["scenarios"], results, args.tolerance
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print("No regression against the baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+"""
+Import time profile of a module: what a cold start or a new worker pays before
+serving its first request.
+
+Imports the module in a fresh interpreter with `-X importtime` and reports the
+slowest imports, both including (cumulative) and excluding (self) the imports they
+trigger, and the time spent importing each top-level package.
+
+Usage:
+    python -m benchmarks.import_time [MODULE] [--top N]
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile(module: str) -> List[ImportTime]:
+    """Import `module` in a new interpreter and parse its `-X importtime` report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr}")
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append(
+                ImportTime(name, int(self_us), int(cumulative_us), len(indent) // 2)
+            )
+    return imports
+
+
+def by_package(imports: List[ImportTime]) -> Dict[str, int]:
+    packages: Dict[str, int] = defaultdict(int)
+    for item in imports:
+        packages[item.module.partition(".")[0]] += item.self_us
+    return dict(sorted(packages.items(), key=lambda item: item[1], reverse=True))
+
+
+def report(module: str, top: int) -> None:
+    imports = profile(module)
+    total_us = sum(item.self_us for item in imports)
+    print(f"import {module}: {total_us / 1000:.1f}ms, {len(imports)} modules\n")
+
+    print(f"Top {top} by cumulative time:")
+    for item in sorted(imports, key=lambda item: item.cumulative_us, reverse=True)[
+        :top
+    ]:
+        print(f"  {item.cumulative_us / 1000:8.1f}ms  {item.module}")
+
+    print(f"\nTop {top} by self time:")
+    for item in sorted(imports, key=lambda item: item.self_us, reverse=True)[:top]:
+        print(f"  {item.self_us / 1000:8.1f}ms  {item.module}")
+
+    print(f"\nTop {top} packages by self time:")
+    for package, self_us in list(by_package(imports).items())[:top]:
+        print(f"  {self_us / 1000:8.1f}ms  {package}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("module", nargs="?", default="src.vercel")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+    report(args.module, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark of `User.new`: database round trips and latency per created user.
+
+Compares the previous add -> flush -> refresh implementation with the current
+single `INSERT ... RETURNING` one. It needs a migrated database configured through
+the usual environment variables; every inserted row is rolled back.
+
+Usage:
+    python -m benchmarks.model_new [ITERATIONS]
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from typing import Awaitable, Callable, List
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from src.configs.envs import Config
+from src.database.models.user_types import UserType
+from src.database.models.users import User
+from src.database.session import db, init_db
+from src.utils.enums import UserTypeEnum
+
+
+class StatementCounter:
+    """Counts statements sent to the database through an engine."""
+
+    def __init__(self, engine):
+        self.count = 0
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, *args, **kwargs):
+        self.count += 1
+
+
+async def legacy_new(**kwargs) -> User:
+    """The add -> flush -> refresh implementation `User.new` used to have."""
+    obj = User(**kwargs)
+    db.session.add(obj)
+    await db.session.flush()
+    await db.session.refresh(obj)
+    return obj
+
+
+async def measure(
+    label: str,
+    create: Callable[..., Awaitable[User]],
+    user_type_id: int,
+    iterations: int,
+    counter: StatementCounter,
+) -> None:
+    latencies: List[float] = []
+    statements_before = counter.count
+    for _ in range(iterations):
+        started_at = time.perf_counter()
+        await create(
+            name="Benchmark User",
+            email=f"benchmark-{uuid4().hex}@example.com",
+            password="not-a-real-hash",
+            user_type_id=user_type_id,
+        )
+        latencies.append((time.perf_counter() - started_at) * 1000)
+
+    round_trips = (counter.count - statements_before) / iterations
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{label:<8} round trips/op={round_trips:.2f} "
+        f"mean={statistics.fmean(latencies):.3f}ms "
+        f"p50={quantiles[49]:.3f}ms p95={quantiles[94]:.3f}ms"
+    )
+
+
+async def main(iterations: int) -> None:
+    init_db(
+        db_url=Config.DATABASE.DB_URL,
+        engine_args={**Config.DATABASE.ENGINE_ARGS, "echo": False},
+    )
+    async with db():
+        counter = StatementCounter(db.session.bind)
+        user_type = await UserType.get_by_title(UserTypeEnum.USER)
+        try:
+            await measure("before", legacy_new, user_type.id, iterations, counter)
+            await measure("after", User.new, user_type.id, iterations, counter)
+        finally:
+            await db.session.rollback()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 200))
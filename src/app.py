@@ -3,17 +3,23 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_async_sqlalchemy import SQLAlchemyMiddleware
 
 # from fastapi.responses import JSONResponse
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.inmemory import InMemoryBackend
 from loguru import logger
 
+from src.configs.cache import cache_backend
 from src.configs.envs import Config
 from src.configs.loguru import logger_config
+from src.database.pool_monitor import pool_health_monitor
+from src.database.session import dispose_engines
 from src.entrypoints import router
 from src.middlewares.logger_middleware import LoggerMiddleware
+from src.middlewares.metrics_middleware import MetricsMiddleware
+from src.middlewares.sqlalchemy_middleware import SQLAlchemyMiddleware
+from src.utils.auth_util import password_hashing_pool
+from src.utils.memory_cache import BoundedMemoryBackend
+from src.utils.user_type_table import user_type_table
 
 APP_ROOT = Path(__file__).parent
 logger.configure(**logger_config())
@@ -22,8 +28,18 @@ logger.configure(**logger_config())
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("starting up")
+    pool_health_monitor.start()
+    await user_type_table.preload()
+    response_cache = FastAPICache.get_backend()
+    if isinstance(response_cache, BoundedMemoryBackend):
+        response_cache.start_sweeper()
     yield
     logger.info("shutting down")
+    if isinstance(response_cache, BoundedMemoryBackend):
+        await response_cache.stop_sweeper()
+    await pool_health_monitor.stop()
+    await dispose_engines()
+    password_hashing_pool.shutdown()
 
 
 def get_app() -> FastAPI:
@@ -47,18 +63,22 @@ def get_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
     _app.add_middleware(
         SQLAlchemyMiddleware,
         db_url=Config.DATABASE.DB_URL,
         engine_args=Config.DATABASE.ENGINE_ARGS,
         commit_on_exit=True,
+        replica_urls=Config.DATABASE.DATABASE_REPLICA_URLS,
+        replica_strategy=Config.DATABASE.DATABASE_REPLICA_STRATEGY,
     )
     _app.add_middleware(
         LoggerMiddleware,
         logger=logger,
     )
+    _app.add_middleware(MetricsMiddleware)
     _app.include_router(router=router)
 
-    FastAPICache.init(InMemoryBackend(), prefix="fastapi-cache")
+    FastAPICache.init(cache_backend(), prefix="fastapi-cache")
     return _app
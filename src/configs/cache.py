@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+from fastapi_cache.types import Backend
+
+from src.configs.envs import Config
+from src.utils.memory_cache import BoundedMemoryBackend
+
+
+def _default_shared_memory_path() -> str:
+    directory = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(directory, "fastapi-backend-template-cache")
+
+
+def cache_backend() -> Backend:
+    """
+    Build the fastapi-cache backend selected by `Config.CACHE_BACKEND`.
+    """
+    if Config.CACHE_BACKEND == "shared_memory":
+        # Imported here as it relies on POSIX-only modules.
+        from src.utils.shared_memory_cache import SharedMemoryBackend
+
+        return SharedMemoryBackend(
+            path=Config.CACHE_SHARED_MEMORY_PATH or _default_shared_memory_path(),
+            slots=Config.CACHE_SHARED_MEMORY_SLOTS,
+            slot_size=Config.CACHE_SHARED_MEMORY_SLOT_SIZE,
+        )
+    if Config.CACHE_BACKEND == "memory":
+        return BoundedMemoryBackend(
+            max_entries=Config.CACHE_MAX_ENTRIES,
+            max_bytes=Config.CACHE_MAX_BYTES,
+            sweep_interval_seconds=Config.CACHE_SWEEP_INTERVAL_SECONDS,
+        )
+    raise ValueError(f"Unknown CACHE_BACKEND {Config.CACHE_BACKEND!r}.")
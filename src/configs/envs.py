@@ -3,8 +3,26 @@ Application's and its environment's configuration.
 """
 
 import os
+from typing import Any, Callable
 
-from sqlalchemy import URL, AsyncAdaptedQueuePool, NullPool
+
+class _Lazy:
+    """
+    Class attribute computed on first access, e.g. to defer importing SQLAlchemy
+    until the database is actually set up.
+    """
+
+    def __init__(self, compute: Callable[[type], Any]):
+        self.compute = compute
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        value = self.compute(owner)
+        # Later accesses find the value instead of this descriptor.
+        setattr(owner, self.name, value)
+        return value
 
 
 def _split_method_path(method_path: str) -> tuple[str, str]:
@@ -68,47 +86,111 @@ class DatabaseConfig:
         f"//{POSTGRES_USER}:{POSTGRES_PASSWORD}"
         f"@{POSTGRES_HOST}:{POSTGRES_PORT}/{POSTGRES_DATABASE}"
     )
-    DB_URL = URL(
-        drivername=DATABASE_DRIVERNAME,
-        username=POSTGRES_USER,
-        password=POSTGRES_PASSWORD,
-        host=POSTGRES_HOST,
-        port=POSTGRES_PORT,
-        database=POSTGRES_DATABASE,
-        query={},
-    )
+
+    @_Lazy
+    def DB_URL(cls):
+        from sqlalchemy import URL
+
+        return URL(
+            drivername=cls.DATABASE_DRIVERNAME,
+            username=cls.POSTGRES_USER,
+            password=cls.POSTGRES_PASSWORD,
+            host=cls.POSTGRES_HOST,
+            port=cls.POSTGRES_PORT,
+            database=cls.POSTGRES_DATABASE,
+            query={},
+        )
+
     POSTGRES_ECHO = os.getenv("POSTGRES_ECHO", "false").lower() == "true"
     POOL_PRE_PING = os.getenv("POOL_PRE_PING", True)
+    # "pre_ping" pings every connection on checkout; "background" skips that round
+    # trip and has the pool health monitor validate idle connections instead.
+    POOL_HEALTH_CHECK_MODE = os.getenv("POOL_HEALTH_CHECK_MODE", "pre_ping")
+    POOL_HEALTH_CHECK_INTERVAL_SECONDS = float(
+        os.getenv("POOL_HEALTH_CHECK_INTERVAL_SECONDS", "30")
+    )
     POOL_SIZE = int(os.getenv("POOL_SIZE", 5))
     MAX_OVERFLOW = int(os.getenv("MAX_OVERFLOW", 10))
 
+    DATABASE_REPLICA_URLS = tuple(
+        url.strip()
+        for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",")
+        if url.strip()
+    )
+    DATABASE_REPLICA_STRATEGY = os.getenv("DATABASE_REPLICA_STRATEGY", "round_robin")
+
     DATABASE_ENABLE_CONNECTION_POOLING = (
         os.getenv("DATABASE_ENABLE_CONNECTION_POOLING", "true").lower() == "true"
     )
 
-    _POOLING_ARGS = (
-        {
+    @_Lazy
+    def _POOLING_ARGS(cls):
+        from sqlalchemy import AsyncAdaptedQueuePool, NullPool
+
+        if not cls.DATABASE_ENABLE_CONNECTION_POOLING:
+            return {"poolclass": NullPool}
+        return {
             "poolclass": AsyncAdaptedQueuePool,
-            "pool_size": POOL_SIZE,
-            "max_overflow": MAX_OVERFLOW,
-        }
-        if DATABASE_ENABLE_CONNECTION_POOLING
-        else {
-            "poolclass": NullPool,
+            "pool_size": cls.POOL_SIZE,
+            "max_overflow": cls.MAX_OVERFLOW,
         }
-    )
 
-    ENGINE_ARGS = {
-        "echo": POSTGRES_ECHO,
-        "pool_pre_ping": POOL_PRE_PING,
-        **_POOLING_ARGS,
-    }
+    @_Lazy
+    def ENGINE_ARGS(cls):
+        return {
+            "echo": cls.POSTGRES_ECHO,
+            "pool_pre_ping": cls.POOL_PRE_PING
+            and cls.POOL_HEALTH_CHECK_MODE == "pre_ping",
+            **cls._POOLING_ARGS,
+        }
 
 
 class AuthConfig:
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     ALGORITHM: str = os.getenv("ALGORITHM")
+    # Keys of asymmetric algorithms (RS256, EdDSA, ...), one `<kid>.pem` private key
+    # per key ID. New tokens are signed with JWT_ACTIVE_KID, the last key ID in sort
+    # order by default. HMAC algorithms (HS256, ...) use SECRET_KEY instead.
+    JWT_KEYS_DIR: str = os.getenv("JWT_KEYS_DIR", "keys")
+    JWT_ACTIVE_KID: str = os.getenv("JWT_ACTIVE_KID", "")
+    # How often key files are read again, picking up rotated keys without a restart.
+    JWT_KEYS_RELOAD_SECONDS: float = float(os.getenv("JWT_KEYS_RELOAD_SECONDS", "300"))
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES"))
+    # Opt-in access tokens embedding the user's id, type, permissions and security
+    # version, so authorization needs no query. Changes to the user only revoke
+    # them on the worker making the change, so they are short-lived.
+    SELF_CONTAINED_TOKENS: bool = (
+        os.getenv("SELF_CONTAINED_TOKENS", "false").lower() == "true"
+    )
+    SELF_CONTAINED_TOKEN_EXPIRE_MINUTES: int = int(
+        os.getenv("SELF_CONTAINED_TOKEN_EXPIRE_MINUTES", "5")
+    )
+    REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+
+    TOKEN_CACHE_ENABLED: bool = (
+        os.getenv("TOKEN_CACHE_ENABLED", "true").lower() == "true"
+    )
+    TOKEN_CACHE_MAX_SIZE: int = int(os.getenv("TOKEN_CACHE_MAX_SIZE", "10000"))
+    TOKEN_CACHE_TTL_SECONDS: int = int(os.getenv("TOKEN_CACHE_TTL_SECONDS", "60"))
+    # How long a worker trusts its in-process copy of the user types table.
+    USER_TYPE_TABLE_TTL_SECONDS: float = float(
+        os.getenv("USER_TYPE_TABLE_TTL_SECONDS", "60")
+    )
+    # Most tokens a single `POST /auth/verify-token/batch` call may verify.
+    VERIFY_TOKEN_BATCH_MAX_SIZE: int = int(
+        os.getenv("VERIFY_TOKEN_BATCH_MAX_SIZE", "500")
+    )
+
+    PASSWORD_HASHING_USE_PROCESSES: bool = (
+        os.getenv("PASSWORD_HASHING_USE_PROCESSES", "true").lower() == "true"
+    )
+    PASSWORD_HASHING_POOL_SIZE: int = int(os.getenv("PASSWORD_HASHING_POOL_SIZE", "2"))
+    PASSWORD_HASHING_MAX_CONCURRENCY: int = int(
+        os.getenv("PASSWORD_HASHING_MAX_CONCURRENCY", PASSWORD_HASHING_POOL_SIZE)
+    )
+    PASSWORD_HASHING_QUEUE_TIMEOUT_SECONDS: float = float(
+        os.getenv("PASSWORD_HASHING_QUEUE_TIMEOUT_SECONDS", "5")
+    )
 
 
 class Config:
@@ -123,6 +205,11 @@ class Config:
     WORKERS_COUNT = int(os.getenv("WORKERS_COUNT", "1"))
     RELOAD = os.getenv("RELOAD", "true").lower() == "true"
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+    LOG_MODE = os.getenv("LOG_MODE", "development").lower()
+    LOG_SERIALIZE = os.getenv("LOG_SERIALIZE", "false").lower() == "true"
+    LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+    LOG_BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "256"))
+    LOG_FLUSH_INTERVAL_SECONDS = float(os.getenv("LOG_FLUSH_INTERVAL_SECONDS", "0.05"))
     LOGGER_IGNORE_PATHS = _split_method_path_list_string(
         os.getenv("LOGGER_IGNORE_PATHS", "GET:/docs,GET:/openapi.json")
     )
@@ -130,12 +217,39 @@ class Config:
     LOGGER_IGNORE_INPUT_BODY_PATHS = _split_method_path_list_string(
         os.getenv(
             "LOGGER_IGNORE_INPUT_BODY_PATHS",
-            "POST:/user/register,PUT:/user/,POST:/auth/token",
+            "POST:/user/register,PUT:/user/,POST:/auth/token,POST:/user/bulk,"
+            "POST:/auth/verify-token/batch,POST:/auth/refresh",
         )
     )
 
     LOGGER_IGNORE_OUTPUT_BODY_PATHS = _split_method_path_list_string(
-        os.getenv("LOGGER_IGNORE_OUTPUT_BODY_PATHS", "POST:/auth/token")
+        os.getenv(
+            "LOGGER_IGNORE_OUTPUT_BODY_PATHS",
+            "POST:/auth/token,POST:/auth/refresh,GET:/metrics",
+        )
+    )
+
+    LOGGER_MAX_BODY_BYTES = int(os.getenv("LOGGER_MAX_BODY_BYTES", "4096"))
+    LOGGER_SINGLE_LINE = (
+        os.getenv("LOGGER_SINGLE_LINE", str(LOG_MODE == "production")).lower() == "true"
+    )
+
+    PAGINATION_DEFAULT_LIMIT = int(os.getenv("PAGINATION_DEFAULT_LIMIT", "100"))
+    PAGINATION_MAX_LIMIT = int(os.getenv("PAGINATION_MAX_LIMIT", "1000"))
+    BULK_IMPORT_CHUNK_SIZE = int(os.getenv("BULK_IMPORT_CHUNK_SIZE", "500"))
+
+    # "memory" keeps a cache per worker; "shared_memory" shares it between the
+    # workers of a host.
+    CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+    CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+    CACHE_MAX_BYTES = int(os.getenv("CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    CACHE_SWEEP_INTERVAL_SECONDS = float(
+        os.getenv("CACHE_SWEEP_INTERVAL_SECONDS", "60")
+    )
+    CACHE_SHARED_MEMORY_PATH = os.getenv("CACHE_SHARED_MEMORY_PATH")
+    CACHE_SHARED_MEMORY_SLOTS = int(os.getenv("CACHE_SHARED_MEMORY_SLOTS", "4096"))
+    CACHE_SHARED_MEMORY_SLOT_SIZE = int(
+        os.getenv("CACHE_SHARED_MEMORY_SLOT_SIZE", "4096")
     )
 
     DATABASE: DatabaseConfig = DatabaseConfig()
@@ -1,43 +1,86 @@
 import sys
 
+from src.configs.envs import Config
 from src.middlewares.logger_middleware import REQUEST_UUID
+from src.utils.log_sink import BackgroundBatchSink
+
+_PRODUCTION_FORMAT = (
+    "{time} | {level} | {name}:{function}:{line} | {extra[request_uuid]} | {message}"
+)
+
+log_sink: BackgroundBatchSink = None
 
 
 def add_request_uuid(record):
     record["extra"]["request_uuid"] = REQUEST_UUID.get()
 
 
+def _production_handlers():
+    global log_sink
+    log_sink = BackgroundBatchSink(
+        sys.stdout,
+        max_queue_size=Config.LOG_QUEUE_SIZE,
+        batch_size=Config.LOG_BATCH_SIZE,
+        flush_interval_seconds=Config.LOG_FLUSH_INTERVAL_SECONDS,
+    )
+    return [
+        {
+            "sink": log_sink,
+            "format": _PRODUCTION_FORMAT,
+            "serialize": Config.LOG_SERIALIZE,
+            "colorize": False,
+            "level": Config.LOG_LEVEL,
+        },
+    ]
+
+
+def _development_handlers():
+    return [
+        {
+            "sink": sys.stdout,
+            "format": "<green>{time}</green> | <level>{level}</level> | <cyan>{name}<white>:</white>{function}<white>:</white>{line}</cyan> | <magenta>{extra[request_uuid]}</magenta> | <white>{message}</white>",  # noqa
+            "serialize": False,
+            "level": "INFO",
+            "filter": lambda record: record["level"].name == "INFO",
+        },
+        {
+            "sink": sys.stdout,
+            "format": "<green>{time}</green> | <red>{level}</red> | <cyan>{name}<white>:</white>{function}<white>:</white>{line}</cyan> | <magenta>{extra[request_uuid]}</magenta> | <red>{message}</red>",  # noqa
+            "serialize": False,
+            "level": "ERROR",
+            "filter": lambda record: record["level"].name == "ERROR",
+        },
+        {
+            "sink": sys.stdout,
+            "format": "<green>{time}</green> | <yellow>{level}</yellow> | <cyan>{name}<white>:</white>{function}<white>:</white>{line}</cyan> | <magenta>{extra[request_uuid]}</magenta> | <yellow>{message}</yellow>",  # noqa
+            "serialize": False,
+            "level": "WARNING",
+            "filter": lambda record: record["level"].name == "WARNING",
+        },
+        {
+            "sink": sys.stdout,
+            "format": "<green>{time}</green> | <blue>{level}</blue> | <cyan>{name}<white>:</white>{function}<white>:</white>{line}</cyan> | <magenta>{extra[request_uuid]}</magenta> | <blue>{message}</blue>",  # noqa
+            "serialize": False,
+            "level": "DEBUG",
+            "filter": lambda record: record["level"].name == "DEBUG",
+        },
+    ]
+
+
 def logger_config():
+    """
+    Build loguru's configuration.
+
+    In production mode (`LOG_MODE=production`) a single uncolorized handler writes
+    every level through a background batching sink; otherwise one colorized stdout
+    handler per level is used.
+    """
+    handlers = (
+        _production_handlers()
+        if Config.LOG_MODE == "production"
+        else _development_handlers()
+    )
     return {
-        "handlers": [
-            {
-                "sink": sys.stdout,
-                "format": "<green>{time}</green> | <level>{level}</level> | <cyan>{name}<white>:</white>{function}<white>:</white>{line}</cyan> | <magenta>{extra[request_uuid]}</magenta> | <white>{message}</white>",  # noqa
-                "serialize": False,
-                "level": "INFO",
-                "filter": lambda record: record["level"].name == "INFO",
-            },
-            {
-                "sink": sys.stdout,
-                "format": "<green>{time}</green> | <red>{level}</red> | <cyan>{name}<white>:</white>{function}<white>:</white>{line}</cyan> | <magenta>{extra[request_uuid]}</magenta> | <red>{message}</red>",  # noqa
-                "serialize": False,
-                "level": "ERROR",
-                "filter": lambda record: record["level"].name == "ERROR",
-            },
-            {
-                "sink": sys.stdout,
-                "format": "<green>{time}</green> | <yellow>{level}</yellow> | <cyan>{name}<white>:</white>{function}<white>:</white>{line}</cyan> | <magenta>{extra[request_uuid]}</magenta> | <yellow>{message}</yellow>",  # noqa
-                "serialize": False,
-                "level": "WARNING",
-                "filter": lambda record: record["level"].name == "WARNING",
-            },
-            {
-                "sink": sys.stdout,
-                "format": "<green>{time}</green> | <blue>{level}</blue> | <cyan>{name}<white>:</white>{function}<white>:</white>{line}</cyan> | <magenta>{extra[request_uuid]}</magenta> | <blue>{message}</blue>",  # noqa
-                "serialize": False,
-                "level": "DEBUG",
-                "filter": lambda record: record["level"].name == "DEBUG",
-            },
-        ],
+        "handlers": handlers,
         "patcher": add_request_uuid,
     }
@@ -0,0 +1,45 @@
+"""server side timestamp defaults
+
+Revision ID: 8c1e5a0f2d93
+Revises: 3b7f2c9d41a6
+Create Date: 2026-10-18 11:04:52.730418
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8c1e5a0f2d93"
+down_revision: Union[str, None] = "3b7f2c9d41a6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ("user_types", "users")
+COLUMNS = ("created_at", "updated_at")
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        for column in COLUMNS:
+            op.alter_column(
+                table,
+                column,
+                existing_type=sa.DateTime(timezone=True),
+                existing_nullable=False,
+                server_default=sa.text("now()"),
+            )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        for column in COLUMNS:
+            op.alter_column(
+                table,
+                column,
+                existing_type=sa.DateTime(timezone=True),
+                existing_nullable=False,
+                server_default=None,
+            )
@@ -1,35 +1,50 @@
 from __future__ import annotations
 
 import datetime
-from typing import Any, List, Union
+from typing import Any, List, Sequence, Tuple, Union
 
-from fastapi_async_sqlalchemy import db
-from sqlalchemy import DateTime, MetaData, select
+from sqlalchemy import (
+    DateTime,
+    MetaData,
+    delete,
+    func,
+    insert,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, object_session
 from sqlalchemy.sql import ColumnExpressionArgument
+from sqlalchemy.sql.base import ExecutableOption
 from typing_extensions import Self
 
+from src.database.session import db
+from src.utils.pagination import decode_cursor, encode_cursor
+
 
 class ModelBase(DeclarativeBase):
     __abstract__ = True
 
     metadata = MetaData()
     session: AsyncSession
+    # Fetch server-generated values (e.g. `updated_at`) with RETURNING on flush, so
+    # they never need to be lazy loaded afterwards.
+    __mapper_args__ = {"eager_defaults": True}
 
     id: Mapped[int] = mapped_column(
         nullable=False, primary_key=True, index=True, autoincrement=True
     )
     created_at: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.datetime.now(datetime.UTC),
+        server_default=func.now(),
         nullable=False,
     )
     updated_at: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True),
-        default=datetime.datetime.now(datetime.UTC),
+        server_default=func.now(),
         nullable=False,
-        onupdate=datetime.datetime.now(datetime.UTC),
+        onupdate=func.now(),
     )
     deleted_at: Mapped[datetime.datetime] = mapped_column(
         DateTime(timezone=True), nullable=True
@@ -37,48 +52,178 @@ class ModelBase(DeclarativeBase):
 
     @classmethod
     async def new(cls, **kwargs) -> Self:
-        obj: Self = cls(**kwargs)
-        await obj.save()
-        await db.session.flush()
-        await db.session.refresh(obj)
+        """
+        Create a row with a single `INSERT ... RETURNING` round trip.
+        """
+        (obj,) = await cls.new_many([kwargs])
         return obj
 
+    @classmethod
+    async def new_many(cls, rows: Sequence[dict]) -> List[Self]:
+        """
+        Insert many rows with multi-row `INSERT ... RETURNING` statements.
+
+        Args:
+            rows (Sequence[dict]): Column values for each new row.
+        Returns:
+            list: The created objects, in the same order as `rows`.
+        """
+        if not rows:
+            return []
+        result = await db.session.scalars(
+            insert(cls).returning(cls, sort_by_parameter_order=True), list(rows)
+        )
+        return list(result.all())
+
+    @classmethod
+    async def update_many(cls, rows: Sequence[dict]) -> None:
+        """
+        Update many rows by primary key in a single executemany round trip.
+
+        Args:
+            rows (Sequence[dict]): New column values for each row, each including
+                its `id`.
+        """
+        if rows:
+            await db.session.execute(update(cls), list(rows))
+
+    @classmethod
+    async def delete_many(cls, ids: Sequence[int]) -> int:
+        """
+        Delete many rows by primary key in a single statement.
+
+        Args:
+            ids (Sequence[int]): The IDs of the rows to delete.
+        Returns:
+            int: The number of deleted rows.
+        """
+        if not ids:
+            return 0
+        result = await db.session.execute(delete(cls).where(cls.id.in_(ids)))
+        return result.rowcount
+
+    @staticmethod
+    def _reader(from_primary: bool) -> AsyncSession:
+        """
+        The session to read with: the primary when `from_primary` is set, e.g. for
+        rows a write is about to depend on, as a lagging replica could still return
+        a version the primary already changed.
+        """
+        return db.session if from_primary else db.read_session
+
     @classmethod
     async def get_all(
-        cls, *criterion: ColumnExpressionArgument[bool], **kwargs: Any
+        cls,
+        *criterion: ColumnExpressionArgument[bool],
+        from_primary: bool = False,
+        **kwargs: Any,
     ) -> List[Self]:
         if criterion:
             stmt = select(cls).filter(*criterion)
         else:
             stmt = select(cls).filter_by(**kwargs)
-        result = await db.session.execute(stmt)
+        result = await cls._reader(from_primary).execute(stmt)
         objs = result.scalars().all()
         return objs
 
+    @classmethod
+    async def get_page(
+        cls,
+        *criterion: ColumnExpressionArgument[bool],
+        limit: int,
+        after: Union[str, None] = None,
+        options: Sequence[ExecutableOption] = (),
+    ) -> Tuple[List[Self], Union[str, None]]:
+        """
+        Retrieve a page of rows using keyset pagination over (`created_at`, `id`).
+
+        The cost of a page does not depend on how deep the client has paged, as the
+        cursor is turned into an indexed range condition instead of an OFFSET.
+
+        Args:
+            limit (int): Maximum number of rows in the page.
+            after (str | None): Opaque cursor returned with the previous page.
+            options: Loader options applied to the query.
+        Returns:
+            tuple[list, str | None]: The rows and the cursor for the next page, or
+            None if this is the last page.
+        Raises:
+            InvalidCursorError: If `after` is malformed.
+        """
+        stmt = select(cls).filter(*criterion).options(*options)
+        if after is not None:
+            stmt = stmt.filter(tuple_(cls.created_at, cls.id) > decode_cursor(after))
+        stmt = stmt.order_by(cls.created_at, cls.id).limit(limit + 1)
+        result = await db.read_session.execute(stmt)
+        objs = list(result.scalars().all())
+        if len(objs) <= limit:
+            return objs, None
+        objs = objs[:limit]
+        return objs, encode_cursor(objs[-1].created_at, objs[-1].id)
+
     @classmethod
     async def get(
-        cls, *criterion: ColumnExpressionArgument[bool], **kwargs: Any
+        cls,
+        *criterion: ColumnExpressionArgument[bool],
+        from_primary: bool = False,
+        **kwargs: Any,
     ) -> Self:
+        session = cls._reader(from_primary)
         if criterion:
-            result = await db.session.execute(select(cls).filter(*criterion))
+            result = await session.execute(select(cls).filter(*criterion))
         else:
-            result = await db.session.execute(select(cls).filter_by(**kwargs))
+            result = await session.execute(select(cls).filter_by(**kwargs))
         return result.scalars().first()
 
     @classmethod
-    async def get_by_id(cls, id: int) -> Union[Self, None]:
-        return await cls.get(cls.id == id)
+    async def get_by_id(cls, id: int, from_primary: bool = False) -> Union[Self, None]:
+        return await cls.get(cls.id == id, from_primary=from_primary)
+
+    @classmethod
+    async def get_updated_at(cls, id: int) -> Union[datetime.datetime, None]:
+        """
+        Retrieve only the `updated_at` of a row, e.g. to validate an ETag without
+        loading the row and its eager relationships.
+        """
+        result = await db.read_session.execute(
+            select(cls.updated_at).where(cls.id == id)
+        )
+        return result.scalar_one_or_none()
+
+    def _loaded_from_replica(self) -> bool:
+        session = object_session(self)
+        return session is not None and session is not db.session.sync_session
+
+    async def save(self) -> Self:
+        """
+        Add the object to the primary session.
 
-    async def save(self) -> None:
+        Objects read from a replica are merged into it instead, which loads the
+        row from the primary and returns that copy.
+        """
+        if self._loaded_from_replica():
+            return await db.session.merge(self)
         db.session.add(self)
+        return self
 
-    async def update(self, **kwargs):
+    async def update(self, **kwargs) -> Self:
+        # A clean object read from a replica can be merged without a round trip.
+        obj = (
+            await db.session.merge(self, load=False)
+            if self._loaded_from_replica()
+            else self
+        )
         for attr, value in kwargs.items():
-            setattr(self, attr, value)
-        await self.save()
+            setattr(obj, attr, value)
+        return await obj.save()
 
     async def delete(self):
-        await db.session.delete(self)
+        obj = (
+            await db.session.merge(self, load=False)
+            if self._loaded_from_replica()
+            else self
+        )
+        await db.session.delete(obj)
 
     def __repr__(self) -> str:
         attrs = {c.name: getattr(self, c.name, None) for c in self.__table__.columns}
@@ -0,0 +1,76 @@
+import datetime
+from typing import Union
+
+from sqlalchemy import DateTime, ForeignKey, String, func, select, update
+from sqlalchemy.orm import Mapped, mapped_column
+from typing_extensions import Self
+
+from src.database.models.model_base import ModelBase
+from src.database.session import db
+
+
+class RefreshToken(ModelBase):
+    """
+    A refresh token, stored as a SHA-256 digest of the opaque token.
+
+    Every login starts a family of tokens, and each refresh replaces the token used
+    by a new one of the same family.
+    """
+
+    __tablename__ = "refresh_tokens"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+    )
+    family_id: Mapped[str] = mapped_column(String(32), nullable=False, index=True)
+    token_hash: Mapped[str] = mapped_column(
+        String(64), nullable=False, unique=True, index=True
+    )
+    expires_at: Mapped[datetime.datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    # Set when the token is used (rotated) or its family revoked.
+    revoked_at: Mapped[Union[datetime.datetime, None]] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    @classmethod
+    async def get_by_token_hash_for_update(cls, token_hash: str) -> Union[Self, None]:
+        """
+        Load a token from the primary and lock its row, so concurrent refreshes
+        with the same token are serialized.
+        """
+        result = await db.session.execute(
+            select(cls).where(cls.token_hash == token_hash).with_for_update()
+        )
+        return result.scalars().first()
+
+    @classmethod
+    async def revoke_family(cls, family_id: str) -> int:
+        """
+        Revoke every unrevoked token of a family.
+
+        Returns:
+            int: The number of revoked tokens.
+        """
+        result = await db.session.execute(
+            update(cls)
+            .where(cls.family_id == family_id, cls.revoked_at.is_(None))
+            .values(revoked_at=func.now())
+        )
+        return result.rowcount
+
+    @classmethod
+    async def revoke_user(cls, user_id: int) -> int:
+        """
+        Revoke every unrevoked token of a user, e.g. once the user changed.
+
+        Returns:
+            int: The number of revoked tokens.
+        """
+        result = await db.session.execute(
+            update(cls)
+            .where(cls.user_id == user_id, cls.revoked_at.is_(None))
+            .values(revoked_at=func.now())
+        )
+        return result.rowcount
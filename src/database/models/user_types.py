@@ -30,10 +30,7 @@ class UserType(ModelBase):
     can_update_all: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
     can_delete_all: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
 
-    users: Mapped[List["User"]] = relationship(
-        back_populates="user_type_data",
-        lazy="noload",
-    )
+    users: Mapped[List["User"]] = relationship(lazy="noload")
 
     @classmethod
     async def get_by_title(cls, title: UserTypeEnum) -> Self:
@@ -1,18 +1,19 @@
-from typing import TYPE_CHECKING, Union
+from typing import Iterable, List, Set, Union
 
-from sqlalchemy import ForeignKey, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import ForeignKey, Index, String, select
+from sqlalchemy.orm import Mapped, mapped_column
 from typing_extensions import Self
 
 from src.database.models.model_base import ModelBase
-from src.utils.enums import UserTypeEnum
+from src.database.session import db
+from src.schemas.user_type import CachedUserType
+from src.utils.user_permissions import UserPermissionsMixin
+from src.utils.user_type_table import user_type_table
 
-if TYPE_CHECKING:
-    from src.database.models.user_types import UserType
 
-
-class User(ModelBase):
+class User(ModelBase, UserPermissionsMixin):
     __tablename__ = "users"
+    __table_args__ = (Index("ix_users_created_at_id", "created_at", "id"),)
 
     name: Mapped[str] = mapped_column(
         String(255), nullable=False, unique=False, index=True
@@ -30,66 +31,49 @@ class User(ModelBase):
         ForeignKey("user_types.id"), nullable=False, index=True
     )
 
-    user_type_data: Mapped["UserType"] = relationship(lazy="joined")
-
-    @classmethod
-    async def get_by_email(cls, email: str) -> Union[Self, None]:
-        return await cls.get(cls.email == email)
-
-    @property
-    def user_type_title(self) -> UserTypeEnum:
-        return self.user_type_data.title
-
-    @property
-    def is_super_admin(self) -> bool:
-        return self.user_type_title == UserTypeEnum.SUPER_ADMIN
-
-    @property
-    def is_admin(self) -> bool:
-        return self.user_type_title == UserTypeEnum.ADMIN or self.is_super_admin
-
-    @property
-    def is_internal(self) -> bool:
-        return self.user_type_title == UserTypeEnum.INTERNAL or self.is_admin
-
-    @property
-    def can_read_all(self) -> bool:
-        return self.user_type_data.can_read_all
-
-    @property
-    def can_create_all(self) -> bool:
-        return self.user_type_data.can_create_all
-
-    @property
-    def can_update_all(self) -> bool:
-        return self.user_type_data.can_update_all
-
-    @property
-    def can_delete_all(self) -> bool:
-        return self.user_type_data.can_delete_all
-
-    @property
-    def can_read_own(self) -> bool:
-        return self.user_type_data.can_read_own
+    # Bumped whenever the user changes, revoking self-contained access tokens
+    # issued with an older version.
+    security_version: Mapped[int] = mapped_column(
+        default=0, server_default="0", nullable=False
+    )
 
     @property
-    def can_create_own(self) -> bool:
-        return self.user_type_data.can_create_own
+    def user_type_data(self) -> CachedUserType:
+        """The user's type, from the in-process user type table (no join)."""
+        return user_type_table.get(self.user_type_id)
 
-    @property
-    def can_update_own(self) -> bool:
-        return self.user_type_data.can_update_own
+    @classmethod
+    async def get_by_email(
+        cls, email: str, from_primary: bool = False
+    ) -> Union[Self, None]:
+        """
+        Args:
+            from_primary (bool): Read from the primary even if replicas are
+                configured, e.g. to cache the user: a lagging replica could still
+                return a row the primary already changed.
+        """
+        return await cls.get(cls.email == email, from_primary=from_primary)
 
-    @property
-    def can_delete_own(self) -> bool:
-        return self.user_type_data.can_delete_own
+    @classmethod
+    async def get_by_emails(
+        cls, emails: Iterable[str], from_primary: bool = False
+    ) -> List[Self]:
+        """
+        Return the users owning any of the given emails, in a single query.
+
+        Args:
+            from_primary (bool): Read from the primary, see `get_by_email`.
+        """
+        return list(
+            await cls.get_all(cls.email.in_(list(emails)), from_primary=from_primary)
+        )
 
-    @property
-    def can_login(self) -> bool:
-        return (
-            self.user_type_data.can_login
-            and self.user_type_data.title is not UserTypeEnum.BLOCKED
-            and not self.is_blocked
-            and self.is_active
-            and not self.deleted_at
+    @classmethod
+    async def get_registered_emails(cls, emails: Iterable[str]) -> Set[str]:
+        """
+        Return which of the given emails already belong to a user.
+        """
+        result = await db.session.execute(
+            select(cls.email).where(cls.email.in_(list(emails)))
         )
+        return set(result.scalars().all())
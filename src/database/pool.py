@@ -0,0 +1,56 @@
+import time
+
+from sqlalchemy import AsyncAdaptedQueuePool, Pool
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """
+    `AsyncAdaptedQueuePool` counting checkouts and the time spent waiting for them.
+
+    The counters are carried over when the pool is recreated (e.g. by
+    `engine.dispose()`), so they keep growing monotonically.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_wait_seconds = 0.0
+
+    def _do_get(self):
+        start_time = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.checkouts += 1
+            self.checkout_wait_seconds += time.perf_counter() - start_time
+
+    def recreate(self) -> "InstrumentedAsyncAdaptedQueuePool":
+        pool = super().recreate()
+        pool.checkouts = self.checkouts
+        pool.checkout_wait_seconds = self.checkout_wait_seconds
+        return pool
+
+
+def instrumented_pool_class(pool_class: type) -> type:
+    """Return the instrumented equivalent of `pool_class`, when there is one."""
+    if pool_class is AsyncAdaptedQueuePool:
+        return InstrumentedAsyncAdaptedQueuePool
+    return pool_class
+
+
+def pool_stats(pool: Pool) -> dict:
+    """
+    Snapshot of a pool's usage; pools that do not track a value omit it.
+    """
+    stats = {}
+    if hasattr(pool, "size"):
+        stats["size"] = pool.size()
+    if hasattr(pool, "checkedout"):
+        stats["checked_out"] = pool.checkedout()
+    if hasattr(pool, "overflow"):
+        # Counts up from -pool_size, reaching 0 once every pooled connection is open.
+        stats["overflow"] = max(pool.overflow(), 0)
+    for name in ("checkouts", "checkout_wait_seconds"):
+        if hasattr(pool, name):
+            stats[name] = getattr(pool, name)
+    return stats
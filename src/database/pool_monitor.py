@@ -0,0 +1,188 @@
+"""
+Background health monitoring of the connection pools.
+
+The monitor periodically checks out a connection from every engine and pings it, so
+readiness probes can be answered from cached state without touching the database.
+With `validate_idle` enabled it pings every idle pooled connection instead, evicting
+dead ones, which makes per-checkout `pool_pre_ping` unnecessary.
+
+When a connection fails in a way the dialect reports as a disconnect (typically
+after a database restart), the pool is recycled once and checked again right away;
+it is not recycled again until it has been seen healthy.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Set, Union
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.configs.envs import Config
+from src.database.session import get_engines
+
+
+@dataclass(frozen=True)
+class EngineHealth:
+    healthy: bool
+    checked_at: float
+    error: Union[str, None] = None
+
+
+def _ping(connection: Connection) -> bool:
+    try:
+        return connection.dialect.do_ping(connection.connection.dbapi_connection)
+    except Exception:
+        return False
+
+
+class PoolHealthMonitor:
+    STOP_TIMEOUT_SECONDS = 5
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        validate_idle: bool,
+        engines: Callable[[], Dict[str, AsyncEngine]] = get_engines,
+    ):
+        self.interval_seconds = interval_seconds
+        self.validate_idle = validate_idle
+        # A probe should not trust a result the monitor failed to refresh twice.
+        self.stale_after_seconds = interval_seconds * 3
+        self.engines = engines
+        self.health: Dict[str, EngineHealth] = {}
+        self.evicted = 0
+        self.recycles = 0
+        self._recycle_requested: Set[str] = set()
+        self._recycled: Set[str] = set()
+        self._wakeup: Union[asyncio.Event, None] = None
+        self._task: Union[asyncio.Task, None] = None
+        self._stopping = False
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._wakeup = asyncio.Event()
+        event.listen(Engine, "handle_error", self._on_error)
+        self._task = asyncio.create_task(self._run(), name="pool-health-monitor")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        event.remove(Engine, "handle_error", self._on_error)
+        self._stopping = True
+        self._wakeup.set()
+        # Let a running check finish rather than cancelling it, as asyncpg does not
+        # cope with being cancelled in the middle of opening a connection.
+        try:
+            await asyncio.wait_for(self._task, self.STOP_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        self._task = None
+        self._stopping = False
+
+    def is_ready(self) -> bool:
+        """
+        Whether every engine was found healthy by a recent enough check.
+        """
+        engines = self.engines()
+        now = time.monotonic()
+        return bool(engines) and all(
+            (health := self.health.get(name)) is not None
+            and health.healthy
+            and now - health.checked_at <= self.stale_after_seconds
+            for name in engines
+        )
+
+    def _on_error(self, context) -> None:
+        if not context.is_disconnect:
+            return
+        for name, engine in self.engines().items():
+            if engine.sync_engine.pool is context.engine.pool:
+                self._recycle_requested.add(name)
+                if self._wakeup is not None:
+                    self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            if self._stopping:
+                return
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping:
+                return
+            self._wakeup.clear()
+
+    async def check(self) -> None:
+        """
+        Check every engine once, recycling the pools that were asked to.
+        """
+        for name, engine in self.engines().items():
+            if name in self._recycle_requested:
+                self._recycle_requested.discard(name)
+                await self._recycle(name, engine)
+            try:
+                await self._check_engine(engine)
+            except Exception as error:
+                logger.warning(f"Database health check failed for {name}: {error!r}")
+                self.health[name] = EngineHealth(
+                    healthy=False, checked_at=time.monotonic(), error=repr(error)
+                )
+                await self._recycle(name, engine)
+            else:
+                self.health[name] = EngineHealth(
+                    healthy=True, checked_at=time.monotonic()
+                )
+                self._recycled.discard(name)
+
+    async def _check_engine(self, engine: AsyncEngine) -> None:
+        """
+        Ping one connection, or every idle pooled one with `validate_idle`.
+
+        Connections are checked out one at a time, so at most one is kept away from
+        requests. Pools hand idle connections out in FIFO order, so pinging as many
+        connections as there are idle ones visits each of them once.
+
+        Raises:
+            Exception: If the database cannot be reached.
+        """
+        pool = engine.sync_engine.pool
+        idle = (
+            pool.checkedin() if self.validate_idle and hasattr(pool, "checkedin") else 0
+        )
+        alive = 0
+        for _ in range(idle):
+            async with engine.connect() as connection:
+                if await connection.run_sync(_ping):
+                    alive += 1
+                else:
+                    self.evicted += 1
+                    await connection.invalidate()
+        if alive:
+            return
+        # Once every idle connection was evicted this one is new, telling whether the
+        # database itself is reachable.
+        async with engine.connect() as connection:
+            if not await connection.run_sync(_ping):
+                await connection.invalidate()
+                raise ConnectionError("The database did not answer the ping.")
+
+    async def _recycle(self, name: str, engine: AsyncEngine) -> None:
+        if name in self._recycled:
+            return
+        self._recycled.add(name)
+        self.recycles += 1
+        logger.warning(f"Recycling the {name} database connection pool.")
+        await engine.dispose()
+
+
+pool_health_monitor = PoolHealthMonitor(
+    interval_seconds=Config.DATABASE.POOL_HEALTH_CHECK_INTERVAL_SECONDS,
+    validate_idle=Config.DATABASE.POOL_HEALTH_CHECK_MODE == "background",
+)
@@ -0,0 +1,342 @@
+"""
+Request scoped, lazily created database sessions.
+
+`db.session` returns the `AsyncSession` of the current unit of work, creating it the
+first time it is touched, so requests that never use the database never check out
+a connection. Read-only units of work always end with a rollback, and writable ones
+only commit when something was actually written.
+
+When replicas are configured, `db.read_session` hands out a session bound to one of
+them instead, until the unit of work writes (or calls `db.use_primary()`): from then
+on every read goes to the primary so the request always sees its own writes.
+"""
+
+from contextvars import Context, ContextVar, copy_context
+from typing import Callable, Dict, List, Sequence, Union
+
+from sqlalchemy import event
+from sqlalchemy.engine.url import URL
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+
+from src.database.pool import instrumented_pool_class
+
+HAS_WRITES = "has_writes"
+AFTER_COMMIT = "after_commit"
+
+
+class SessionNotInitialisedError(Exception):
+    def __init__(self):
+        super().__init__(
+            "Session not initialised! Ensure that SQLAlchemyMiddleware has been "
+            "added to the app or init_db has been called."
+        )
+
+
+class MissingSessionError(Exception):
+    def __init__(self):
+        super().__init__(
+            "No session found! Either you are not currently in a request context, "
+            "or you need to manually create a session context by using a `db` "
+            "instance as a context manager e.g.: async with db(): ..."
+        )
+
+
+class TrackingSession(Session):
+    """Session recording in `info` whether it has sent any write to the database."""
+
+
+@event.listens_for(TrackingSession, "after_flush")
+def _flagged_by_flush(session: Session, flush_context) -> None:
+    session.info[HAS_WRITES] = True
+
+
+@event.listens_for(TrackingSession, "do_orm_execute")
+def _flagged_by_execute(orm_execute_state) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info[HAS_WRITES] = True
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """
+    Whether committing the session would persist anything.
+    """
+    return bool(
+        session.info.get(HAS_WRITES) or session.new or session.dirty or session.deleted
+    )
+
+
+class ReplicaRouter:
+    """
+    Picks the replica engine a new read session is bound to.
+
+    `round_robin` cycles through the replicas; `least_busy` picks the one with the
+    fewest connections checked out of its pool, breaking ties round-robin.
+    """
+
+    STRATEGIES = ("round_robin", "least_busy")
+
+    def __init__(self, engines: Sequence[AsyncEngine], strategy: str = "round_robin"):
+        if not engines:
+            raise ValueError("At least one replica engine is required.")
+        if strategy not in self.STRATEGIES:
+            raise ValueError(
+                f"Unknown replica strategy {strategy!r}, "
+                f"expected one of {', '.join(self.STRATEGIES)}."
+            )
+        self.engines: List[AsyncEngine] = list(engines)
+        self.strategy = strategy
+        self._next = 0
+
+    @staticmethod
+    def checked_out(engine: AsyncEngine) -> int:
+        """Connections currently in use, or 0 for pools that do not track them."""
+        checked_out = getattr(engine.sync_engine.pool, "checkedout", None)
+        return checked_out() if checked_out is not None else 0
+
+    def choose(self) -> AsyncEngine:
+        start = self._next
+        self._next = (start + 1) % len(self.engines)
+        if self.strategy == "round_robin":
+            return self.engines[start]
+        candidates = self.engines[start:] + self.engines[:start]
+        return min(candidates, key=self.checked_out)
+
+
+_Session: Union[async_sessionmaker, None] = None
+_ReadOnlySession: Union[async_sessionmaker, None] = None
+_replica_router: Union[ReplicaRouter, None] = None
+_ReplicaSessions: Dict[AsyncEngine, async_sessionmaker] = {}
+_engines: Dict[str, AsyncEngine] = {}
+
+
+def get_engines() -> Dict[str, AsyncEngine]:
+    """Return the configured engines by name: `primary`, `replica_0`, ..."""
+    return dict(_engines)
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of every configured engine."""
+    for engine in _engines.values():
+        await engine.dispose()
+
+
+def init_db(
+    db_url: Union[str, URL, None] = None,
+    custom_engine: Union[AsyncEngine, None] = None,
+    engine_args: Union[Dict, None] = None,
+    session_args: Union[Dict, None] = None,
+    replica_urls: Sequence[Union[str, URL]] = (),
+    replica_strategy: str = "round_robin",
+) -> AsyncEngine:
+    """
+    Configure the engine and session factories used by `db`.
+
+    Args:
+        replica_urls: Read replicas of the primary database. Replica engines are
+            created with the same `engine_args` as the primary one.
+        replica_strategy (str): How `ReplicaRouter` picks a replica.
+    Returns:
+        AsyncEngine: The configured (primary) engine.
+    """
+    global _Session, _ReadOnlySession, _replica_router, _ReplicaSessions, _engines
+    if not custom_engine and not db_url:
+        raise ValueError("You need to pass a db_url or a custom_engine parameter.")
+    engine_args = dict(engine_args or {})
+    if "poolclass" in engine_args:
+        # Swap in the variant exposing checkout counts and wait time to /metrics.
+        engine_args["poolclass"] = instrumented_pool_class(engine_args["poolclass"])
+    engine = custom_engine or create_async_engine(db_url, **engine_args)
+    session_args = {
+        "class_": AsyncSession,
+        "sync_session_class": TrackingSession,
+        "expire_on_commit": False,
+        **(session_args or {}),
+    }
+    _Session = async_sessionmaker(engine, **session_args)
+    # Honoured by the asyncpg dialect, which then opens transactions with
+    # `BEGIN READ ONLY`; ignored by other dialects.
+    _ReadOnlySession = async_sessionmaker(
+        engine.execution_options(postgresql_readonly=True), **session_args
+    )
+    replica_engines = [
+        create_async_engine(url, **engine_args).execution_options(
+            postgresql_readonly=True
+        )
+        for url in replica_urls
+    ]
+    _replica_router = (
+        ReplicaRouter(replica_engines, replica_strategy) if replica_engines else None
+    )
+    _ReplicaSessions = {
+        replica: async_sessionmaker(replica, **session_args)
+        for replica in replica_engines
+    }
+    _engines = {
+        "primary": engine,
+        **{
+            f"replica_{index}": replica for index, replica in enumerate(replica_engines)
+        },
+    }
+    return engine
+
+
+class _UnitOfWork:
+    __slots__ = (
+        "session",
+        "replica_session",
+        "read_only",
+        "commit_on_exit",
+        "use_primary",
+    )
+
+    def __init__(self, read_only: bool, commit_on_exit: bool):
+        self.session: Union[AsyncSession, None] = None
+        self.replica_session: Union[AsyncSession, None] = None
+        self.read_only = read_only
+        self.commit_on_exit = commit_on_exit
+        self.use_primary = False
+
+
+_unit_of_work: ContextVar[Union[_UnitOfWork, None]] = ContextVar(
+    "_unit_of_work", default=None
+)
+
+
+def outside_unit_of_work() -> Context:
+    """
+    Return a copy of the current context without its unit of work, to run a task
+    that may outlive it in, e.g. one shared by several requests.
+    """
+    context = copy_context()
+    context.run(_unit_of_work.set, None)
+    return context
+
+
+def _current_unit_of_work() -> _UnitOfWork:
+    if _Session is None:
+        raise SessionNotInitialisedError()
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is None:
+        raise MissingSessionError()
+    return unit_of_work
+
+
+class DBSessionMeta(type):
+    @property
+    def session(cls) -> AsyncSession:
+        """Return the session of the current unit of work, creating it if needed."""
+        unit_of_work = _current_unit_of_work()
+        if unit_of_work.session is None:
+            factory = _ReadOnlySession if unit_of_work.read_only else _Session
+            unit_of_work.session = factory()
+        return unit_of_work.session
+
+    @property
+    def read_session(cls) -> AsyncSession:
+        """
+        Return the session reads of the current unit of work should use.
+
+        That is a replica session, created if needed, unless no replica is
+        configured or the unit of work has written or asked for the primary.
+        """
+        unit_of_work = _current_unit_of_work()
+        if not unit_of_work.use_primary and unit_of_work.session is not None:
+            unit_of_work.use_primary = has_pending_writes(unit_of_work.session)
+        if _replica_router is None or unit_of_work.use_primary:
+            return cls.session
+        if unit_of_work.replica_session is None:
+            factory = _ReplicaSessions[_replica_router.choose()]
+            unit_of_work.replica_session = factory()
+        return unit_of_work.replica_session
+
+    @property
+    def session_started(cls) -> bool:
+        """Whether the current unit of work has touched the database."""
+        unit_of_work = _unit_of_work.get()
+        return unit_of_work is not None and (
+            unit_of_work.session is not None or unit_of_work.replica_session is not None
+        )
+
+
+class db(metaclass=DBSessionMeta):
+    """
+    Unit of work context manager.
+
+    Usage:
+        async with db(commit_on_exit=True):
+            await User.new(...)
+    """
+
+    def __init__(self, commit_on_exit: bool = False, read_only: bool = False):
+        self.commit_on_exit = commit_on_exit
+        self.read_only = read_only
+        self.token = None
+
+    async def __aenter__(self):
+        if _Session is None:
+            raise SessionNotInitialisedError()
+        self.token = _unit_of_work.set(
+            _UnitOfWork(read_only=self.read_only, commit_on_exit=self.commit_on_exit)
+        )
+        return type(self)
+
+    @staticmethod
+    def use_primary() -> None:
+        """Send every remaining read of the current unit of work to the primary."""
+        _current_unit_of_work().use_primary = True
+
+    @staticmethod
+    def after_commit(callback: Callable[[], None]) -> None:
+        """
+        Call `callback` once the current unit of work has committed, e.g. to drop
+        in-process copies of the rows it changed. It is never called if the unit of
+        work is rolled back instead.
+        """
+        db.session.info.setdefault(AFTER_COMMIT, []).append(callback)
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        try:
+            await finish(failed=exc_type is not None)
+        finally:
+            _unit_of_work.reset(self.token)
+
+
+async def finish(failed: bool = False) -> None:
+    """
+    End the current unit of work's transactions, if it started any.
+
+    The session is committed only when the unit of work is writable, has
+    `commit_on_exit` set, did not fail and has something to persist; otherwise it
+    is rolled back. The `db.after_commit` callbacks run once the commit succeeded.
+    Replica sessions are always rolled back. A later access to `db.session` or
+    `db.read_session` starts a new session.
+    """
+    unit_of_work = _unit_of_work.get()
+    if unit_of_work is None:
+        return
+    replica_session, unit_of_work.replica_session = unit_of_work.replica_session, None
+    if replica_session is not None:
+        await replica_session.close()
+    if unit_of_work.session is None:
+        return
+    session, unit_of_work.session = unit_of_work.session, None
+    try:
+        if (
+            not failed
+            and not unit_of_work.read_only
+            and unit_of_work.commit_on_exit
+            and has_pending_writes(session)
+        ):
+            await session.commit()
+            for callback in session.info.pop(AFTER_COMMIT, ()):
+                callback()
+        elif session.in_transaction():
+            await session.rollback()
+    finally:
+        await session.close()
@@ -1,6 +1,13 @@
 from fastapi.routing import APIRouter
 
-from src.entrypoints import auth, monitoring, random_response, root_response, user
+from src.entrypoints import (
+    auth,
+    monitoring,
+    random_response,
+    root_response,
+    user,
+    well_known,
+)
 
 router = APIRouter()
 router.include_router(monitoring.router, tags=["Monitoring"])
@@ -10,5 +17,6 @@ router.include_router(
 router.include_router(root_response.router, prefix="", tags=["Root Response"])
 router.include_router(user.router, prefix="/user", tags=["User"])
 router.include_router(auth.router, prefix="/auth", tags=["Auth"])
+router.include_router(well_known.router, prefix="/.well-known", tags=["Auth"])
 
 __all__ = ["router"]
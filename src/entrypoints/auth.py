@@ -5,8 +5,15 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 
 from src.database.models.users import User
 from src.exceptions.http_exceptions import CredentialsException
-from src.schemas.auth import Token, VerifyTokenResponse
+from src.schemas.auth import (
+    RefreshTokenRequest,
+    Token,
+    VerifyTokenBatchRequest,
+    VerifyTokenResponse,
+)
+from src.schemas.user import Principal
 from src.services.auth import AuthService
+from src.services.refresh_token_service import RefreshTokenService
 from src.utils.enums import UserPermissionsEnum
 
 router = APIRouter()
@@ -23,23 +30,51 @@ async def login_for_access_token(
     )
     if not user:
         raise CredentialsException()
-    access_token, expires_at = AuthService.create_access_token(data={"sub": user.email})
-    return Token(access_token=access_token, token_type="bearer", expires_at=expires_at)
+    access_token, expires_at = await AuthService.create_user_access_token(user)
+    refresh_token = await RefreshTokenService().issue(user.id)
+    return Token(
+        access_token=access_token,
+        token_type="bearer",
+        expires_at=expires_at,
+        refresh_token=refresh_token,
+    )
+
+
+@router.post("/refresh", response_model=Token)
+async def refresh_access_token(body: RefreshTokenRequest) -> Token:
+    """
+    Exchange a refresh token for a new access token and a new refresh token,
+    without the password.
+
+    A refresh token can only be used once; reusing one revokes every refresh
+    token issued since the login it descends from.
+    """
+    user, refresh_token = await RefreshTokenService().rotate(body.refresh_token)
+    access_token, expires_at = await AuthService.create_user_access_token(user)
+    return Token(
+        access_token=access_token,
+        token_type="bearer",
+        expires_at=expires_at,
+        refresh_token=refresh_token,
+    )
 
 
 @router.get("/verify-token", response_model=VerifyTokenResponse)
 async def verify_token(
     action_list: Annotated[List[UserPermissionsEnum], Query(alias="action")],
-    user: Annotated[User, Depends(AuthService.get_current_active_user)],
+    user: Annotated[Principal, Depends(AuthService.get_current_active_principal)],
 ):
-    if not all(getattr(user, permission, False) for permission in action_list):
-        missing = [
-            permission
-            for permission in action_list
-            if not getattr(user, permission, False)
-        ]
-        return VerifyTokenResponse(
-            valid=False,
-            reason=f"Missing permission(s): {', '.join(missing)}",
-        )
-    return VerifyTokenResponse(valid=True)
+    return AuthService.verify_permissions(user, action_list)
+
+
+@router.post("/verify-token/batch", response_model=List[VerifyTokenResponse])
+async def verify_token_batch(
+    batch: VerifyTokenBatchRequest,
+) -> List[VerifyTokenResponse]:
+    """
+    Verify many tokens at once, each against its own list of permissions.
+
+    Unlike `/verify-token`, an invalid token does not fail the request: its verdict
+    is returned as invalid. Verdicts are returned in the order of `items`.
+    """
+    return await AuthService.verify_tokens(batch.items)
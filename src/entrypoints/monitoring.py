@@ -1,4 +1,15 @@
-from fastapi import APIRouter
+import time
+
+from fastapi import APIRouter, Response, status
+from fastapi.responses import PlainTextResponse
+from fastapi_cache import FastAPICache
+
+from src.database.pool_monitor import pool_health_monitor
+from src.schemas.cache import CacheStatsOut
+from src.schemas.health import EngineHealthOut, ReadinessOut
+from src.services.metrics_service import MetricsService
+from src.utils.memory_cache import BoundedMemoryBackend
+from src.utils.metrics import PROMETHEUS_CONTENT_TYPE
 
 router = APIRouter()
 
@@ -10,3 +21,58 @@ def health() -> None:
 
     It returns 200 if the project is healthy.
     """
+
+
+@router.get(
+    "/health/ready",
+    response_model=ReadinessOut,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": ReadinessOut}},
+)
+async def ready(response: Response) -> ReadinessOut:
+    """
+    Checks whether the project can serve traffic.
+
+    It returns 200 once every database was found healthy by a recent background
+    check, and 503 otherwise. It never opens a database connection itself.
+    """
+    now = time.monotonic()
+    readiness = ReadinessOut(
+        ready=pool_health_monitor.is_ready(),
+        engines={
+            name: EngineHealthOut(
+                healthy=health.healthy,
+                checked_seconds_ago=round(now - health.checked_at, 3),
+                error=health.error,
+            )
+            for name, health in pool_health_monitor.health.items()
+        },
+    )
+    if not readiness.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return readiness
+
+
+@router.get("/cache/stats", response_model=CacheStatsOut)
+async def cache_stats() -> CacheStatsOut:
+    """
+    Reports the usage of the response cache of this worker process.
+
+    Only the bounded memory backend tracks hits, misses and evictions; other
+    backends report their name alone.
+    """
+    backend = FastAPICache.get_backend()
+    stats = backend.stats() if isinstance(backend, BoundedMemoryBackend) else {}
+    return CacheStatsOut(backend=type(backend).__name__, **stats)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Exposes the application's metrics in the Prometheus text format.
+
+    Values are kept per worker process. Rendering runs on the event loop, like the
+    updates, so it never observes a half-updated value.
+    """
+    return PlainTextResponse(
+        MetricsService.render(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
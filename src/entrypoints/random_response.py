@@ -1,14 +1,14 @@
 from fastapi import APIRouter
-from fastapi_cache.decorator import cache
 
 from src.schemas.random_number import RandomResponse
 from src.services.random_number_service import RandomResponseService
+from src.utils.response_cache import cache
 
 router = APIRouter()
 
 
 @router.get("/", response_model=RandomResponse)
-@cache(expire=5)
+@cache(expire=5, stale_ttl=30, early_refresh_beta=1.0)
 async def random_number():
     """
     Sends random number back to user.
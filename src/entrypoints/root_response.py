@@ -1,14 +1,14 @@
 from fastapi import APIRouter
-from fastapi_cache.decorator import cache
 
 from src.schemas.root_response import RootResponse
 from src.services.root_response_service import RootResponseService
+from src.utils.response_cache import cache
 
 router = APIRouter()
 
 
 @router.get("/", response_model=RootResponse)
-@cache(expire=5)
+@cache(expire=5, stale_ttl=30, early_refresh_beta=1.0)
 async def root_response():
     """
     Sends root response back to user.
@@ -1,62 +1,127 @@
-from typing import Annotated, List
+from typing import Annotated, List, Union
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Request, Response
 
-from src.database.models.users import User
+from src.configs.envs import Config
 from src.exceptions.http_exceptions import InvalidPermissionLevelException
-from src.schemas.user import UserCreate, UserOut
+from src.schemas.user import (
+    AuthenticatedUser,
+    BulkUserImportOut,
+    Principal,
+    UserCreate,
+    UserOut,
+)
 from src.services.auth import AuthService
 from src.services.user_service import UserService
+from src.utils.etag import collection_etag, conditional_get, entity_etag
+from src.utils.json_response import serialized_response
+from src.utils.permissions import (
+    CAN_CREATE_ALL,
+    CAN_DELETE_ALL,
+    CAN_DELETE_OWN,
+    CAN_READ_ALL,
+    CAN_READ_OWN,
+    CAN_UPDATE_ALL,
+    CAN_UPDATE_OWN,
+)
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[UserOut])
 async def get_users(
-    current_user: Annotated[User, Depends(AuthService.get_current_active_user)],
+    current_user: Annotated[
+        Principal, Depends(AuthService.get_current_active_principal)
+    ],
+    response: Response,
+    limit: Annotated[
+        int, Query(ge=1, le=Config.PAGINATION_MAX_LIMIT)
+    ] = Config.PAGINATION_DEFAULT_LIMIT,
+    after: Annotated[Union[str, None], Query()] = None,
+    if_none_match: Annotated[Union[str, None], Header()] = None,
 ) -> List[UserOut]:
     """
-    Retrieve a list of all users.
+    Retrieve a page of users.
+
+    The cursor for the next page, if any, is returned in the `X-Next-Cursor`
+    header and should be sent back as the `after` query parameter. The page is
+    tagged with an ETag; `304 Not Modified` is returned when it matches
+    `If-None-Match`.
+
+    Args:
+        limit (int): Maximum number of users to return.
+        after (str | None): Cursor returned with the previous page.
 
     Returns:
         List[User]: A list of User objects.
     """
-    if not current_user.can_read_all:
+    if not current_user.has_permissions(CAN_READ_ALL):
         raise InvalidPermissionLevelException()
-    return await UserService().get_all()
+    users, next_cursor = await UserService().get_page(limit, after)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    etag = collection_etag(users, next_cursor)
+    return conditional_get(response, etag, if_none_match) or serialized_response(
+        List[UserOut], users, response
+    )
 
 
 @router.get("/me", response_model=UserOut)
 async def read_user_me(
-    current_user: Annotated[User, Depends(AuthService.get_current_active_user)],
+    current_user: Annotated[
+        AuthenticatedUser, Depends(AuthService.get_current_active_user)
+    ],
+    response: Response,
+    if_none_match: Annotated[Union[str, None], Header()] = None,
 ):
     """
     Retrieve the currently authenticated user by Bearer token.
+
+    `304 Not Modified` is returned when `If-None-Match` matches the user's ETag.
     """
-    if not current_user.can_read_own:
+    if not current_user.has_permissions(CAN_READ_OWN):
         raise InvalidPermissionLevelException()
-    return current_user
+    etag = entity_etag(current_user.id, current_user.updated_at)
+    return conditional_get(response, etag, if_none_match) or current_user
 
 
 @router.get("/{user_id}", response_model=UserOut)
 async def get_user(
-    current_user: Annotated[User, Depends(AuthService.get_current_active_user)],
+    current_user: Annotated[
+        Principal, Depends(AuthService.get_current_active_principal)
+    ],
     user_id: int,
+    response: Response,
+    if_none_match: Annotated[Union[str, None], Header()] = None,
 ) -> UserOut:
     """
     Retrieve a user by ID.
 
+    When `If-None-Match` is sent, only the user's `updated_at` is queried to
+    check it, and `304 Not Modified` is returned if it still matches.
+
     Args:
         user_id (int): The ID of the user.
 
     Returns:
         User: The User object.
     """
-    if current_user.id == user_id and current_user.can_read_own:
-        return current_user
-    if not current_user.can_read_all:
+    own = current_user.id == user_id and current_user.has_permissions(CAN_READ_OWN)
+    if own and isinstance(current_user, AuthenticatedUser):
+        etag = entity_etag(current_user.id, current_user.updated_at)
+        return conditional_get(response, etag, if_none_match) or current_user
+    if not own and not current_user.has_permissions(CAN_READ_ALL):
         raise InvalidPermissionLevelException()
-    return await UserService().get_user(user_id)
+    if if_none_match:
+        updated_at = await UserService().get_user_updated_at(user_id)
+        not_modified = conditional_get(
+            response, entity_etag(user_id, updated_at), if_none_match
+        )
+        if not_modified:
+            return not_modified
+    user = await UserService().get_user(user_id)
+    response.headers["ETag"] = entity_etag(user.id, user.updated_at)
+    return serialized_response(UserOut, user, response)
 
 
 @router.post("/register", response_model=UserOut)
@@ -73,9 +138,42 @@ async def create_default_user(user: UserCreate):
     return await UserService().create_default_user(user)
 
 
+@router.post(
+    "/bulk",
+    response_model=BulkUserImportOut,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/x-ndjson": {"schema": {"type": "string"}}},
+        }
+    },
+)
+async def bulk_import_users(
+    current_user: Annotated[
+        Principal, Depends(AuthService.get_current_active_principal)
+    ],
+    request: Request,
+) -> BulkUserImportOut:
+    """
+    Create many default users at once.
+
+    The body is newline-delimited JSON, one `UserCreate` object per line. Invalid
+    or already registered rows are reported by line number and do not prevent the
+    remaining rows from being created.
+
+    Returns:
+        BulkUserImportOut: The number of created users and per-line failures.
+    """
+    if not current_user.has_permissions(CAN_CREATE_ALL):
+        raise InvalidPermissionLevelException()
+    return await UserService().bulk_import_users(request.stream())
+
+
 @router.put("/{user_id}", response_model=None)
 async def update_user(
-    current_user: Annotated[User, Depends(AuthService.get_current_active_user)],
+    current_user: Annotated[
+        Principal, Depends(AuthService.get_current_active_principal)
+    ],
     user_id: int,
     user: UserCreate,
 ) -> None:
@@ -89,16 +187,18 @@ async def update_user(
     Returns:
         User: The updated User object.
     """
-    if current_user.id == user_id and current_user.can_update_own:
+    if current_user.id == user_id and current_user.has_permissions(CAN_UPDATE_OWN):
         return await UserService().update_user(user_id, user)
-    if not current_user.can_update_all:
+    if not current_user.has_permissions(CAN_UPDATE_ALL):
         raise InvalidPermissionLevelException()
     return await UserService().update_user(user_id, user)
 
 
 @router.delete("/{user_id}", response_model=None)
 async def delete_user(
-    current_user: Annotated[User, Depends(AuthService.get_current_active_user)],
+    current_user: Annotated[
+        Principal, Depends(AuthService.get_current_active_principal)
+    ],
     user_id: int,
 ) -> None:
     """
@@ -107,8 +207,8 @@ async def delete_user(
     Args:
         user_id (int): The ID of the user.
     """
-    if current_user.id == user_id and current_user.can_delete_own:
+    if current_user.id == user_id and current_user.has_permissions(CAN_DELETE_OWN):
         return await UserService().delete_user(user_id)
-    if not current_user.can_delete_all:
+    if not current_user.has_permissions(CAN_DELETE_ALL):
         raise InvalidPermissionLevelException()
     return await UserService().delete_user(user_id)
@@ -1,26 +1,28 @@
 from typing import List
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 from src.schemas.user_type import UserTypeCreate, UserTypeOut
 from src.services.user_type_service import UserTypeService
+from src.utils.json_response import serialized_response
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[UserTypeOut])
-async def get_user_types() -> List[UserTypeOut]:
+async def get_user_types(response: Response) -> List[UserTypeOut]:
     """
     Retrieve a list of all user types.
 
     Returns:
         List[UserTypeOut]: A list of UserType objects.
     """
-    return await UserTypeService().get_all()
+    user_types = await UserTypeService().get_all()
+    return serialized_response(List[UserTypeOut], user_types, response)
 
 
 @router.get("/{user_type_id}", response_model=UserTypeOut)
-async def get_user_type(user_type_id: int) -> UserTypeOut:
+async def get_user_type(user_type_id: int, response: Response) -> UserTypeOut:
     """
     Retrieve a user type by ID.
 
@@ -30,7 +32,8 @@ async def get_user_type(user_type_id: int) -> UserTypeOut:
     Returns:
         UserTypeOut: The UserType object.
     """
-    return await UserTypeService().get_user_type(user_type_id)
+    user_type = await UserTypeService().get_user_type(user_type_id)
+    return serialized_response(UserTypeOut, user_type, response)
 
 
 @router.post("/", response_model=UserTypeOut)
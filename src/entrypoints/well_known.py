@@ -0,0 +1,25 @@
+from typing import Annotated, Union
+
+from fastapi import APIRouter, Header, Response
+
+from src.utils.etag import conditional_get
+from src.utils.jwt_keys import key_ring
+
+router = APIRouter()
+
+
+@router.get("/jwks.json")
+def jwks(if_none_match: Annotated[Union[str, None], Header()] = None) -> Response:
+    """
+    The public keys access tokens are signed with, as a JSON Web Key Set.
+
+    Services verifying tokens themselves should cache it, and fetch it again when
+    they meet an unknown `kid`. The set is empty with an HMAC algorithm.
+    """
+    body, etag = key_ring.jwks()
+    response = Response(
+        body,
+        media_type="application/json",
+        headers={"Cache-Control": "public, max-age=300"},
+    )
+    return conditional_get(response, etag, if_none_match) or response
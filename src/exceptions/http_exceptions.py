@@ -37,6 +37,19 @@ class NotFoundException(HTTPException):
         )
 
 
+class InvalidCursorException(HTTPException):
+    def __init__(self, cursor: str):
+        """
+        Exception raised when a pagination cursor is malformed.
+        Args:
+            cursor (str): The received cursor.
+        """
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=[{"msg": f"Invalid pagination cursor '{cursor}'"}],
+        )
+
+
 class CredentialsException(HTTPException):
     def __init__(self):
         super().__init__(
@@ -52,3 +65,18 @@ class InvalidPermissionLevelException(HTTPException):
             status_code=status.HTTP_403_FORBIDDEN,
             detail=[{"msg": "Invalid level of permissions"}],
         )
+
+
+class ServiceBusyException(HTTPException):
+    def __init__(self, retry_after_seconds: int = 1):
+        """
+        Exception raised when a bounded resource is saturated and the request waited
+        too long for it.
+        Args:
+            retry_after_seconds (int): Suggested delay before retrying.
+        """
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=[{"msg": "Service is busy, please retry later"}],
+            headers={"Retry-After": str(retry_after_seconds)},
+        )
@@ -0,0 +1,122 @@
+"""
+ASGI entrypoint serving `/health` while the application is still being imported.
+
+Importing the application pulls in FastAPI, SQLAlchemy, every model and router and
+their dependencies, which takes a good part of a second on every cold start or
+worker spawn. `LazyApp` imports none of it: when the server starts, it imports and
+builds the application in a background thread and answers `GET /health` itself in
+the meantime. Every other request waits for the application and is then handed to
+it, as is `/health` from then on.
+
+The application's lifespan runs once it is built, if the server runs lifespans.
+"""
+
+import asyncio
+import importlib
+from contextlib import AsyncExitStack
+from typing import Any, Callable, Union
+
+HEALTH_PATH = "/health"
+
+
+class LazyApp:
+    def __init__(self, factory: str):
+        """
+        Args:
+            factory (str): The application factory, as "module:function".
+        """
+        self.factory = factory
+        self.app: Any = None
+        self._loading: Union[asyncio.Task, None] = None
+        self._lifespan = False
+        self._lifespan_stack: Union[AsyncExitStack, None] = None
+
+    def _import(self) -> Callable[[], Any]:
+        module_name, _, function_name = self.factory.partition(":")
+        return getattr(importlib.import_module(module_name), function_name)
+
+    async def _load(self) -> Any:
+        factory = await asyncio.to_thread(self._import)
+        app = factory()
+        if self._lifespan:
+            stack = AsyncExitStack()
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            self._lifespan_stack = stack
+        self.app = app
+        return app
+
+    def _start_loading(self) -> asyncio.Task:
+        if self._loading is None:
+            self._loading = asyncio.create_task(self._load())
+        return self._loading
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._serve_lifespan(receive, send)
+            return
+        app = self.app
+        if app is None:
+            loading = self._start_loading()
+            if not loading.done() and self._is_health_check(scope):
+                await self._send_health(scope, send)
+                return
+            # Shielded: a client disconnecting must not cancel the loading.
+            app = await asyncio.shield(loading)
+        await app(scope, receive, send)
+
+    @staticmethod
+    def _is_health_check(scope) -> bool:
+        return (
+            scope["type"] == "http"
+            and scope["path"] == HEALTH_PATH
+            and scope["method"] in ("GET", "HEAD")
+        )
+
+    @staticmethod
+    async def _send_health(scope, send) -> None:
+        # The same response as the application's `/health` endpoint.
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", b"4"),
+                ],
+            }
+        )
+        body = b"" if scope["method"] == "HEAD" else b"null"
+        await send({"type": "http.response.body", "body": body})
+
+    async def _serve_lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                self._lifespan = True
+                self._start_loading()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                try:
+                    await self._shutdown()
+                except Exception as error:
+                    await send(
+                        {"type": "lifespan.shutdown.failed", "message": repr(error)}
+                    )
+                else:
+                    await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _shutdown(self) -> None:
+        if self._loading is not None:
+            try:
+                await self._loading
+            except Exception:
+                # Already raised to the requests that waited for the application.
+                pass
+        if self._lifespan_stack is not None:
+            await self._lifespan_stack.aclose()
+
+
+def get_lazy_app() -> LazyApp:
+    """Factory of the lazily loaded application, e.g. for uvicorn."""
+    return LazyApp("src.app:get_app")
@@ -6,7 +6,7 @@ from src.configs.envs import Config
 def main() -> None:
     """Entrypoint of the application."""
     uvicorn.run(
-        "src.app:get_app",
+        "src.lazy_app:get_lazy_app",
         workers=Config.WORKERS_COUNT,
         host=Config.HOST,
         port=Config.PORT,
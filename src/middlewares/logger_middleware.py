@@ -1,87 +1,153 @@
 import contextvars
 import time
+from typing import List, Tuple
 from uuid import uuid4
 
-from fastapi import Request, Response
-from fastapi.concurrency import iterate_in_threadpool
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.configs.envs import Config
 
 REQUEST_UUID = contextvars.ContextVar("request_uuid", default=None)
 
 
-class LoggerMiddleware(BaseHTTPMiddleware):
+class LoggerMiddleware:
+    """
+    Pure ASGI middleware logging the start and completion of every HTTP request.
+
+    Request and response bodies are teed up to `max_body_bytes` while they stream
+    through, so the full body is never held in memory and streaming responses are
+    forwarded as they are produced.
+
+    With `single_line` enabled the start line is folded into the completion line,
+    halving the number of log calls per request.
+    """
+
     UNABLE_TO_READ_BODY = b"<unable to read body>"
     BODY_IGNORED = b"<body ignored>"
 
     def __init__(
         self,
-        app,
+        app: ASGIApp,
         logger,
+        max_body_bytes: int = Config.LOGGER_MAX_BODY_BYTES,
+        single_line: bool = Config.LOGGER_SINGLE_LINE,
     ):
-        super().__init__(app)
+        self.app = app
         self.logger = logger
+        self.max_body_bytes = max_body_bytes
+        self.single_line = single_line
 
-    async def dispatch(self, request: Request, call_next):
-        uuid = uuid4()
-        REQUEST_UUID.set(uuid)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-        if self._should_log_input_body(request):
+        uuid_token = REQUEST_UUID.set(uuid4())
+        method, path = scope["method"], scope["path"]
+
+        body_truncated = False
+        if self._should_log_input_body(method, path):
             try:
-                body = await request.body()
+                body, body_truncated, receive = await self._peek_request_body(receive)
             except Exception:
                 body = self.UNABLE_TO_READ_BODY
         else:
             body = self.BODY_IGNORED
 
-        self.logger.warning(
-            f"Start request path={request.url.path}; method={request.method}; "
-            f"{body=};"
+        request_description = f"path={path}; method={method}; {body=};" + (
+            " body_truncated=True;" if body_truncated else ""
         )
-        start_time = time.time()
-
-        response: Response = await call_next(request)
-
-        process_time = (time.time() - start_time) * 1000
-        formatted_process_time = "{0:.2f}".format(process_time)
+        if not self.single_line:
+            self.logger.warning(f"Start request {request_description}")
+        start_time = time.perf_counter()
 
-        if self._should_ignore_method_and_path(
-            request.method,
-            request.url.path,
-            Config.LOGGER_IGNORE_PATHS,
-        ):
+        ignore_path = self._should_ignore_method_and_path(
+            method, path, Config.LOGGER_IGNORE_PATHS
+        )
+        capture_output = not ignore_path and self._should_log_output_body(method, path)
+        status_code = 500
+        res_body = bytearray()
+        completed = False
+
+        def log_completion():
+            process_time = (time.perf_counter() - start_time) * 1000
+            formatted_process_time = "{0:.2f}".format(process_time)
+            prefix = f"Request {request_description} " if self.single_line else ""
+            if ignore_path:
+                self.logger.warning(
+                    f"{prefix}Request completed in {formatted_process_time}ms; "
+                    f"Status Code={status_code};"
+                )
+                return
+            res_body_decoded = (
+                res_body.decode(errors="replace") if res_body else self.BODY_IGNORED
+            )
             self.logger.warning(
-                f"Request completed in {formatted_process_time}ms; "
-                f"Status Code={response.status_code};"
+                f"{prefix}Request completed in {formatted_process_time}ms; "
+                f"Status Code={status_code}; body={res_body_decoded};"
             )
-            return response
-
-        res_body = [section async for section in response.body_iterator]
-        response.body_iterator = iterate_in_threadpool(iter(res_body))
-        res_body_decoded = (
-            res_body[0].decode()
-            if self._should_log_output_body(request, res_body)
-            else self.BODY_IGNORED
-        )
 
-        self.logger.warning(
-            f"Request completed in {formatted_process_time}ms; "
-            f"Status Code={response.status_code}; body={res_body_decoded};"
-        )
-        return response
-
-    def _should_log_output_body(self, request: Request, res_body):
-        return res_body and not self._should_ignore_method_and_path(
-            request.method,
-            request.url.path,
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, completed
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                remaining = self.max_body_bytes - len(res_body)
+                if capture_output and remaining > 0:
+                    res_body.extend(message.get("body", b"")[:remaining])
+                if not message.get("more_body", False) and not completed:
+                    completed = True
+                    log_completion()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not completed:
+                log_completion()
+            REQUEST_UUID.reset(uuid_token)
+
+    async def _peek_request_body(self, receive: Receive) -> Tuple[bytes, bool, Receive]:
+        """
+        Read request messages until `max_body_bytes` are captured or the body ends.
+
+        Returns:
+            tuple[bytes, bool, Receive]: The captured body prefix, whether it was
+            truncated and a `receive` callable replaying the consumed messages
+            before delegating to the original one.
+        """
+        consumed: List[Message] = []
+        captured = bytearray()
+        more_body = True
+        while more_body and len(captured) < self.max_body_bytes:
+            message = await receive()
+            consumed.append(message)
+            if message["type"] != "http.request":
+                break
+            captured.extend(message.get("body", b""))
+            more_body = message.get("more_body", False)
+
+        truncated = len(captured) > self.max_body_bytes or more_body
+        body = bytes(captured[: self.max_body_bytes])
+
+        async def replay_receive() -> Message:
+            if consumed:
+                return consumed.pop(0)
+            return await receive()
+
+        return body, truncated, replay_receive
+
+    def _should_log_output_body(self, method: str, path: str) -> bool:
+        return not self._should_ignore_method_and_path(
+            method,
+            path,
             Config.LOGGER_IGNORE_OUTPUT_BODY_PATHS,
         )
 
-    def _should_log_input_body(self, request: Request):
+    def _should_log_input_body(self, method: str, path: str) -> bool:
         return not self._should_ignore_method_and_path(
-            request.method,
-            request.url.path,
+            method,
+            path,
             Config.LOGGER_IGNORE_INPUT_BODY_PATHS,
         )
 
@@ -0,0 +1,61 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.metrics import UNMATCHED_ROUTE, RequestMetrics, request_metrics
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware feeding `RequestMetrics`.
+
+    It tracks in-flight requests, records the latency of every HTTP request under
+    its method, matched route and status code, and counts fastapi-cache hits and
+    misses from the cache status header of the responses.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        metrics: RequestMetrics = request_metrics,
+        cache_status_header: str = "X-FastAPI-Cache",
+    ):
+        self.app = app
+        self.metrics = metrics
+        # ASGI servers and Starlette always send header names lowercased.
+        self.cache_status_header = cache_status_header.lower().encode("latin-1")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metrics = self.metrics
+        status_code = 500
+        metrics.in_flight += 1
+        start_time = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                for name, value in message.get("headers", ()):
+                    if name == self.cache_status_header:
+                        if value == b"HIT":
+                            metrics.cache_hits += 1
+                        else:
+                            metrics.cache_misses += 1
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            metrics.in_flight -= 1
+            # The router stores the matched route in the (shared) scope.
+            route = scope.get("route")
+            metrics.observe(
+                scope["method"],
+                getattr(route, "path", UNMATCHED_ROUTE),
+                status_code,
+                time.perf_counter() - start_time,
+            )
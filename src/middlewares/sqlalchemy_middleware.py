@@ -0,0 +1,59 @@
+from typing import Dict, Iterable, Sequence, Union
+
+from sqlalchemy.engine.url import URL
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database.session import db, finish, init_db
+
+
+class SQLAlchemyMiddleware:
+    """
+    Pure ASGI middleware wrapping every HTTP request in a lazy unit of work.
+
+    No session is created unless the request touches `db.session`. Requests whose
+    method is in `read_only_methods` run read-only transactions that always end
+    with a rollback. Other requests are committed, if they wrote anything, right
+    before the response starts, so a failing commit still turns into an error
+    response. Model reads go to `replica_urls`, when given, until the request
+    writes.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        db_url: Union[str, URL, None] = None,
+        custom_engine: Union[AsyncEngine, None] = None,
+        engine_args: Union[Dict, None] = None,
+        session_args: Union[Dict, None] = None,
+        commit_on_exit: bool = False,
+        read_only_methods: Iterable[str] = ("GET", "HEAD"),
+        replica_urls: Sequence[Union[str, URL]] = (),
+        replica_strategy: str = "round_robin",
+    ):
+        self.app = app
+        self.commit_on_exit = commit_on_exit
+        self.read_only_methods = frozenset(read_only_methods)
+        init_db(
+            db_url=db_url,
+            custom_engine=custom_engine,
+            engine_args=engine_args,
+            session_args=session_args,
+            replica_urls=replica_urls,
+            replica_strategy=replica_strategy,
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        read_only = scope["method"] in self.read_only_methods
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and db.session_started:
+                await finish()
+            await send(message)
+
+        async with db(commit_on_exit=self.commit_on_exit, read_only=read_only):
+            await self.app(scope, receive, send_wrapper)
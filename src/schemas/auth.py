@@ -1,19 +1,46 @@
 from datetime import datetime
-from typing import Union
+from typing import List, Union
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+from src.configs.envs import Config
+from src.utils.enums import UserPermissionsEnum
 
 
 class Token(BaseModel):
     access_token: str
     token_type: str
     expires_at: datetime
+    refresh_token: Union[str, None] = None
+
+
+class RefreshTokenRequest(BaseModel):
+    refresh_token: str
 
 
 class TokenData(BaseModel):
     email: Union[str, None] = None
+    expires_at: Union[float, None] = None
+    issued_at: Union[float, None] = None
+    # Claims of self-contained tokens only.
+    user_id: Union[int, None] = None
+    user_type_id: Union[int, None] = None
+    user_type_title: Union[str, None] = None
+    permissions: Union[int, None] = None
+    security_version: Union[int, None] = None
 
 
 class VerifyTokenResponse(BaseModel):
     valid: bool
     reason: str | None = None
+
+
+class VerifyTokenRequest(BaseModel):
+    token: str
+    action: List[UserPermissionsEnum] = []
+
+
+class VerifyTokenBatchRequest(BaseModel):
+    items: List[VerifyTokenRequest] = Field(
+        ..., max_length=Config.AUTH.VERIFY_TOKEN_BATCH_MAX_SIZE
+    )
@@ -0,0 +1,17 @@
+from typing import Union
+
+from pydantic import BaseModel
+
+
+class CacheStatsOut(BaseModel):
+    """Response cache statistics; values the backend does not track are null."""
+
+    backend: str
+    entries: Union[int, None] = None
+    bytes: Union[int, None] = None
+    max_entries: Union[int, None] = None
+    max_bytes: Union[int, None] = None
+    hits: Union[int, None] = None
+    misses: Union[int, None] = None
+    evictions: Union[int, None] = None
+    expirations: Union[int, None] = None
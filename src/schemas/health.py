@@ -0,0 +1,18 @@
+from typing import Dict, Union
+
+from pydantic import BaseModel
+
+
+class EngineHealthOut(BaseModel):
+    """Last health check of a database engine."""
+
+    healthy: bool
+    checked_seconds_ago: float
+    error: Union[str, None] = None
+
+
+class ReadinessOut(BaseModel):
+    """Readiness probe response model."""
+
+    ready: bool
+    engines: Dict[str, EngineHealthOut]
@@ -1,8 +1,18 @@
-from pydantic import BaseModel, EmailStr, Field, field_serializer, field_validator
+from datetime import datetime
+from typing import List, Union
+
+from pydantic import (
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    field_validator,
+)
 
 from src.schemas.base_db_schema import BaseDBSchema
-from src.schemas.user_type import UserTypeOut
-from src.utils.auth_util import get_password_hash
+from src.schemas.user_type import CachedUserType, UserTypeOut
+from src.utils.auth_util import hash_password_async
+from src.utils.user_permissions import UserPermissionsMixin
 
 
 class UserCreate(BaseModel):
@@ -33,10 +43,6 @@ class UserCreate(BaseModel):
     def strip_field(cls, field: str) -> str:
         return field.strip()
 
-    @field_serializer("password")
-    def hash_password(self, password: str) -> str:
-        return get_password_hash(password)
-
     @field_validator("password", mode="before")
     def validate_password(cls, password: str) -> str:
         if not any(char.isalpha() for char in password):
@@ -59,6 +65,17 @@ class UserCreate(BaseModel):
     def email_parser(cls, email: str) -> str:
         return email.strip().lower()
 
+    async def model_dump_hashed(self) -> dict:
+        """
+        Dump the model with the password replaced by its hash.
+
+        Hashing runs in the password hashing pool, off the event loop.
+        """
+        return {
+            **self.model_dump(),
+            "password": await hash_password_async(self.password),
+        }
+
 
 class UserOut(BaseDBSchema):
     name: str
@@ -67,3 +84,57 @@ class UserOut(BaseDBSchema):
 
 class UserPermissionsOut(UserOut):
     user_type_data: UserTypeOut
+
+
+class AuthenticatedUser(UserPermissionsOut, UserPermissionsMixin):
+    """
+    Immutable snapshot of the user resolved from an access token.
+
+    It is detached from any database session, so it can be safely shared between
+    requests through the token cache.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    # Shares the user type of `user_type_table`, and its precomputed permissions.
+    user_type_data: CachedUserType
+    user_type_id: int
+    is_active: bool
+    is_blocked: bool
+    deleted_at: Union[datetime, None] = None
+
+
+class BulkUserRowError(BaseModel):
+    line: int
+    errors: List[str]
+
+
+class BulkUserImportOut(BaseModel):
+    created: int
+    failed: List[BulkUserRowError]
+
+
+class TokenPrincipal(BaseModel):
+    """
+    The user a self-contained access token was issued to, as of its issuance.
+
+    It is built from the token's claims without any query, and only carries what
+    authorization needs.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    id: int
+    email: str
+    user_type_id: int
+    user_type_title: str
+    permissions: int
+
+    def has_permissions(self, required: int) -> bool:
+        """Whether the token grants every permission of the `required` mask."""
+        return not required & ~self.permissions
+
+
+# Who a request is authorized as: a user loaded from the database, or the claims
+# of a self-contained token.
+Principal = Union[AuthenticatedUser, TokenPrincipal]
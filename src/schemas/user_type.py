@@ -1,6 +1,9 @@
-from pydantic import BaseModel, Field
+from functools import cached_property
+
+from pydantic import BaseModel, ConfigDict, Field
 
 from src.schemas.base_db_schema import BaseDBSchema
+from src.utils.permissions import granted_mask
 
 
 class UserTypeCreate(BaseModel):
@@ -81,3 +84,14 @@ class UserTypeCreate(BaseModel):
 
 class UserTypeOut(UserTypeCreate, BaseDBSchema):
     pass
+
+
+class CachedUserType(UserTypeOut):
+    """Immutable user type, shared by every request through `UserTypeTable`."""
+
+    model_config = ConfigDict(frozen=True)
+
+    @cached_property
+    def permissions(self) -> int:
+        """The permission flags as a bitmask, see `src.utils.permissions`."""
+        return granted_mask(self)
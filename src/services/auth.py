@@ -1,5 +1,6 @@
+import time
 from datetime import datetime, timedelta, timezone
-from typing import Annotated, Union
+from typing import Annotated, Dict, Iterable, List, Sequence, Tuple, Union
 
 import jwt
 from fastapi import Depends
@@ -12,9 +13,19 @@ from src.exceptions.http_exceptions import (
     CredentialsException,
     InvalidPermissionLevelException,
 )
-from src.schemas.auth import TokenData
-from src.utils.auth_util import get_password_hash, verify_password
-from src.utils.enums import UserTypeEnum
+from src.schemas.auth import TokenData, VerifyTokenRequest, VerifyTokenResponse
+from src.schemas.user import AuthenticatedUser, Principal, TokenPrincipal
+from src.utils.auth_util import (
+    get_password_hash,
+    verify_password,
+    verify_password_async,
+)
+from src.utils.enums import UserPermissionsEnum, UserTypeEnum
+from src.utils.jwt_keys import key_ring
+from src.utils.permissions import CAN_LOGIN, missing_permissions, permission_mask
+from src.utils.token_cache import token_cache
+from src.utils.token_revocations import token_revocations
+from src.utils.user_type_table import UnknownUserTypeError, user_type_table
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 
@@ -24,6 +35,10 @@ class AuthService:
     def verify_password(plain_password, hashed_password):
         return verify_password(plain_password, hashed_password)
 
+    @staticmethod
+    async def verify_password_async(plain_password, hashed_password):
+        return await verify_password_async(plain_password, hashed_password)
+
     @staticmethod
     def get_password_hash(password):
         return get_password_hash(password)
@@ -36,7 +51,7 @@ class AuthService:
             logger.info(f"User not found: {username=}")
             return False
         logger.info(f"{user.id=}")
-        if not AuthService.verify_password(password, user.password):
+        if not await AuthService.verify_password_async(password, user.password):
             logger.info(f"Password mismatch for user: {username=}")
             return False
         return user
@@ -50,45 +65,276 @@ class AuthService:
             minutes=expires_delta_in_minutes or Config.AUTH.ACCESS_TOKEN_EXPIRE_MINUTES
         )
         to_encode.update({"exp": expires_at})
+        key, headers = key_ring.signing_key()
         encoded_jwt = jwt.encode(
-            to_encode, Config.AUTH.SECRET_KEY, algorithm=Config.AUTH.ALGORITHM
+            to_encode, key, algorithm=Config.AUTH.ALGORITHM, headers=headers
         )
         return encoded_jwt, expires_at
 
-    # @staticmethod
-    async def get_current_user(token: Annotated[str, Depends(oauth2_scheme)]):
+    @staticmethod
+    async def create_user_access_token(user: User) -> Tuple[str, datetime]:
+        """
+        Issue an access token to an authenticated user.
+
+        With `SELF_CONTAINED_TOKENS`, the token also carries the claims that
+        authorization needs (see `principal_from_claims`), and expires after
+        `SELF_CONTAINED_TOKEN_EXPIRE_MINUTES` instead.
+        """
+        if not Config.AUTH.SELF_CONTAINED_TOKENS:
+            return AuthService.create_access_token(data={"sub": user.email})
+        await AuthService.require_user_types(user.user_type_id)
+        return AuthService.create_access_token(
+            data={
+                "sub": user.email,
+                "iat": time.time(),
+                "uid": user.id,
+                "tid": user.user_type_id,
+                "utt": user.user_type_title,
+                # Inactive users are granted no permission, not even to log in.
+                "perm": user.permissions if AuthService.is_active_user(user) else 0,
+                "ver": user.security_version,
+            },
+            expires_delta_in_minutes=Config.AUTH.SELF_CONTAINED_TOKEN_EXPIRE_MINUTES,
+        )
+
+    @staticmethod
+    def decode_access_token(token: str) -> TokenData:
+        """
+        Decode an access token.
+
+        Raises:
+            CredentialsException: If the token is invalid, expired or has no subject.
+        """
         try:
             payload = jwt.decode(
-                token, Config.AUTH.SECRET_KEY, algorithms=[Config.AUTH.ALGORITHM]
+                token,
+                key_ring.verification_key(token),
+                algorithms=[Config.AUTH.ALGORITHM],
             )
-            username: Union[str, None] = payload.get("sub")
-            if username is None:
-                raise CredentialsException()
-            token_data = TokenData(email=username)
         except jwt.InvalidTokenError:
             raise CredentialsException()
-        user: Union[User, None] = await User.get_by_email(token_data.email)
+        username: Union[str, None] = payload.get("sub")
+        if username is None:
+            raise CredentialsException()
+        return TokenData(
+            email=username,
+            expires_at=payload["exp"],
+            issued_at=payload.get("iat"),
+            user_id=payload.get("uid"),
+            user_type_id=payload.get("tid"),
+            user_type_title=payload.get("utt"),
+            permissions=payload.get("perm"),
+            security_version=payload.get("ver"),
+        )
+
+    @staticmethod
+    def principal_from_claims(token_data: TokenData) -> Union[TokenPrincipal, None]:
+        """
+        Build the principal of a self-contained token from its claims, without
+        any query.
+
+        Returns:
+            TokenPrincipal | None: None if the token is not self-contained.
+        Raises:
+            CredentialsException: If the token was revoked or lacks claims.
+        """
+        if token_data.user_id is None:
+            return None
+        claims = (
+            token_data.issued_at,
+            token_data.user_type_id,
+            token_data.user_type_title,
+            token_data.permissions,
+            token_data.security_version,
+        )
+        if None in claims or token_revocations.is_revoked(
+            token_data.user_id,
+            token_data.security_version,
+            token_data.user_type_id,
+            token_data.issued_at,
+        ):
+            raise CredentialsException()
+        return TokenPrincipal(
+            id=token_data.user_id,
+            email=token_data.email,
+            user_type_id=token_data.user_type_id,
+            user_type_title=token_data.user_type_title,
+            permissions=token_data.permissions,
+        )
+
+    @staticmethod
+    async def require_user_types(*user_type_ids: int) -> None:
+        """
+        Make sure the user type table can resolve the given user types.
+
+        Raises:
+            CredentialsException: If a user type is unknown, so the permissions of
+                its users cannot be resolved.
+        """
+        try:
+            await user_type_table.require(*user_type_ids)
+        except UnknownUserTypeError as error:
+            logger.warning(f"Unknown user types: {error.args}")
+            raise CredentialsException()
+
+    @staticmethod
+    async def _load_user(token: str, token_data: TokenData) -> AuthenticatedUser:
+        # From the primary: a lagging replica could return a row that was already
+        # changed, and evicted from the token cache.
+        user: Union[User, None] = await User.get_by_email(
+            token_data.email, from_primary=True
+        )
         if user is None:
             raise CredentialsException()
-        return user
+        await AuthService.require_user_types(user.user_type_id)
+        current_user = AuthenticatedUser.model_validate(user)
+        token_cache.set(token, current_user, token_expires_at=token_data.expires_at)
+        return current_user
+
+    # @staticmethod
+    async def get_current_user(
+        token: Annotated[str, Depends(oauth2_scheme)],
+    ) -> AuthenticatedUser:
+        cached_user = token_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+        token_data = AuthService.decode_access_token(token)
+        return await AuthService._load_user(token, token_data)
+
+    # @staticmethod
+    async def get_current_principal(
+        token: Annotated[str, Depends(oauth2_scheme)],
+    ) -> Principal:
+        """
+        Resolve who a token authorizes: from its claims, without any query, if it is
+        self-contained, and like `get_current_user` otherwise.
+        """
+        cached_user = token_cache.get(token)
+        if cached_user is not None:
+            return cached_user
+        token_data = AuthService.decode_access_token(token)
+        principal = AuthService.principal_from_claims(token_data)
+        if principal is not None:
+            return principal
+        return await AuthService._load_user(token, token_data)
+
+    @staticmethod
+    def is_active_user(user: Union[User, Principal]) -> bool:
+        if isinstance(user, TokenPrincipal):
+            # Checked when the token was issued, see `create_user_access_token`.
+            return user.has_permissions(CAN_LOGIN)
+        return not (
+            user.deleted_at
+            or user.is_blocked
+            or not user.is_active
+            or not user.has_permissions(CAN_LOGIN)
+        )
 
     @staticmethod
     async def get_current_active_user(
-        current_user: Annotated[User, Depends(get_current_user)],
-    ):
-        if (
-            current_user.deleted_at
-            or current_user.is_blocked
-            or not current_user.is_active
-            or not current_user.user_type_data.can_login
-        ):
+        current_user: Annotated[AuthenticatedUser, Depends(get_current_user)],
+    ) -> AuthenticatedUser:
+        if not AuthService.is_active_user(current_user):
             raise CredentialsException()
         return current_user
 
+    @staticmethod
+    async def get_current_active_principal(
+        principal: Annotated[Principal, Depends(get_current_principal)],
+    ) -> Principal:
+        if not AuthService.is_active_user(principal):
+            raise CredentialsException()
+        return principal
+
+    @staticmethod
+    def verify_permissions(
+        user: Principal, action_list: Iterable[UserPermissionsEnum]
+    ) -> VerifyTokenResponse:
+        missing = missing_permissions(permission_mask(action_list), user.permissions)
+        if missing:
+            return VerifyTokenResponse(
+                valid=False,
+                reason=f"Missing permission(s): {', '.join(missing)}",
+            )
+        return VerifyTokenResponse(valid=True)
+
+    @staticmethod
+    async def verify_tokens(
+        requests: Sequence[VerifyTokenRequest],
+    ) -> List[VerifyTokenResponse]:
+        """
+        Verify many tokens, each against its own list of permissions.
+
+        Self-contained tokens are verified from their claims. The users of the other
+        tokens missing from the token cache are loaded with a single query, however
+        many tokens there are.
+
+        Args:
+            requests (Sequence[VerifyTokenRequest]): The tokens and the permissions
+                each must grant.
+        Returns:
+            List[VerifyTokenResponse]: One verdict per request, in the same order.
+        """
+        users: Dict[str, Principal] = {}
+        decoded: Dict[str, TokenData] = {}
+        for request in requests:
+            token = request.token
+            if token in users or token in decoded:
+                continue
+            cached_user = token_cache.get(token)
+            if cached_user is not None:
+                users[token] = cached_user
+                continue
+            try:
+                token_data = AuthService.decode_access_token(token)
+                principal = AuthService.principal_from_claims(token_data)
+            except CredentialsException:
+                continue
+            if principal is not None:
+                users[token] = principal
+            else:
+                decoded[token] = token_data
+
+        if decoded:
+            found = await User.get_by_emails(
+                {token_data.email for token_data in decoded.values()},
+                from_primary=True,
+            )
+            try:
+                await AuthService.require_user_types(
+                    *{user.user_type_id for user in found}
+                )
+            except CredentialsException:
+                # Only the tokens of users with an unknown user type are invalid.
+                pass
+            by_email = {
+                user.email: AuthenticatedUser.model_validate(user)
+                for user in found
+                if user.user_type_id in user_type_table
+            }
+            for token, token_data in decoded.items():
+                user = by_email.get(token_data.email)
+                if user is not None:
+                    users[token] = user
+                    token_cache.set(token, user, token_expires_at=token_data.expires_at)
+
+        verdicts = []
+        for request in requests:
+            user = users.get(request.token)
+            if user is None or not AuthService.is_active_user(user):
+                verdicts.append(
+                    VerifyTokenResponse(
+                        valid=False, reason="Could not validate credentials"
+                    )
+                )
+            else:
+                verdicts.append(AuthService.verify_permissions(user, request.action))
+        return verdicts
+
     @staticmethod
     async def is_admin(
-        current_user: Annotated[User, Depends(get_current_active_user)],
-    ):
+        current_user: Annotated[AuthenticatedUser, Depends(get_current_active_user)],
+    ) -> AuthenticatedUser:
         if current_user.user_type_title != UserTypeEnum.ADMIN:
             raise InvalidPermissionLevelException()
         return current_user
@@ -0,0 +1,186 @@
+"""
+Metrics service class.
+"""
+
+from typing import List
+
+from fastapi_cache import FastAPICache
+
+from src.database.pool import pool_stats
+from src.database.pool_monitor import pool_health_monitor
+from src.database.session import get_engines
+from src.utils.auth_util import password_hashing_pool
+from src.utils.memory_cache import BoundedMemoryBackend
+from src.utils.metrics import (
+    histogram_samples,
+    metric_header,
+    metric_sample,
+    request_metrics,
+)
+from src.utils.response_cache import cache_single_flight, cache_stats
+from src.utils.token_cache import token_cache
+
+_POOL_METRICS = (
+    ("size", "gauge", "Configured size of the connection pool."),
+    ("checked_out", "gauge", "Connections currently checked out of the pool."),
+    ("overflow", "gauge", "Connections opened beyond the pool size."),
+    ("checkouts", "counter", "Connections checked out of the pool."),
+    (
+        "checkout_wait_seconds",
+        "counter",
+        "Time spent waiting to check connections out of the pool.",
+    ),
+)
+
+_CACHE_BACKEND_METRICS = (
+    ("entries", "gauge", "Responses held by the cache backend."),
+    ("bytes", "gauge", "Size of the keys and responses held by the cache backend."),
+    ("hits", "counter", "Cache backend lookups that found a live entry."),
+    ("misses", "counter", "Cache backend lookups that found no live entry."),
+    ("evictions", "counter", "Entries evicted to keep the cache backend bounded."),
+    ("expirations", "counter", "Expired entries removed from the cache backend."),
+)
+
+_PASSWORD_HASHING_METRICS = (
+    ("queue_depth", "gauge", "Password hashing calls waiting for a slot."),
+    ("in_flight", "gauge", "Password hashing calls running."),
+    ("completed", "counter", "Password hashing calls completed."),
+    ("rejected", "counter", "Password hashing calls rejected as the queue was full."),
+    ("wait_seconds_sum", "counter", "Time password hashing calls spent queued."),
+    ("hash_seconds_sum", "counter", "Time spent hashing passwords."),
+)
+
+
+class MetricsService:
+    """
+    Metrics service class.
+    """
+
+    @staticmethod
+    def render() -> str:
+        """
+        Render every collected metric in the Prometheus text exposition format.
+
+        :returns: the metrics exposition.
+        """
+        lines: List[str] = []
+        MetricsService._http_metrics(lines)
+        MetricsService._pool_metrics(lines)
+        MetricsService._cache_metrics(lines)
+        MetricsService._password_hashing_metrics(lines)
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _http_metrics(lines: List[str]) -> None:
+        name = "http_request_duration_seconds"
+        lines += metric_header(name, "histogram", "HTTP request latency.")
+        for labels, histogram in request_metrics.histograms():
+            lines += histogram_samples(name, labels, histogram)
+        lines += metric_header(
+            "http_requests_in_flight", "gauge", "HTTP requests being served."
+        )
+        lines.append(
+            metric_sample("http_requests_in_flight", request_metrics.in_flight)
+        )
+
+    @staticmethod
+    def _pool_metrics(lines: List[str]) -> None:
+        stats = {
+            engine_name: pool_stats(engine.sync_engine.pool)
+            for engine_name, engine in get_engines().items()
+        }
+        for stat, kind, description in _POOL_METRICS:
+            name = f"db_pool_{stat}" + ("_total" if kind == "counter" else "")
+            samples = [
+                metric_sample(name, engine_stats[stat], {"engine": engine_name})
+                for engine_name, engine_stats in stats.items()
+                if stat in engine_stats
+            ]
+            if samples:
+                lines += metric_header(name, kind, description)
+                lines += samples
+        lines += metric_header(
+            "db_engine_up",
+            "gauge",
+            "Whether the last health check of an engine passed.",
+        )
+        for engine_name, health in pool_health_monitor.health.items():
+            lines.append(
+                metric_sample(
+                    "db_engine_up", int(health.healthy), {"engine": engine_name}
+                )
+            )
+        for name, value, description in (
+            (
+                "db_pool_evicted_connections_total",
+                pool_health_monitor.evicted,
+                "Idle connections evicted by the pool health monitor.",
+            ),
+            (
+                "db_pool_recycles_total",
+                pool_health_monitor.recycles,
+                "Pools recycled after a failed health check or a disconnect.",
+            ),
+        ):
+            lines += metric_header(name, "counter", description)
+            lines.append(metric_sample(name, value))
+
+    @staticmethod
+    def _cache_metrics(lines: List[str]) -> None:
+        for name, value, description in (
+            (
+                "fastapi_cache_hits_total",
+                request_metrics.cache_hits,
+                "Responses served from fastapi-cache.",
+            ),
+            (
+                "fastapi_cache_misses_total",
+                request_metrics.cache_misses,
+                "Responses fastapi-cache had to compute.",
+            ),
+            (
+                "fastapi_cache_coalesced_total",
+                cache_single_flight.coalesced,
+                "Cache misses that waited for a response another request computed.",
+            ),
+            (
+                "fastapi_cache_stale_hits_total",
+                cache_stats.stale_hits,
+                "Expired responses served while being refreshed.",
+            ),
+            (
+                "fastapi_cache_background_refreshes_total",
+                cache_stats.background_refreshes,
+                "Cached responses refreshed in the background.",
+            ),
+            (
+                "fastapi_cache_failed_refreshes_total",
+                cache_stats.failed_refreshes,
+                "Background refreshes of cached responses that failed.",
+            ),
+            ("token_cache_hits_total", token_cache.hits, "Token cache hits."),
+            ("token_cache_misses_total", token_cache.misses, "Token cache misses."),
+        ):
+            lines += metric_header(name, "counter", description)
+            lines.append(metric_sample(name, value))
+        lines += metric_header("token_cache_entries", "gauge", "Cached tokens.")
+        lines.append(metric_sample("token_cache_entries", len(token_cache)))
+        backend = FastAPICache.get_backend()
+        if isinstance(backend, BoundedMemoryBackend):
+            stats = backend.stats()
+            for stat, kind, description in _CACHE_BACKEND_METRICS:
+                name = f"fastapi_cache_backend_{stat}"
+                if kind == "counter":
+                    name += "_total"
+                lines += metric_header(name, kind, description)
+                lines.append(metric_sample(name, stats[stat]))
+
+    @staticmethod
+    def _password_hashing_metrics(lines: List[str]) -> None:
+        stats = password_hashing_pool.stats()
+        for stat, kind, description in _PASSWORD_HASHING_METRICS:
+            name = f"password_hashing_{stat}"
+            if kind == "counter":
+                name = name.removesuffix("_sum") + "_total"
+            lines += metric_header(name, kind, description)
+            lines.append(metric_sample(name, stats[stat]))
@@ -0,0 +1,92 @@
+import hashlib
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Tuple, Union
+
+from loguru import logger
+
+from src.configs.envs import Config
+from src.database.models.refresh_tokens import RefreshToken
+from src.database.models.users import User
+from src.exceptions.http_exceptions import CredentialsException
+from src.services.auth import AuthService
+
+
+class RefreshTokenService:
+    """
+    Rotating refresh tokens.
+
+    Tokens are random, so a fast SHA-256 digest is enough to store them safely, and
+    refreshing never involves password hashing. Each token can be used once: using
+    it again means it leaked, and revokes every token descending from the same
+    login.
+    """
+
+    @staticmethod
+    def _hash(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    async def issue(self, user_id: int, family_id: Union[str, None] = None) -> str:
+        """
+        Create a refresh token.
+
+        Args:
+            user_id (int): The ID of the user it is issued to.
+            family_id (str | None): The family of the token it replaces; a new
+                family is started if None.
+        Returns:
+            str: The opaque refresh token.
+        """
+        token = secrets.token_urlsafe(32)
+        await RefreshToken.new(
+            user_id=user_id,
+            family_id=family_id or uuid.uuid4().hex,
+            token_hash=self._hash(token),
+            expires_at=datetime.now(timezone.utc)
+            + timedelta(days=Config.AUTH.REFRESH_TOKEN_EXPIRE_DAYS),
+        )
+        return token
+
+    async def rotate(self, token: str) -> Tuple[User, str]:
+        """
+        Use a refresh token, replacing it by a new one of the same family.
+
+        A failed refresh still commits the revocations it made, as the exception
+        is turned into a response within the request's unit of work.
+
+        Args:
+            token (str): The refresh token.
+        Returns:
+            Tuple[User, str]: The user it was issued to and the new refresh token.
+        Raises:
+            CredentialsException: If the token is unknown, expired, already used or
+                its user can no longer log in.
+        """
+        stored = await RefreshToken.get_by_token_hash_for_update(self._hash(token))
+        if stored is None:
+            raise CredentialsException()
+        if stored.revoked_at is not None:
+            revoked = await RefreshToken.revoke_family(stored.family_id)
+            logger.warning(
+                f"Refresh token reused, revoked its family: {stored.user_id=}, "
+                f"{revoked=}"
+            )
+            raise CredentialsException()
+        now = datetime.now(timezone.utc)
+        if stored.expires_at <= now:
+            raise CredentialsException()
+
+        # From the primary: a lagging replica could still return a user that was
+        # deactivated or deleted since.
+        user: Union[User, None] = await User.get_by_id(
+            stored.user_id, from_primary=True
+        )
+        if user is not None:
+            await AuthService.require_user_types(user.user_type_id)
+        if user is None or not AuthService.is_active_user(user):
+            await RefreshToken.revoke_family(stored.family_id)
+            raise CredentialsException()
+
+        await stored.update(revoked_at=now)
+        return user, await self.issue(user.id, family_id=stored.family_id)
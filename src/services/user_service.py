@@ -1,15 +1,27 @@
-from typing import List, Union
+from datetime import datetime
+from typing import AsyncIterable, List, Set, Tuple, Union
 
 from loguru import logger
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 
+from src.configs.envs import Config
+from src.database.models.refresh_tokens import RefreshToken
 from src.database.models.user_types import UserType
 from src.database.models.users import User
+from src.database.session import db
 from src.exceptions.http_exceptions import (
+    InvalidCursorException,
     NotFoundException,
     UserAlreadyRegistereException,
 )
-from src.schemas.user import UserCreate
+from src.schemas.user import BulkUserImportOut, BulkUserRowError, UserCreate
+from src.utils.auth_util import hash_passwords_async
 from src.utils.enums import UserTypeEnum
+from src.utils.ndjson import iter_ndjson_lines
+from src.utils.pagination import InvalidCursorError
+from src.utils.token_cache import token_cache
+from src.utils.token_revocations import token_revocations
 
 
 class UserService:
@@ -22,21 +34,58 @@ class UserService:
         """
         return await User.get_all()
 
-    async def get_user(self, user_id: int) -> User:
+    async def get_page(
+        self, limit: int, after: Union[str, None] = None
+    ) -> Tuple[List[User], Union[str, None]]:
+        """
+        Retrieve a page of users, ordered by creation.
+
+        Args:
+            limit (int): Maximum number of users in the page.
+            after (str | None): Cursor returned with the previous page.
+
+        Returns:
+            tuple[List[User], str | None]: The users and the next page cursor.
+        """
+        try:
+            return await User.get_page(limit=limit, after=after)
+        except InvalidCursorError:
+            raise InvalidCursorException(after)
+
+    async def get_user(self, user_id: int, from_primary: bool = False) -> User:
         """
         Retrieve a user by ID.
 
         Args:
             user_id (int): The ID of the user.
+            from_primary (bool): Read from the primary even if replicas are
+                configured, e.g. before changing the user.
 
         Returns:
             User: The User object.
         """
-        user: Union[User, None] = await User.get_by_id(user_id)
+        user: Union[User, None] = await User.get_by_id(
+            user_id, from_primary=from_primary
+        )
         if not user:
             raise NotFoundException(User)
         return user
 
+    async def get_user_updated_at(self, user_id: int) -> datetime:
+        """
+        Retrieve when a user was last updated, without loading it.
+
+        Args:
+            user_id (int): The ID of the user.
+
+        Returns:
+            datetime: The `updated_at` of the user.
+        """
+        updated_at: Union[datetime, None] = await User.get_updated_at(user_id)
+        if updated_at is None:
+            raise NotFoundException(User)
+        return updated_at
+
     async def create_default_user(self, user: UserCreate) -> User:
         """
         Create a new user.
@@ -54,7 +103,94 @@ class UserService:
         if not user_type:
             raise NotFoundException(UserType)
         logger.info(f"{user_type.id=}; {user_type.title=}; {user_type.description=}")
-        return await User.new(user_type_id=user_type.id, **user.model_dump())
+        return await User.new(
+            user_type_id=user_type.id, **await user.model_dump_hashed()
+        )
+
+    async def bulk_import_users(self, body: AsyncIterable[bytes]) -> BulkUserImportOut:
+        """
+        Create default users from a newline-delimited JSON stream.
+
+        Each line is validated as a `UserCreate`. Valid rows are processed in chunks
+        of `BULK_IMPORT_CHUNK_SIZE`: already registered or repeated emails are
+        rejected with one query per chunk, passwords are hashed in parallel and the
+        chunk is inserted with multi-row `INSERT ... RETURNING` statements inside a
+        savepoint, so a failing chunk does not discard previous ones.
+
+        Args:
+            body (AsyncIterable[bytes]): The raw NDJSON request body.
+
+        Returns:
+            BulkUserImportOut: The number of created users and per-line failures.
+        """
+        user_type: UserType = await UserType.get_by_title(UserTypeEnum.USER)
+        if not user_type:
+            raise NotFoundException(UserType)
+
+        result = BulkUserImportOut(created=0, failed=[])
+        seen_emails: Set[str] = set()
+        chunk: List[Tuple[int, UserCreate]] = []
+        async for line_number, line in iter_ndjson_lines(body):
+            try:
+                chunk.append((line_number, UserCreate.model_validate_json(line)))
+            except ValidationError as error:
+                result.failed.append(
+                    BulkUserRowError(
+                        line=line_number,
+                        errors=[err["msg"] for err in error.errors()],
+                    )
+                )
+            if len(chunk) >= Config.BULK_IMPORT_CHUNK_SIZE:
+                await self._import_chunk(chunk, user_type, seen_emails, result)
+                chunk = []
+        if chunk:
+            await self._import_chunk(chunk, user_type, seen_emails, result)
+        logger.info(
+            f"Bulk user import finished: {result.created=}; {len(result.failed)=}"
+        )
+        return result
+
+    async def _import_chunk(
+        self,
+        chunk: List[Tuple[int, UserCreate]],
+        user_type: UserType,
+        seen_emails: Set[str],
+        result: BulkUserImportOut,
+    ) -> None:
+        registered_emails = await User.get_registered_emails(
+            user.email for _, user in chunk
+        )
+        accepted: List[Tuple[int, UserCreate]] = []
+        for line_number, user in chunk:
+            if user.email in registered_emails or user.email in seen_emails:
+                result.failed.append(
+                    BulkUserRowError(
+                        line=line_number,
+                        errors=[f"User email '{user.email}' already registered"],
+                    )
+                )
+                continue
+            seen_emails.add(user.email)
+            accepted.append((line_number, user))
+        if not accepted:
+            return
+
+        hashes = await hash_passwords_async([user.password for _, user in accepted])
+        rows = [
+            {**user.model_dump(), "password": password, "user_type_id": user_type.id}
+            for (_, user), password in zip(accepted, hashes)
+        ]
+        try:
+            async with db.session.begin_nested():
+                created = await User.new_many(rows)
+        except IntegrityError as error:
+            logger.warning(f"Bulk user import chunk rejected: {error.orig}")
+            result.failed.extend(
+                BulkUserRowError(line=line_number, errors=["Could not insert user"])
+                for line_number, _ in accepted
+            )
+            return
+        result.created += len(created)
 
     async def update_user(self, user_id: int, updated_user: UserCreate):
         """
@@ -67,8 +203,19 @@ class UserService:
         Returns:
             User: The updated User object.
         """
-        user: User = await self.get_user(user_id)
-        return await user.update(**updated_user.model_dump())
+        user: User = await self.get_user(user_id, from_primary=True)
+        security_version = user.security_version + 1
+        await user.update(
+            **await updated_user.model_dump_hashed(), security_version=security_version
+        )
+        # In the same unit of work: refresh tokens must not outlive the access
+        # tokens revoked below.
+        await RefreshToken.revoke_user(user_id)
+        token_cache.invalidate_user(user_id)
+        # Again once committed: until then, concurrent requests can still load
+        # and cache the previous row.
+        db.after_commit(lambda: token_cache.invalidate_user(user_id))
+        token_revocations.revoke_user(user_id, security_version)
 
     async def delete_user(self, user_id: int):
         """
@@ -78,6 +225,12 @@ class UserService:
             user_id (int): The ID of the user.
         """
 
-        user: User = await self.get_user(user_id)
+        user: User = await self.get_user(user_id, from_primary=True)
+        await RefreshToken.revoke_user(user_id)
         await user.delete()
+        token_cache.invalidate_user(user_id)
+        # Again once committed: until then, concurrent requests can still load
+        # and cache the previous row.
+        db.after_commit(lambda: token_cache.invalidate_user(user_id))
+        token_revocations.revoke_user(user_id, user.security_version + 1)
         return {"message": "User deleted successfully"}
@@ -3,11 +3,15 @@ from typing import List, Union
 from loguru import logger
 
 from src.database.models.user_types import UserType
+from src.database.session import db
 from src.exceptions.http_exceptions import (
     NotFoundException,
     UserTypeAlreadyRegisteredException,
 )
 from src.schemas.user_type import UserTypeCreate
+from src.utils.token_cache import token_cache
+from src.utils.token_revocations import token_revocations
+from src.utils.user_type_table import user_type_table
 
 
 class UserTypeService:
@@ -20,17 +24,23 @@ class UserTypeService:
         """
         return await UserType.get_all()
 
-    async def get_user_type(self, user_type_id: int) -> UserType:
+    async def get_user_type(
+        self, user_type_id: int, from_primary: bool = False
+    ) -> UserType:
         """
         Retrieve a user type by ID.
 
         Args:
             user_type_id (int): The ID of the user type.
+            from_primary (bool): Read from the primary even if replicas are
+                configured, e.g. before changing the user type.
 
         Returns:
             UserType: The UserType object.
         """
-        user_type: Union[UserType, None] = await UserType.get_by_id(user_type_id)
+        user_type: Union[UserType, None] = await UserType.get_by_id(
+            user_type_id, from_primary=from_primary
+        )
         if not user_type:
             raise NotFoundException(UserType)
         return user_type
@@ -48,7 +58,9 @@ class UserTypeService:
         logger.info(user_type.model_dump())
         if await UserType.get_by_title(user_type.title):
             raise UserTypeAlreadyRegisteredException(user_type.title)
-        return await UserType.new(**user_type.model_dump())
+        created = await UserType.new(**user_type.model_dump())
+        db.after_commit(user_type_table.mark_stale)
+        return created
 
     async def update_user_type(
         self, user_type_id: int, updated_user_type: UserTypeCreate
@@ -63,8 +75,14 @@ class UserTypeService:
         Returns:
             UserType: The updated UserType object.
         """
-        user_type: UserType = await self.get_user_type(user_type_id)
-        return await user_type.update(**updated_user_type.model_dump())
+        user_type: UserType = await self.get_user_type(user_type_id, from_primary=True)
+        await user_type.update(**updated_user_type.model_dump())
+        db.after_commit(user_type_table.mark_stale)
+        token_cache.invalidate_user_type(user_type_id)
+        # Again once committed: until then, concurrent requests can still load
+        # and cache users with the previous user type.
+        db.after_commit(lambda: token_cache.invalidate_user_type(user_type_id))
+        token_revocations.revoke_user_type(user_type_id)
 
     async def delete_user_type(self, user_type_id: int):
         """
@@ -74,6 +92,12 @@ class UserTypeService:
             user_type_id (int): The ID of the user type.
         """
 
-        user_type: UserType = await self.get_user_type(user_type_id)
+        user_type: UserType = await self.get_user_type(user_type_id, from_primary=True)
         await user_type.delete()
+        db.after_commit(user_type_table.mark_stale)
+        token_cache.invalidate_user_type(user_type_id)
+        # Again once committed: until then, concurrent requests can still load
+        # and cache users with the previous user type.
+        db.after_commit(lambda: token_cache.invalidate_user_type(user_type_id))
+        token_revocations.revoke_user_type(user_type_id)
         return {"message": "User type deleted successfully"}
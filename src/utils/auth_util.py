@@ -1,7 +1,18 @@
+import asyncio
+import math
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, List, Sequence, TypeVar, Union
+
 from passlib.context import CryptContext
 
+from src.configs.envs import Config
+from src.exceptions.http_exceptions import ServiceBusyException
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+T = TypeVar("T")
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -15,3 +26,136 @@ def get_password_hash(password: str) -> str:
     Hash a password.
     """
     return pwd_context.hash(password)
+
+
+class PasswordHashingPool:
+    """
+    Runs bcrypt calls in a bounded executor so they never block the event loop.
+
+    At most `max_concurrency` calls are submitted to the executor at once; other
+    callers wait in a queue for up to `queue_timeout_seconds` before being rejected
+    with `ServiceBusyException`.
+    """
+
+    def __init__(
+        self,
+        pool_size: int,
+        max_concurrency: int,
+        queue_timeout_seconds: float,
+        use_processes: bool = True,
+    ):
+        self.pool_size = max(pool_size, 1)
+        self.max_concurrency = max(max_concurrency, 1)
+        self.queue_timeout_seconds = queue_timeout_seconds
+        self.use_processes = use_processes
+        self._executor: Union[Executor, None] = None
+        self._semaphore: Union[asyncio.Semaphore, None] = None
+
+        self.queue_depth = 0
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_seconds_sum = 0.0
+        self.hash_seconds_sum = 0.0
+        self.hash_seconds_max = 0.0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            executor_class = (
+                ProcessPoolExecutor if self.use_processes else ThreadPoolExecutor
+            )
+            self._executor = executor_class(max_workers=self.pool_size)
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+    async def run(self, func: Callable[..., T], *args) -> T:
+        """
+        Run `func(*args)` in the pool, waiting for a free slot first.
+
+        Raises:
+            ServiceBusyException: If no slot frees up within the queue timeout.
+        """
+        semaphore = self._get_semaphore()
+        queued_at = time.perf_counter()
+        self.queue_depth += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServiceBusyException(math.ceil(self.queue_timeout_seconds))
+        finally:
+            self.queue_depth -= 1
+
+        started_at = time.perf_counter()
+        self.wait_seconds_sum += started_at - queued_at
+        self.in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            self.in_flight -= 1
+            self.completed += 1
+            self.hash_seconds_sum += elapsed
+            self.hash_seconds_max = max(self.hash_seconds_max, elapsed)
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Union[int, float]]:
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "wait_seconds_sum": self.wait_seconds_sum,
+            "hash_seconds_sum": self.hash_seconds_sum,
+            "hash_seconds_max": self.hash_seconds_max,
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._semaphore = None
+
+
+password_hashing_pool = PasswordHashingPool(
+    pool_size=Config.AUTH.PASSWORD_HASHING_POOL_SIZE,
+    max_concurrency=Config.AUTH.PASSWORD_HASHING_MAX_CONCURRENCY,
+    queue_timeout_seconds=Config.AUTH.PASSWORD_HASHING_QUEUE_TIMEOUT_SECONDS,
+    use_processes=Config.AUTH.PASSWORD_HASHING_USE_PROCESSES,
+)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verify a plain password against a hashed password without blocking the loop.
+    """
+    return await password_hashing_pool.run(
+        verify_password, plain_password, hashed_password
+    )
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hash a password without blocking the loop.
+    """
+    return await password_hashing_pool.run(get_password_hash, password)
+
+
+async def hash_passwords_async(passwords: Sequence[str]) -> List[str]:
+    """
+    Hash many passwords in parallel without blocking the loop.
+
+    Passwords are submitted in waves no larger than the pool's concurrency so
+    that large batches never sit in the queue long enough to time out.
+    """
+    wave_size = password_hashing_pool.max_concurrency
+    hashes: List[str] = []
+    for start in range(0, len(passwords), wave_size):
+        wave = passwords[start : start + wave_size]
+        hashes.extend(await asyncio.gather(*map(hash_password_async, wave)))
+    return hashes
@@ -0,0 +1,113 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Protocol, Union
+
+from fastapi import Response, status
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+# Headers describing a body, which a `304 Not Modified` response has none of.
+_REPRESENTATION_HEADERS = frozenset(
+    {
+        b"content-encoding",
+        b"content-language",
+        b"content-length",
+        b"content-range",
+        b"content-type",
+        b"transfer-encoding",
+    }
+)
+
+
+class Versioned(Protocol):
+    """Anything exposing the `id` and `updated_at` fields of `BaseDBSchema`."""
+
+    id: int
+    updated_at: datetime
+
+
+def _version(updated_at: datetime) -> int:
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    # Exact microseconds since the epoch; a float timestamp could round.
+    return (updated_at - _EPOCH) // timedelta(microseconds=1)
+
+
+def entity_etag(id: int, updated_at: datetime) -> str:
+    """
+    Weak ETag of an entity, changing whenever its `updated_at` does.
+
+    Args:
+        id (int): The `id` of the entity.
+        updated_at (datetime): The `updated_at` of the entity.
+    Returns:
+        str: The ETag.
+    """
+    return f'W/"{id}-{_version(updated_at):x}"'
+
+
+def collection_etag(entities: Iterable[Versioned], *extra: Union[str, None]) -> str:
+    """
+    Weak ETag of a list of entities, also covering their order and `extra` values
+    sent along with them (e.g. a next page cursor).
+
+    Returns:
+        str: The ETag.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for entity in entities:
+        digest.update(f"{entity.id}-{_version(entity.updated_at):x};".encode())
+    for value in extra:
+        digest.update(f"{value};".encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def content_etag(content: bytes) -> str:
+    """
+    Weak ETag of a response body, the same in every process and worker.
+
+    Args:
+        content (bytes): The body, e.g. as stored in the response cache.
+    Returns:
+        str: The ETag.
+    """
+    return f'W/"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Union[str, None], etag: str) -> bool:
+    """
+    Whether an `If-None-Match` header value matches `etag`, using the weak
+    comparison RFC 9110 prescribes for it.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_get(
+    response: Response, etag: str, if_none_match: Union[str, None]
+) -> Union[Response, None]:
+    """
+    Answer a conditional GET.
+
+    Returns:
+        Response | None: A `304 Not Modified` response, carrying the headers already
+        set on `response` except those describing a body, when `if_none_match`
+        matches `etag`. Otherwise None, and `etag` is set on `response`.
+    """
+    response.headers["ETag"] = etag
+    if not etag_matches(if_none_match, etag):
+        return None
+    not_modified = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    not_modified.raw_headers.extend(
+        header
+        for header in response.raw_headers
+        if header[0] not in _REPRESENTATION_HEADERS
+    )
+    return not_modified
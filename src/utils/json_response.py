@@ -0,0 +1,48 @@
+"""
+JSON responses serialized straight to bytes by pydantic.
+
+For an endpoint returning ORM objects, FastAPI validates them against the
+`response_model`, dumps the result to Python dicts and lists, and then encodes those
+with `json.dumps`. `serialized_response` instead validates the objects once with a
+cached `TypeAdapter` and has pydantic-core write the JSON bytes directly, which
+avoids building and walking the intermediate structure.
+
+Endpoints keep declaring `response_model`, which still documents the response in
+the OpenAPI schema; FastAPI leaves returned `Response` objects untouched.
+"""
+
+from functools import lru_cache
+from typing import Any, Union
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def type_adapter(type_: Any) -> TypeAdapter:
+    """Return the `TypeAdapter` of `type_`, building it on first use only."""
+    return TypeAdapter(type_)
+
+
+def serialized_response(
+    type_: Any, content: Any, response: Union[Response, None] = None
+) -> Response:
+    """
+    Serialize `content` as `type_` into a JSON response.
+
+    Args:
+        type_: The schema of the content, e.g. `List[UserOut]`.
+        content: ORM objects (or anything with the schema's attributes).
+        response: The endpoint's `Response` parameter; the headers set on it are
+            carried over, as FastAPI does not merge them into returned responses.
+    Returns:
+        Response: The JSON response.
+    """
+    adapter = type_adapter(type_)
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+    json_response = Response(body, media_type="application/json")
+    if response is not None:
+        json_response.raw_headers.extend(
+            header for header in response.raw_headers if header[0] != b"content-length"
+        )
+    return json_response
@@ -0,0 +1,169 @@
+"""
+Keys signing and verifying access tokens.
+
+With an HMAC algorithm (HS256, ...), tokens are signed and verified with the shared
+`SECRET_KEY`, as before. With an asymmetric one (RS256, EdDSA, ...), each
+`<kid>.pem` private key of `keys_dir` is a key: tokens are signed with the active
+one and carry its `kid` header, and are verified with whichever key their `kid`
+names. The public keys are published as a JWKS, so other services can verify
+tokens without calling back into this one.
+
+Keys are rotated by adding a new key file, making it the active key, and removing
+the old one once the tokens it signed have expired. Key files are read again every
+`reload_seconds`, and when a token names an unknown key (signed by a worker that
+already picked up a new key), so rotation needs no restart unless `active_kid` is
+pinned through the configuration.
+"""
+
+import hashlib
+import json
+import time
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Tuple, Union
+
+import jwt
+from jwt.algorithms import HMACAlgorithm
+from loguru import logger
+
+from src.configs.envs import Config
+
+
+class _KeySet(NamedTuple):
+    private_keys: Dict[str, Any]
+    public_keys: Dict[str, Any]
+    active_kid: str
+    jwks: bytes
+    jwks_etag: str
+    loaded_at: float
+
+
+class KeyRing:
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: Union[str, None],
+        keys_dir: Union[str, Path],
+        active_kid: Union[str, None] = None,
+        reload_seconds: float = 300,
+        min_reload_seconds: float = 10,
+    ):
+        """
+        Args:
+            reload_seconds (float): How often the key files are read again.
+            min_reload_seconds (float): How often they may be read again for tokens
+                naming an unknown key, so forged key IDs cannot force a read per
+                request.
+        """
+        self.algorithm = algorithm
+        self.secret_key = secret_key
+        self.keys_dir = Path(keys_dir)
+        self.active_kid = active_kid or None
+        self.reload_seconds = reload_seconds
+        self.min_reload_seconds = min_reload_seconds
+        self._key_set: Union[_KeySet, None] = None
+        self._unknown_kid_reloaded_at = float("-inf")
+
+    @cached_property
+    def asymmetric(self) -> bool:
+        return not isinstance(jwt.get_algorithm_by_name(self.algorithm), HMACAlgorithm)
+
+    def _load(self) -> _KeySet:
+        # Keys are read on first use, not on import.
+        key_set = self._key_set
+        if (
+            key_set is not None
+            and time.monotonic() - key_set.loaded_at < self.reload_seconds
+        ):
+            return key_set
+        try:
+            self._key_set = self._read()
+        except (OSError, ValueError, jwt.InvalidKeyError) as error:
+            if key_set is None:
+                raise
+            # E.g. a key file being written: keep the keys read last time.
+            logger.warning(f"Could not reload the JWT signing keys: {error!r}")
+            self._key_set = key_set._replace(loaded_at=time.monotonic())
+        return self._key_set
+
+    def _read(self) -> _KeySet:
+        algorithm = jwt.get_algorithm_by_name(self.algorithm)
+        private_keys: Dict[str, Any] = {}
+        jwks = []
+        if self.asymmetric:
+            for path in sorted(self.keys_dir.glob("*.pem")):
+                private_key = algorithm.prepare_key(path.read_bytes())
+                private_keys[path.stem] = private_key
+                jwk = algorithm.to_jwk(private_key.public_key(), as_dict=True)
+                jwks.append(
+                    {**jwk, "kid": path.stem, "alg": self.algorithm, "use": "sig"}
+                )
+            if not private_keys:
+                raise ValueError(f"No {self.algorithm} key found in {self.keys_dir}")
+            active_kid = self.active_kid or next(reversed(private_keys))
+            if active_kid not in private_keys:
+                raise ValueError(f"Unknown active key ID {active_kid!r}")
+        else:
+            active_kid = ""
+        body = json.dumps({"keys": jwks}, separators=(",", ":")).encode()
+        return _KeySet(
+            private_keys=private_keys,
+            public_keys={kid: key.public_key() for kid, key in private_keys.items()},
+            active_kid=active_kid,
+            jwks=body,
+            jwks_etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            loaded_at=time.monotonic(),
+        )
+
+    def signing_key(self) -> Tuple[Any, Union[Dict[str, str], None]]:
+        """
+        The key to sign new tokens with, and the headers to sign them with.
+        """
+        if not self.asymmetric:
+            return self.secret_key, None
+        key_set = self._load()
+        return key_set.private_keys[key_set.active_kid], {"kid": key_set.active_kid}
+
+    def verification_key(self, token: str) -> Any:
+        """
+        The key to verify a token with.
+
+        Raises:
+            jwt.InvalidTokenError: If the token is malformed or names no known key.
+        """
+        if not self.asymmetric:
+            return self.secret_key
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self._load().public_keys.get(kid)
+        now = time.monotonic()
+        if (
+            key is None
+            and now - self._unknown_kid_reloaded_at >= self.min_reload_seconds
+        ):
+            self._unknown_kid_reloaded_at = now
+            self.reload()
+            key = self._load().public_keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown key ID {kid!r}")
+        return key
+
+    def jwks(self) -> Tuple[bytes, str]:
+        """
+        The JSON Web Key Set of the public keys, and its ETag.
+        """
+        key_set = self._load()
+        return key_set.jwks, key_set.jwks_etag
+
+    def reload(self) -> None:
+        """Read the keys again on next use, e.g. after a rotation."""
+        if self._key_set is not None:
+            self._key_set = self._key_set._replace(loaded_at=float("-inf"))
+
+
+key_ring = KeyRing(
+    algorithm=Config.AUTH.ALGORITHM,
+    secret_key=Config.AUTH.SECRET_KEY,
+    keys_dir=Config.AUTH.JWT_KEYS_DIR,
+    active_kid=Config.AUTH.JWT_ACTIVE_KID,
+    reload_seconds=Config.AUTH.JWT_KEYS_RELOAD_SECONDS,
+)
@@ -0,0 +1,95 @@
+import atexit
+import queue
+import threading
+from typing import Dict, List, TextIO
+
+_STOP = object()
+
+
+class BackgroundBatchSink:
+    """
+    Loguru sink handing formatted records to a background writer thread.
+
+    Records are queued without blocking the caller and written to `stream` in
+    batches. When the queue is full (e.g. stdout is slow or blocked) new records are
+    dropped and counted instead of stalling the event loop.
+    """
+
+    STOP_TIMEOUT_SECONDS = 5
+
+    def __init__(
+        self,
+        stream: TextIO,
+        max_queue_size: int = 10000,
+        batch_size: int = 256,
+        flush_interval_seconds: float = 0.05,
+    ):
+        self.stream = stream
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.dropped = 0
+        self.written = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(max_queue_size, 1))
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def write(self, message: str) -> None:
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval_seconds)
+            except queue.Empty:
+                continue
+            batch: List[str] = []
+            item = first
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write_batch(batch)
+
+    def _write_batch(self, batch: List[str]) -> None:
+        try:
+            self.stream.write("".join(batch))
+            self.stream.flush()
+            self.written += len(batch)
+        except Exception:
+            self.dropped += len(batch)
+
+    def stop(self) -> None:
+        """
+        Flush pending records and stop the writer thread.
+
+        Called by loguru when the handler is removed and at interpreter exit.
+        """
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=self.STOP_TIMEOUT_SECONDS)
+        except queue.Full:
+            return
+        self._thread.join(timeout=self.STOP_TIMEOUT_SECONDS)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
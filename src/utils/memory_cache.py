@@ -0,0 +1,147 @@
+"""
+Bounded in-process fastapi-cache backend.
+
+Unlike fastapi-cache's `InMemoryBackend`, which only drops an expired entry when it
+is read again and grows without limit, this backend holds at most `max_entries`
+entries totalling at most `max_bytes` bytes of keys and values, evicting the least
+recently used ones first, and a periodic sweeper removes expired entries nobody
+reads anymore.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple, Union
+
+from fastapi_cache.types import Backend
+
+NEVER = float("inf")
+
+
+class _Entry(NamedTuple):
+    value: bytes
+    expires_at: float
+    size: int
+
+
+class BoundedMemoryBackend(Backend):
+    """
+    LRU + TTL fastapi-cache backend bounded by entry count and bytes.
+
+    Every operation runs without awaiting, so it is atomic on the event loop and
+    needs no lock.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, sweep_interval_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval_seconds = sweep_interval_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._sweeper: Union[asyncio.Task, None] = None
+
+    def _remove(self, key: str) -> None:
+        self.bytes -= self._entries.pop(key).size
+
+    def _lookup(self, key: str) -> Union[_Entry, None]:
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        entry = self._lookup(key)
+        if entry is None:
+            return 0, None
+        if entry.expires_at == NEVER:
+            return -1, entry.value
+        return int(entry.expires_at - time.monotonic()), entry.value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._lookup(key)
+        return None if entry is None else entry.value
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        size = len(key) + len(value)
+        if key in self._entries:
+            self._remove(key)
+        if size > self.max_bytes:
+            return
+        while self._entries and (
+            len(self._entries) >= self.max_entries or self.bytes + size > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        expires_at = time.monotonic() + expire if expire else NEVER
+        self._entries[key] = _Entry(value, expires_at, size)
+        self.bytes += size
+
+    async def clear(
+        self, namespace: Optional[str] = None, key: Optional[str] = None
+    ) -> int:
+        if namespace:
+            keys = [stored for stored in self._entries if stored.startswith(namespace)]
+        elif key:
+            keys = [key] if key in self._entries else []
+        else:
+            keys = list(self._entries)
+        for stored in keys:
+            self._remove(stored)
+        return len(keys)
+
+    def sweep(self) -> int:
+        """
+        Remove every expired entry.
+
+        :returns: the number of entries removed.
+        """
+        now = time.monotonic()
+        expired = [
+            key for key, entry in self._entries.items() if entry.expires_at <= now
+        ]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def start_sweeper(self) -> None:
+        if self._sweeper is None:
+            self._sweeper = asyncio.create_task(self._sweep_periodically())
+
+    async def stop_sweeper(self) -> None:
+        if self._sweeper is None:
+            return
+        self._sweeper.cancel()
+        try:
+            await self._sweeper
+        except asyncio.CancelledError:
+            pass
+        self._sweeper = None
+
+    async def _sweep_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            self.sweep()
@@ -0,0 +1,123 @@
+"""
+Cheap in-process metrics and their Prometheus text exposition.
+
+Everything is updated from the event loop thread only, so plain attributes are used
+instead of locks. Each worker process keeps its own values.
+"""
+
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Sequence, Tuple, Union
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+UNMATCHED_ROUTE = "<unmatched>"
+
+Labels = Dict[str, str]
+Number = Union[int, float]
+
+
+class Histogram:
+    """Histogram with preallocated buckets; `observe` only bumps numbers."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        # One slot per bound plus the implicit +Inf bucket.
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> List[Tuple[str, int]]:
+        """Return the `(le, count)` pairs Prometheus expects, ending with +Inf."""
+        total = 0
+        buckets = []
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            total += count
+            buckets.append((format_value(bound), total))
+        return buckets
+
+
+class RequestMetrics:
+    """
+    Per method, route and status latency histograms and an in-flight gauge.
+
+    Histograms are created the first time a (method, route, status) combination is
+    seen, so steady state requests allocate nothing. Routes are the matched path
+    templates (e.g. `/user/{user_id}`), which keeps the label cardinality bounded.
+    """
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.in_flight = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.latencies: Dict[str, Dict[str, Dict[int, Histogram]]] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float) -> None:
+        by_route = self.latencies.get(method)
+        if by_route is None:
+            by_route = self.latencies[method] = {}
+        by_status = by_route.get(route)
+        if by_status is None:
+            by_status = by_route[route] = {}
+        histogram = by_status.get(status)
+        if histogram is None:
+            histogram = by_status[status] = Histogram(self.bounds)
+        histogram.observe(seconds)
+
+    def histograms(self) -> Iterable[Tuple[Labels, Histogram]]:
+        for method, by_route in self.latencies.items():
+            for route, by_status in by_route.items():
+                for status, histogram in by_status.items():
+                    labels = {"method": method, "route": route, "status": str(status)}
+                    yield labels, histogram
+
+    def reset(self) -> None:
+        self.in_flight = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.latencies = {}
+
+
+request_metrics = RequestMetrics()
+
+
+def format_value(value: Number) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Union[Labels, None]) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def metric_header(name: str, kind: str, description: str) -> List[str]:
+    return [f"# HELP {name} {description}", f"# TYPE {name} {kind}"]
+
+
+def metric_sample(name: str, value: Number, labels: Union[Labels, None] = None) -> str:
+    return f"{name}{format_labels(labels)} {format_value(value)}"
+
+
+def histogram_samples(name: str, labels: Labels, histogram: Histogram) -> List[str]:
+    lines = [
+        metric_sample(f"{name}_bucket", count, {**labels, "le": le})
+        for le, count in histogram.cumulative_counts()
+    ]
+    lines.append(metric_sample(f"{name}_sum", histogram.sum, labels))
+    lines.append(metric_sample(f"{name}_count", histogram.count, labels))
+    return lines
@@ -0,0 +1,29 @@
+from typing import AsyncIterable, AsyncIterator, Tuple
+
+
+async def iter_ndjson_lines(
+    chunks: AsyncIterable[bytes],
+) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Split a stream of bytes into newline-delimited JSON lines.
+
+    Only the current, incomplete line is buffered, so arbitrarily large bodies can
+    be consumed as they are received.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The raw body chunks.
+    Yields:
+        tuple[int, bytes]: The 1-based line number and the line content, skipping
+        blank lines.
+    """
+    buffer = b""
+    line_number = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield line_number, line
+    if buffer.strip():
+        yield line_number + 1, buffer
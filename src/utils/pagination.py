@@ -0,0 +1,41 @@
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded."""
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """
+    Encode a keyset position into an opaque, URL-safe cursor.
+
+    Args:
+        created_at (datetime): The `created_at` of the last row of a page.
+        id (int): The `id` of the last row of a page.
+    Returns:
+        str: The cursor.
+    """
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor.
+    Returns:
+        tuple[datetime, int]: The `created_at` and `id` of the keyset position.
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(created_at), int(id)
+    except (ValueError, TypeError) as error:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from error
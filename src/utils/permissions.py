@@ -0,0 +1,74 @@
+"""
+Bitmask representation of the user type permission flags.
+
+Each `UserPermissionsEnum` permission, plus `can_login`, is a bit of an int mask.
+A user type's mask is computed once per user type (see `CachedUserType`), so
+checking any set of permissions is a single `&`, and the missing permissions are
+the bits of `required & ~granted`.
+"""
+
+from types import MappingProxyType
+from typing import Any, Iterable, List, Mapping
+
+from src.utils.enums import UserPermissionsEnum
+
+PERMISSION_BITS: Mapping[UserPermissionsEnum, int] = MappingProxyType(
+    {permission: 1 << bit for bit, permission in enumerate(UserPermissionsEnum)}
+)
+CAN_LOGIN = 1 << len(PERMISSION_BITS)
+
+CAN_READ_ALL = PERMISSION_BITS[UserPermissionsEnum.can_read_all]
+CAN_CREATE_ALL = PERMISSION_BITS[UserPermissionsEnum.can_create_all]
+CAN_UPDATE_ALL = PERMISSION_BITS[UserPermissionsEnum.can_update_all]
+CAN_DELETE_ALL = PERMISSION_BITS[UserPermissionsEnum.can_delete_all]
+CAN_READ_OWN = PERMISSION_BITS[UserPermissionsEnum.can_read_own]
+CAN_CREATE_OWN = PERMISSION_BITS[UserPermissionsEnum.can_create_own]
+CAN_UPDATE_OWN = PERMISSION_BITS[UserPermissionsEnum.can_update_own]
+CAN_DELETE_OWN = PERMISSION_BITS[UserPermissionsEnum.can_delete_own]
+
+
+def permission_mask(permissions: Iterable[UserPermissionsEnum]) -> int:
+    """
+    Combine permissions into a mask.
+
+    Args:
+        permissions (Iterable[UserPermissionsEnum]): The permissions.
+    Returns:
+        int: The mask with the bit of every permission set.
+    """
+    mask = 0
+    for permission in permissions:
+        mask |= PERMISSION_BITS[permission]
+    return mask
+
+
+def granted_mask(user_type: Any) -> int:
+    """
+    Mask of the permission flags set on a user type.
+
+    Args:
+        user_type (Any): Anything with the `can_*` boolean fields of a user type.
+    Returns:
+        int: The mask of the flags that are true.
+    """
+    mask = CAN_LOGIN if user_type.can_login else 0
+    for permission, bit in PERMISSION_BITS.items():
+        if getattr(user_type, permission):
+            mask |= bit
+    return mask
+
+
+def missing_permissions(required: int, granted: int) -> List[UserPermissionsEnum]:
+    """
+    Permissions of `required` that `granted` lacks, in `UserPermissionsEnum` order.
+
+    Args:
+        required (int): The mask of the permissions asked for.
+        granted (int): The mask of the permissions held.
+    Returns:
+        List[UserPermissionsEnum]: The missing permissions; empty if none are.
+    """
+    missing = required & ~granted
+    if not missing:
+        return []
+    return [permission for permission, bit in PERMISSION_BITS.items() if missing & bit]
@@ -0,0 +1,192 @@
+"""
+Endpoint response caching on top of the fastapi-cache backend.
+
+It is used like `fastapi_cache.decorator.cache` and relies on the backend, coder,
+key builder and status header configured by `FastAPICache.init`. On top of it:
+
+- Concurrent misses for the same key are coalesced: a single caller runs the
+  endpoint and stores its result while the others wait for it, instead of every one
+  of them running the endpoint (a cache stampede whenever a popular entry expires).
+- With `stale_ttl`, entries are kept that much longer than `expire`. A stale entry
+  is served right away while a background task refreshes it, so callers only wait
+  for the endpoint when nothing, not even a stale entry, is cached.
+- With `early_refresh_beta`, fresh entries are refreshed in the background a little
+  before they expire, with a probability growing as expiry approaches and with the
+  time the endpoint takes (the "XFetch" algorithm). A higher beta refreshes earlier.
+
+The endpoint runs outside the unit of work of the request that triggered it, on a
+miss as well as in a background refresh: a miss is computed once for every caller
+and may outlive the first one. An endpoint that needs the database must open its
+own unit of work.
+"""
+
+import inspect
+import math
+import random
+import time
+from contextvars import Context
+from functools import wraps
+from typing import Any, Awaitable, Callable, Tuple, TypeVar
+
+from fastapi.dependencies.utils import get_typed_return_annotation, get_typed_signature
+from fastapi_cache import FastAPICache
+from loguru import logger
+from starlette.requests import Request
+from starlette.responses import Response
+
+from src.database.session import outside_unit_of_work
+from src.utils.etag import conditional_get, content_etag
+from src.utils.single_flight import SingleFlight
+
+T = TypeVar("T")
+
+_REQUEST = inspect.Parameter(
+    "__cache_request", inspect.Parameter.KEYWORD_ONLY, annotation=Request
+)
+_RESPONSE = inspect.Parameter(
+    "__cache_response", inspect.Parameter.KEYWORD_ONLY, annotation=Response
+)
+
+
+class ResponseCacheStats:
+    def __init__(self):
+        self.stale_hits = 0
+        self.background_refreshes = 0
+        self.failed_refreshes = 0
+
+
+cache_single_flight = SingleFlight()
+cache_stats = ResponseCacheStats()
+
+
+def _uncacheable(request: Request) -> bool:
+    if not FastAPICache.get_enable() or request.method != "GET":
+        return True
+    return request.headers.get("Cache-Control") == "no-store"
+
+
+def _set_headers(response: Response, status: str, max_age: int) -> None:
+    response.headers.update(
+        {
+            "Cache-Control": f"max-age={max_age}",
+            FastAPICache.get_cache_status_header(): status,
+        }
+    )
+
+
+def _refresh_early(fresh_for: float, compute_seconds: float, beta: float) -> bool:
+    # 1 - random() lies in (0, 1], keeping the logarithm finite.
+    return fresh_for <= -compute_seconds * beta * math.log(1 - random.random())
+
+
+def cache(
+    expire: int,
+    namespace: str = "",
+    stale_ttl: int = 0,
+    early_refresh_beta: float = 0.0,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[Any]]]:
+    """
+    Cache the responses of an async endpoint for `expire` seconds.
+
+    :param expire: how long a response is fresh for, in seconds.
+    :param namespace: namespace of the cache keys, e.g. to clear them together.
+    :param stale_ttl: how long an expired response may still be served while it is
+        refreshed in the background, in seconds.
+    :param early_refresh_beta: how eagerly fresh responses are refreshed before they
+        expire; 0 disables early refreshes.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[Any]]:
+        signature = get_typed_signature(func)
+        return_type = get_typed_return_annotation(func)
+        # How long the endpoint took the last time this worker ran it.
+        compute_seconds = 0.0
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs.pop(_REQUEST.name)
+            response: Response = kwargs.pop(_RESPONSE.name)
+            if _uncacheable(request):
+                return await func(*args, **kwargs)
+
+            backend = FastAPICache.get_backend()
+            coder = FastAPICache.get_coder()
+            key = FastAPICache.get_key_builder()(
+                func,
+                f"{FastAPICache.get_prefix()}:{namespace}",
+                request=request,
+                response=response,
+                args=args,
+                kwargs=kwargs,
+            )
+            if inspect.isawaitable(key):
+                key = await key
+
+            async def compute() -> Tuple[T, bytes]:
+                nonlocal compute_seconds
+                start_time = time.perf_counter()
+                result = await func(*args, **kwargs)
+                compute_seconds = time.perf_counter() - start_time
+                encoded = coder.encode(result)
+                try:
+                    await backend.set(key, encoded, expire + stale_ttl)
+                except Exception as error:
+                    logger.warning(f"Could not write cache key {key}: {error!r}")
+                return result, encoded
+
+            async def refresh() -> None:
+                try:
+                    await compute()
+                except Exception as error:
+                    cache_stats.failed_refreshes += 1
+                    logger.warning(f"Could not refresh cache key {key}: {error!r}")
+
+            ttl, cached = 0, None
+            if request.headers.get("Cache-Control") != "no-cache":
+                try:
+                    ttl, cached = await backend.get_with_ttl(key)
+                except Exception as error:
+                    logger.warning(f"Could not read cache key {key}: {error!r}")
+
+            if cached is None:
+                result, encoded = await cache_single_flight.run(
+                    key, compute, context=outside_unit_of_work()
+                )
+                _set_headers(response, "MISS", expire)
+                not_modified = conditional_get(
+                    response,
+                    content_etag(encoded),
+                    request.headers.get("if-none-match"),
+                )
+                return result if not_modified is None else not_modified
+
+            # Entries are stored for `expire + stale_ttl` seconds.
+            fresh_for = ttl - stale_ttl
+            stale = fresh_for <= 0
+            if key not in cache_single_flight and (
+                stale
+                or (
+                    early_refresh_beta
+                    and _refresh_early(fresh_for, compute_seconds, early_refresh_beta)
+                )
+            ):
+                cache_stats.background_refreshes += 1
+                cache_single_flight.start(key, refresh, context=Context())
+            if stale:
+                cache_stats.stale_hits += 1
+
+            _set_headers(response, "HIT", max(fresh_for, 0))
+            not_modified = conditional_get(
+                response, content_etag(cached), request.headers.get("if-none-match")
+            )
+            if not_modified is not None:
+                return not_modified
+            return coder.decode_as_type(cached, type_=return_type)
+
+        # FastAPI injects the request and response through these extra parameters.
+        wrapper.__signature__ = signature.replace(
+            parameters=[*signature.parameters.values(), _REQUEST, _RESPONSE]
+        )
+        return wrapper
+
+    return decorator
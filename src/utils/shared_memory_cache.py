@@ -0,0 +1,178 @@
+"""
+fastapi-cache backend sharing its entries across the worker processes of a host.
+
+Entries live in a file-backed memory-mapped segment (under `/dev/shm` by default, so
+it never touches a disk) split into `slots` fixed-size slots. The slot array is
+itself the hash index: a key may only live in the `MAX_PROBES` slots following its
+hash, so lookups read a bounded number of slot headers. Expired slots are reused by
+later writes; when all of a key's candidate slots are live, the one closest to
+expiring is evicted. Values that do not fit in a slot are not cached.
+
+Every operation holds an exclusive `flock` on the segment for the few microseconds
+it takes to copy an entry, which serialises the workers without any server.
+"""
+
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import struct
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple, Union
+
+from fastapi_cache.types import Backend
+
+MAGIC = b"FCSHM001"
+# magic, slot count, slot size
+SEGMENT_HEADER = struct.Struct("<8sII")
+# key hash, expires at (0 = empty slot, inf = never), key length, value length
+SLOT_HEADER = struct.Struct("<QdII")
+MAX_PROBES = 16
+NEVER = math.inf
+
+
+def _hash_key(key: bytes) -> int:
+    # Python's own hash() is salted per process, so it cannot be shared.
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
+
+
+class SharedMemoryBackend(Backend):
+    """
+    Drop-in replacement for `InMemoryBackend` shared by every process mapping
+    the same `path`.
+
+    A segment created with a different slot layout is reinitialised, so every
+    worker must use the same settings.
+    """
+
+    def __init__(self, path: str, slots: int = 4096, slot_size: int = 4096):
+        if slot_size <= SLOT_HEADER.size:
+            raise ValueError(f"slot_size must be larger than {SLOT_HEADER.size}.")
+        self.path = path
+        self.slots = slots
+        self.slot_size = slot_size
+        self.size = SEGMENT_HEADER.size + slots * slot_size
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        with self._locked():
+            if not self._has_expected_layout():
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, self.size)
+                os.pwrite(self._fd, SEGMENT_HEADER.pack(MAGIC, slots, slot_size), 0)
+        self._map = mmap.mmap(self._fd, self.size)
+
+    def _has_expected_layout(self) -> bool:
+        if os.fstat(self._fd).st_size != self.size:
+            return False
+        header = os.pread(self._fd, SEGMENT_HEADER.size, 0)
+        return header == SEGMENT_HEADER.pack(MAGIC, self.slots, self.slot_size)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _offset(self, slot: int) -> int:
+        return SEGMENT_HEADER.size + slot * self.slot_size
+
+    def _candidates(self, key_hash: int) -> Iterator[int]:
+        start = key_hash % self.slots
+        for probe in range(min(MAX_PROBES, self.slots)):
+            yield (start + probe) % self.slots
+
+    def _read_header(self, slot: int) -> Tuple[int, float, int, int]:
+        return SLOT_HEADER.unpack_from(self._map, self._offset(slot))
+
+    def _matches(self, slot: int, key: bytes, key_hash: int, now: float) -> bool:
+        slot_hash, expires_at, key_length, _ = self._read_header(slot)
+        if slot_hash != key_hash or expires_at <= now:
+            return False
+        key_start = self._offset(slot) + SLOT_HEADER.size
+        return self._map[key_start : key_start + key_length] == key
+
+    def _find(self, key: bytes, key_hash: int, now: float) -> Union[int, None]:
+        for slot in self._candidates(key_hash):
+            if self._matches(slot, key, key_hash, now):
+                return slot
+        return None
+
+    def _empty(self, slot: int) -> None:
+        SLOT_HEADER.pack_into(self._map, self._offset(slot), 0, 0.0, 0, 0)
+
+    def _lookup(self, key: str) -> Tuple[float, Optional[bytes]]:
+        encoded = key.encode()
+        key_hash = _hash_key(encoded)
+        with self._locked():
+            slot = self._find(encoded, key_hash, time.time())
+            if slot is None:
+                return 0.0, None
+            _, expires_at, key_length, value_length = self._read_header(slot)
+            value_start = self._offset(slot) + SLOT_HEADER.size + key_length
+            return expires_at, self._map[value_start : value_start + value_length]
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        expires_at, value = self._lookup(key)
+        if value is None:
+            return 0, None
+        if expires_at == NEVER:
+            return -1, value
+        return max(int(expires_at - time.time()), 0), value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._lookup(key)[1]
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        encoded = key.encode()
+        if SLOT_HEADER.size + len(encoded) + len(value) > self.slot_size:
+            return
+        key_hash = _hash_key(encoded)
+        now = time.time()
+        expires_at = now + expire if expire else NEVER
+        with self._locked():
+            slot = self._find(encoded, key_hash, now)
+            if slot is None:
+                # The first free or expired candidate, else the closest to expiring.
+                slot = min(
+                    self._candidates(key_hash),
+                    key=lambda candidate: max(self._read_header(candidate)[1], now),
+                )
+            offset = self._offset(slot)
+            SLOT_HEADER.pack_into(
+                self._map, offset, key_hash, expires_at, len(encoded), len(value)
+            )
+            data_start = offset + SLOT_HEADER.size
+            self._map[data_start : data_start + len(encoded)] = encoded
+            value_start = data_start + len(encoded)
+            self._map[value_start : value_start + len(value)] = value
+
+    async def clear(
+        self, namespace: Optional[str] = None, key: Optional[str] = None
+    ) -> int:
+        count = 0
+        with self._locked():
+            if namespace:
+                prefix = namespace.encode()
+                now = time.time()
+                for slot in range(self.slots):
+                    _, expires_at, key_length, _ = self._read_header(slot)
+                    key_start = self._offset(slot) + SLOT_HEADER.size
+                    stored_key = self._map[key_start : key_start + key_length]
+                    if expires_at > now and stored_key.startswith(prefix):
+                        self._empty(slot)
+                        count += 1
+            elif key:
+                encoded = key.encode()
+                slot = self._find(encoded, _hash_key(encoded), time.time())
+                if slot is not None:
+                    self._empty(slot)
+                    count += 1
+        return count
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
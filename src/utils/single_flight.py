@@ -0,0 +1,71 @@
+import asyncio
+from contextvars import Context
+from typing import Any, Callable, Coroutine, Dict, Hashable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls sharing a key into a single execution.
+
+    The first caller of a key starts the call in its own task; every caller arriving
+    while it runs awaits that same task and gets its result (or exception). The task
+    is shielded, so a caller being cancelled (e.g. a client disconnecting) neither
+    cancels the call for the others nor leaves the key stuck.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    def start(
+        self,
+        key: Hashable,
+        func: Callable[[], Coroutine[Any, Any, T]],
+        context: Optional[Context] = None,
+    ) -> asyncio.Task:
+        """
+        Start `func` in a task, unless a call for `key` is already in flight.
+
+        :param context: context the task runs in, a copy of the current one if
+            omitted.
+        :returns: the task of the call in flight for `key`.
+        """
+        task = self._calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+        task = asyncio.create_task(func(), context=context)
+        self._calls[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        self.calls += 1
+        return task
+
+    async def run(
+        self,
+        key: Hashable,
+        func: Callable[[], Coroutine[Any, Any, T]],
+        context: Optional[Context] = None,
+    ) -> T:
+        """
+        Run `func`, unless a call for `key` is already in flight.
+
+        :param context: context the task runs in, see `start`.
+        :returns: the result of the call in flight for `key`.
+        """
+        return await asyncio.shield(self.start(key, func, context=context))
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # Every caller may have been cancelled; do not log the exception as lost.
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,122 @@
+import hashlib
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Set, Union
+
+from src.configs.envs import Config
+from src.schemas.user import AuthenticatedUser
+
+
+class _TokenCacheEntry(NamedTuple):
+    user: AuthenticatedUser
+    expires_at: float
+
+
+class TokenCache:
+    """
+    In-process LRU + TTL cache mapping access tokens to the user they resolve to.
+
+    Entries are keyed by a digest of the token (the raw token is never stored) and
+    expire at whichever comes first: the cache TTL or the token's own `exp` claim.
+    Secondary indexes by user ID and user type ID allow dropping every entry that
+    depends on a row when that row changes.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int, enabled: bool = True):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled and max_size > 0 and ttl_seconds > 0
+        self._entries: "OrderedDict[bytes, _TokenCacheEntry]" = OrderedDict()
+        self._keys_by_user_id: Dict[int, Set[bytes]] = {}
+        self._keys_by_user_type_id: Dict[int, Set[bytes]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Union[AuthenticatedUser, None]:
+        """
+        Retrieve the cached user for a token, if present and not expired.
+        """
+        if not self.enabled:
+            return None
+        key = self._digest(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.time():
+            self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.user
+
+    def set(self, token: str, user: AuthenticatedUser, token_expires_at: float):
+        """
+        Cache the user resolved from a token.
+
+        Args:
+            token (str): The raw access token.
+            user (AuthenticatedUser): The resolved user snapshot.
+            token_expires_at (float): The token's `exp` claim as a UNIX timestamp.
+        """
+        if not self.enabled:
+            return
+        expires_at = min(time.time() + self.ttl_seconds, token_expires_at)
+        key = self._digest(token)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = _TokenCacheEntry(user=user, expires_at=expires_at)
+        self._keys_by_user_id.setdefault(user.id, set()).add(key)
+        self._keys_by_user_type_id.setdefault(user.user_type_id, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        """
+        Drop every cached token resolving to the given user.
+        """
+        for key in list(self._keys_by_user_id.get(user_id, ())):
+            self._remove(key)
+
+    def invalidate_user_type(self, user_type_id: int) -> None:
+        """
+        Drop every cached token whose user belongs to the given user type.
+        """
+        for key in list(self._keys_by_user_type_id.get(user_type_id, ())):
+            self._remove(key)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._keys_by_user_id.clear()
+        self._keys_by_user_type_id.clear()
+
+    def _remove(self, key: bytes) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._discard_index(self._keys_by_user_id, entry.user.id, key)
+        self._discard_index(self._keys_by_user_type_id, entry.user.user_type_id, key)
+
+    @staticmethod
+    def _discard_index(index: Dict[int, Set[bytes]], index_key: int, key: bytes):
+        keys = index.get(index_key)
+        if keys is None:
+            return
+        keys.discard(key)
+        if not keys:
+            del index[index_key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+token_cache = TokenCache(
+    max_size=Config.AUTH.TOKEN_CACHE_MAX_SIZE,
+    ttl_seconds=Config.AUTH.TOKEN_CACHE_TTL_SECONDS,
+    enabled=Config.AUTH.TOKEN_CACHE_ENABLED,
+)
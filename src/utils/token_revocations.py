@@ -0,0 +1,78 @@
+import time
+from typing import Dict, NamedTuple
+
+from src.configs.envs import Config
+
+
+class _UserRevocation(NamedTuple):
+    security_version: int
+    expires_at: float
+
+
+class TokenRevocations:
+    """
+    In-process revocation set of self-contained access tokens.
+
+    Such tokens are verified from their claims alone, so a change to their user or
+    user type would otherwise go unnoticed until they expire. A user's tokens are
+    revoked below a security version, and a user type's tokens up to a point in
+    time. Entries are dropped once every token they could revoke has expired, so
+    the set only holds the changes of the last `ttl_seconds`.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._users: Dict[int, _UserRevocation] = {}
+        # User type ID -> when its tokens were revoked.
+        self._user_types: Dict[int, float] = {}
+
+    def revoke_user(self, user_id: int, security_version: int) -> None:
+        """
+        Revoke the tokens of a user issued with a lower security version.
+        """
+        self.purge()
+        self._users[user_id] = _UserRevocation(
+            security_version, time.time() + self.ttl_seconds
+        )
+
+    def revoke_user_type(self, user_type_id: int) -> None:
+        """
+        Revoke the tokens issued so far to users of a user type.
+        """
+        self.purge()
+        self._user_types[user_type_id] = time.time()
+
+    def is_revoked(
+        self,
+        user_id: int,
+        security_version: int,
+        user_type_id: int,
+        issued_at: float,
+    ) -> bool:
+        revocation = self._users.get(user_id)
+        if revocation is not None and security_version < revocation.security_version:
+            return True
+        revoked_at = self._user_types.get(user_type_id)
+        return revoked_at is not None and issued_at <= revoked_at
+
+    def purge(self) -> None:
+        """Drop the entries older than any token they could revoke."""
+        now = time.time()
+        for user_id, revocation in list(self._users.items()):
+            if revocation.expires_at <= now:
+                del self._users[user_id]
+        for user_type_id, revoked_at in list(self._user_types.items()):
+            if revoked_at + self.ttl_seconds <= now:
+                del self._user_types[user_type_id]
+
+    def clear(self) -> None:
+        self._users.clear()
+        self._user_types.clear()
+
+    def __len__(self) -> int:
+        return len(self._users) + len(self._user_types)
+
+
+token_revocations = TokenRevocations(
+    ttl_seconds=Config.AUTH.SELF_CONTAINED_TOKEN_EXPIRE_MINUTES * 60
+)
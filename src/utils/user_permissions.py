@@ -0,0 +1,89 @@
+from src.utils.enums import UserTypeEnum
+from src.utils.permissions import (
+    CAN_CREATE_ALL,
+    CAN_CREATE_OWN,
+    CAN_DELETE_ALL,
+    CAN_DELETE_OWN,
+    CAN_LOGIN,
+    CAN_READ_ALL,
+    CAN_READ_OWN,
+    CAN_UPDATE_ALL,
+    CAN_UPDATE_OWN,
+)
+
+
+class UserPermissionsMixin:
+    """
+    Permission helpers shared by the `User` model and the authenticated user
+    snapshot kept in the token cache.
+
+    Classes using this mixin must expose `user_type_data` (a `CachedUserType`),
+    `is_active`, `is_blocked` and `deleted_at`.
+    """
+
+    @property
+    def user_type_title(self) -> UserTypeEnum:
+        return self.user_type_data.title
+
+    @property
+    def permissions(self) -> int:
+        """The permissions of the user type as a bitmask."""
+        return self.user_type_data.permissions
+
+    def has_permissions(self, required: int) -> bool:
+        """Whether the user holds every permission of the `required` mask."""
+        return not required & ~self.user_type_data.permissions
+
+    @property
+    def is_super_admin(self) -> bool:
+        return self.user_type_title == UserTypeEnum.SUPER_ADMIN
+
+    @property
+    def is_admin(self) -> bool:
+        return self.user_type_title == UserTypeEnum.ADMIN or self.is_super_admin
+
+    @property
+    def is_internal(self) -> bool:
+        return self.user_type_title == UserTypeEnum.INTERNAL or self.is_admin
+
+    @property
+    def can_read_all(self) -> bool:
+        return self.has_permissions(CAN_READ_ALL)
+
+    @property
+    def can_create_all(self) -> bool:
+        return self.has_permissions(CAN_CREATE_ALL)
+
+    @property
+    def can_update_all(self) -> bool:
+        return self.has_permissions(CAN_UPDATE_ALL)
+
+    @property
+    def can_delete_all(self) -> bool:
+        return self.has_permissions(CAN_DELETE_ALL)
+
+    @property
+    def can_read_own(self) -> bool:
+        return self.has_permissions(CAN_READ_OWN)
+
+    @property
+    def can_create_own(self) -> bool:
+        return self.has_permissions(CAN_CREATE_OWN)
+
+    @property
+    def can_update_own(self) -> bool:
+        return self.has_permissions(CAN_UPDATE_OWN)
+
+    @property
+    def can_delete_own(self) -> bool:
+        return self.has_permissions(CAN_DELETE_OWN)
+
+    @property
+    def can_login(self) -> bool:
+        return (
+            self.has_permissions(CAN_LOGIN)
+            and self.user_type_title != UserTypeEnum.BLOCKED
+            and not self.is_blocked
+            and self.is_active
+            and not self.deleted_at
+        )
@@ -0,0 +1,144 @@
+import asyncio
+import time
+from types import MappingProxyType
+from typing import Iterable, Mapping, Union
+
+from loguru import logger
+
+from src.configs.envs import Config
+from src.database.models.user_types import UserType
+from src.database.session import db, get_engines
+from src.schemas.user_type import CachedUserType
+
+
+class UnknownUserTypeError(LookupError):
+    """Raised when a user type is not in the (loaded) user type table."""
+
+
+class UserTypeTable:
+    """
+    In-process, immutable copy of the `user_types` table and its permission flags.
+
+    There are only a handful of user types and they rarely change, so users are
+    loaded without joining them and resolve their permissions from this table
+    instead. Each rebuild swaps in a new read-only mapping, so readers never see a
+    half-built table.
+
+    The table is rebuilt on first use after this worker commits a change to a user
+    type, at most `ttl_seconds` after another worker does, and whenever it misses a
+    user type.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._by_id: Mapping[int, CachedUserType] = MappingProxyType({})
+        self._loaded_at: Union[float, None] = None
+        self._lock = asyncio.Lock()
+        self._stale_marks = 0
+        self.reloads = 0
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def get(self, user_type_id: int) -> CachedUserType:
+        """
+        Retrieve a user type by ID.
+
+        Raises:
+            UnknownUserTypeError: If the table has no such user type.
+        """
+        try:
+            return self._by_id[user_type_id]
+        except KeyError:
+            raise UnknownUserTypeError(user_type_id) from None
+
+    def __contains__(self, user_type_id: int) -> bool:
+        return user_type_id in self._by_id
+
+    def replace(self, user_types: Iterable[UserType]) -> None:
+        self._by_id = MappingProxyType(
+            {
+                user_type.id: CachedUserType.model_validate(user_type)
+                for user_type in user_types
+            }
+        )
+        self._loaded_at = time.monotonic()
+        self.reloads += 1
+
+    async def reload(self) -> None:
+        """
+        Rebuild the table from rows committed on the primary, within the current
+        unit of work: once marked stale, a lagging replica could still return the
+        previous rows and the table would keep them until the TTL expires.
+        """
+        stale_marks = self._stale_marks
+        self.replace(await UserType.get_all(from_primary=True))
+        if self._stale_marks != stale_marks:
+            # Marked stale while reading: the rows read may predate the change.
+            self._loaded_at = None
+
+    def mark_stale(self) -> None:
+        """
+        Rebuild the table on next use, e.g. once a change to a user type committed.
+        """
+        self._stale_marks += 1
+        self._loaded_at = None
+
+    def is_stale(self) -> bool:
+        return (
+            self._loaded_at is None
+            or time.monotonic() - self._loaded_at >= self.ttl_seconds
+        )
+
+    async def refresh_if_stale(self) -> None:
+        """Rebuild the table if it was never loaded or is older than the TTL."""
+        if not self.is_stale():
+            return
+        async with self._lock:
+            # Concurrent callers wait for the first one's rebuild.
+            if self.is_stale():
+                await self.reload()
+
+    async def require(self, *user_type_ids: int) -> None:
+        """
+        Make sure the table is fresh and has the given user types.
+
+        A user type missing from a fresh table may have been created by another
+        worker since the table was loaded, so the table is rebuilt once more before
+        giving up.
+
+        Raises:
+            UnknownUserTypeError: If a user type is missing even after the rebuild.
+        """
+        await self.refresh_if_stale()
+        if all(user_type_id in self._by_id for user_type_id in user_type_ids):
+            return
+        reloads = self.reloads
+        async with self._lock:
+            # Skipped if a concurrent caller rebuilt the table meanwhile.
+            if self.reloads == reloads:
+                await self.reload()
+        missing = [
+            user_type_id
+            for user_type_id in user_type_ids
+            if user_type_id not in self._by_id
+        ]
+        if missing:
+            raise UnknownUserTypeError(*missing)
+
+    async def preload(self) -> None:
+        """
+        Load the table at startup, in a unit of work of its own.
+
+        Failures are only logged: requests load the table on demand instead.
+        """
+        if not get_engines():
+            return
+        try:
+            async with db(read_only=True):
+                await self.reload()
+        except Exception as error:
+            logger.warning(f"Could not preload the user type table: {error!r}")
+
+
+user_type_table = UserTypeTable(ttl_seconds=Config.AUTH.USER_TYPE_TABLE_TTL_SECONDS)
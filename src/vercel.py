@@ -1,3 +1,3 @@
-from src.app import get_app
+from src.lazy_app import get_lazy_app
 
-app = get_app()
+app = get_lazy_app()
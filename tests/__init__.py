@@ -1,3 +1,6 @@
-from unittest import mock
+from fastapi_cache import FastAPICache
 
-mock.patch("fastapi_cache.decorator.cache", lambda *args, **kwargs: lambda f: f).start()
+from src.configs.cache import cache_backend
+
+# `FastAPICache.init` only applies its first call, so the app keeps caching disabled.
+FastAPICache.init(cache_backend(), enable=False)
@@ -10,3 +10,27 @@ async def test_health(client: AsyncClient):
     response = await client.get("/health")
     assert response.status_code == 200
     assert response.json() is None
+
+
+@pytest.mark.anyio
+async def test_cache_stats(client: AsyncClient):
+    """Test the cache stats endpoint reports the bounded memory backend."""
+    response = await client.get("/cache/stats")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["backend"] == "BoundedMemoryBackend"
+    assert {"hits", "misses", "evictions"} <= stats.keys()
+
+
+@pytest.mark.anyio
+async def test_metrics(client: AsyncClient):
+    """Test the metrics endpoint exposes the latency of previous requests."""
+    await client.get("/health")
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/health",status="200"}'
+        in response.text
+    )
+    assert "password_hashing_queue_depth 0" in response.text
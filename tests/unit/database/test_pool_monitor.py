@@ -0,0 +1,81 @@
+"""Unit tests for the background pool health monitor."""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.database.pool_monitor import EngineHealth, PoolHealthMonitor
+
+
+def fake_engine(mocker):
+    pool = object()
+    return SimpleNamespace(
+        sync_engine=SimpleNamespace(pool=pool), dispose=mocker.AsyncMock()
+    )
+
+
+@pytest.fixture
+def engine(mocker):
+    return fake_engine(mocker)
+
+
+@pytest.fixture
+def monitor(engine) -> PoolHealthMonitor:
+    return PoolHealthMonitor(
+        interval_seconds=10, validate_idle=True, engines=lambda: {"primary": engine}
+    )
+
+
+def test_not_ready_before_the_first_check(monitor):
+    assert not monitor.is_ready()
+
+
+def test_ready_only_with_recent_healthy_checks(monitor):
+    monitor.health["primary"] = EngineHealth(healthy=True, checked_at=time.monotonic())
+    assert monitor.is_ready()
+
+    monitor.health["primary"] = EngineHealth(
+        healthy=True, checked_at=time.monotonic() - 31
+    )
+    assert not monitor.is_ready()
+
+    monitor.health["primary"] = EngineHealth(
+        healthy=False, checked_at=time.monotonic(), error="down"
+    )
+    assert not monitor.is_ready()
+
+
+@pytest.mark.anyio
+async def test_failing_checks_recycle_the_pool_once(monitor, engine, mocker):
+    check_engine = mocker.patch.object(
+        monitor, "_check_engine", side_effect=ConnectionError("down")
+    )
+
+    await monitor.check()
+    await monitor.check()
+
+    assert not monitor.health["primary"].healthy
+    assert engine.dispose.await_count == 1
+
+    check_engine.side_effect = None
+    await monitor.check()
+    check_engine.side_effect = ConnectionError("down again")
+    await monitor.check()
+
+    assert engine.dispose.await_count == 2
+    assert monitor.recycles == 2
+
+
+@pytest.mark.anyio
+async def test_disconnects_request_a_recycle_before_the_next_check(
+    monitor, engine, mocker
+):
+    mocker.patch.object(monitor, "_check_engine")
+    context = SimpleNamespace(is_disconnect=True, engine=engine.sync_engine)
+
+    monitor._on_error(context)
+    await monitor.check()
+
+    engine.dispose.assert_awaited_once()
+    assert monitor.health["primary"].healthy
@@ -0,0 +1,106 @@
+"""Unit tests for replica selection and read-your-writes routing."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.database import session as session_module
+from src.database.models.users import User
+from src.database.session import ReplicaRouter, db
+
+
+class FakeEngine:
+    def __init__(self, name: str, checked_out: int = 0):
+        self.name = name
+        pool = SimpleNamespace(checkedout=lambda: checked_out)
+        self.sync_engine = SimpleNamespace(pool=pool)
+
+
+class FakeSession:
+    def __init__(self, name: str):
+        self.name = name
+        self.info = {}
+        self.new = self.dirty = self.deleted = ()
+        self.executed = []
+
+    async def execute(self, statement):
+        self.executed.append(statement)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(first=lambda: None))
+
+    def in_transaction(self) -> bool:
+        return False
+
+    async def close(self):
+        pass
+
+
+def test_round_robin_cycles_through_replicas():
+    engines = [FakeEngine("a"), FakeEngine("b"), FakeEngine("c")]
+    router = ReplicaRouter(engines)
+
+    chosen = [router.choose().name for _ in range(4)]
+
+    assert chosen == ["a", "b", "c", "a"]
+
+
+def test_least_busy_prefers_fewest_checked_out_connections():
+    engines = [FakeEngine("a", 3), FakeEngine("b", 1), FakeEngine("c", 1)]
+    router = ReplicaRouter(engines, strategy="least_busy")
+
+    chosen = [router.choose().name for _ in range(3)]
+
+    assert chosen == ["b", "b", "c"]
+
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        ReplicaRouter([FakeEngine("a")], strategy="random")
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    engine = FakeEngine("replica")
+    monkeypatch.setattr(session_module, "_Session", lambda: FakeSession("primary"))
+    monkeypatch.setattr(session_module, "_replica_router", ReplicaRouter([engine]))
+    monkeypatch.setattr(
+        session_module, "_ReplicaSessions", {engine: lambda: FakeSession("replica")}
+    )
+
+
+@pytest.mark.anyio
+async def test_reads_use_replica_until_the_unit_of_work_writes(replica):
+    async with db():
+        assert db.read_session.name == "replica"
+        assert db.read_session is db.read_session
+
+        db.session.info[session_module.HAS_WRITES] = True
+
+        assert db.read_session is db.session
+
+
+@pytest.mark.anyio
+async def test_use_primary_pins_reads_to_primary(replica):
+    async with db():
+        db.use_primary()
+
+        assert db.read_session.name == "primary"
+
+
+@pytest.mark.anyio
+async def test_reads_from_primary_skip_the_replica(replica):
+    async with db():
+        await User.get_by_id(1, from_primary=True)
+        assert len(db.session.executed) == 1
+
+        await User.get_by_id(1)
+        assert len(db.read_session.executed) == 1
+        assert db.read_session.name == "replica"
+
+
+@pytest.mark.anyio
+async def test_reads_use_primary_without_replicas(monkeypatch):
+    monkeypatch.setattr(session_module, "_Session", lambda: FakeSession("primary"))
+    monkeypatch.setattr(session_module, "_replica_router", None)
+
+    async with db():
+        assert db.read_session.name == "primary"
@@ -0,0 +1,88 @@
+"""Unit tests for the request logging middleware."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from src.middlewares.logger_middleware import REQUEST_UUID, LoggerMiddleware
+
+
+class FakeLogger:
+    def __init__(self):
+        self.messages = []
+
+    def warning(self, message: str):
+        self.messages.append((REQUEST_UUID.get(), message))
+
+
+async def echo(request: Request):
+    return JSONResponse({"received": (await request.body()).decode()})
+
+
+async def stream(request: Request):
+    async def chunks():
+        for chunk in (b"first,", b"second,", b"third"):
+            yield chunk
+
+    return StreamingResponse(chunks())
+
+
+def _client(logger: FakeLogger, max_body_bytes: int = 4096) -> AsyncClient:
+    app = Starlette(
+        routes=[
+            Route("/echo", echo, methods=["POST"]),
+            Route("/stream", stream),
+        ]
+    )
+    app.add_middleware(LoggerMiddleware, logger=logger, max_body_bytes=max_body_bytes)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.anyio
+async def test_logs_request_and_response_bodies():
+    logger = FakeLogger()
+    async with _client(logger) as client:
+        response = await client.post("/echo", content=b"hello")
+
+    assert response.json() == {"received": "hello"}
+    (uuid, start), (same_uuid, end) = logger.messages
+    assert uuid is not None and uuid == same_uuid
+    assert start == "Start request path=/echo; method=POST; body=b'hello';"
+    assert end.startswith("Request completed in ")
+    assert end.endswith('Status Code=200; body={"received":"hello"};')
+
+
+@pytest.mark.anyio
+async def test_bodies_are_capped_but_fully_forwarded():
+    logger = FakeLogger()
+    async with _client(logger, max_body_bytes=4) as client:
+        post_response = await client.post("/echo", content=b"hello world")
+        stream_response = await client.get("/stream")
+
+    assert post_response.json() == {"received": "hello world"}
+    assert stream_response.content == b"first,second,third"
+    messages = [message for _, message in logger.messages]
+    assert messages[0] == (
+        "Start request path=/echo; method=POST; body=b'hell'; body_truncated=True;"
+    )
+    assert messages[1].endswith('body={"re;')
+    assert messages[3].endswith("Status Code=200; body=firs;")
+
+
+@pytest.mark.anyio
+async def test_single_line_mode_logs_once_per_request():
+    logger = FakeLogger()
+    app = Starlette(routes=[Route("/echo", echo, methods=["POST"])])
+    app.add_middleware(LoggerMiddleware, logger=logger, single_line=True)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.post("/echo", content=b"hello")
+
+    ((_, message),) = logger.messages
+    assert message.startswith(
+        "Request path=/echo; method=POST; body=b'hello'; Request completed in "
+    )
+    assert message.endswith('Status Code=200; body={"received":"hello"};')
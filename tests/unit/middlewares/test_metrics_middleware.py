@@ -0,0 +1,66 @@
+"""Unit tests for the request metrics middleware."""
+
+import pytest
+from fastapi import FastAPI, Response
+from httpx import ASGITransport, AsyncClient
+
+from src.middlewares.metrics_middleware import MetricsMiddleware
+from src.utils.metrics import UNMATCHED_ROUTE, RequestMetrics
+
+
+@pytest.fixture
+def metrics() -> RequestMetrics:
+    return RequestMetrics()
+
+
+@pytest.fixture
+async def client(metrics: RequestMetrics):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int, response: Response):
+        response.headers["X-FastAPI-Cache"] = "HIT" if item_id == 1 else "MISS"
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware, metrics=metrics)
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+def recorded(metrics: RequestMetrics) -> dict:
+    return {
+        (labels["route"], labels["status"]): histogram.count
+        for labels, histogram in metrics.histograms()
+    }
+
+
+@pytest.mark.anyio
+async def test_latency_is_recorded_under_the_route_template(client, metrics):
+    await client.get("/items/1")
+    await client.get("/items/2")
+    await client.get("/items/not-a-number")
+
+    assert recorded(metrics) == {
+        ("/items/{item_id}", "200"): 2,
+        ("/items/{item_id}", "422"): 1,
+    }
+    assert metrics.in_flight == 0
+
+
+@pytest.mark.anyio
+async def test_unmatched_paths_share_a_single_label(client, metrics):
+    await client.get("/a")
+    await client.get("/b")
+
+    assert recorded(metrics) == {(UNMATCHED_ROUTE, "404"): 2}
+
+
+@pytest.mark.anyio
+async def test_cache_status_header_is_counted(client, metrics):
+    await client.get("/items/1")
+    await client.get("/items/1")
+    await client.get("/items/2")
+
+    assert (metrics.cache_hits, metrics.cache_misses) == (2, 1)
@@ -0,0 +1,119 @@
+"""Unit tests for the lazy, read-only aware unit of work middleware."""
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from src.database import session as session_module
+from src.database.session import db
+from src.middlewares.sqlalchemy_middleware import SQLAlchemyMiddleware
+
+
+class FakeSession:
+    def __init__(self, read_only: bool, calls: list):
+        self.read_only = read_only
+        self.calls = calls
+        self.info = {}
+        self.new = self.dirty = self.deleted = ()
+
+    def in_transaction(self) -> bool:
+        return True
+
+    async def commit(self):
+        self.calls.append("commit")
+
+    async def rollback(self):
+        self.calls.append("rollback")
+
+    async def close(self):
+        self.calls.append("close")
+
+
+@pytest.fixture
+def calls(monkeypatch) -> list:
+    calls = []
+
+    def factory(read_only: bool):
+        def create():
+            calls.append("read-only session" if read_only else "session")
+            return FakeSession(read_only, calls)
+
+        return create
+
+    monkeypatch.setattr(
+        "src.middlewares.sqlalchemy_middleware.init_db", lambda **kwargs: None
+    )
+    monkeypatch.setattr(session_module, "_Session", factory(False))
+    monkeypatch.setattr(session_module, "_ReadOnlySession", factory(True))
+    return calls
+
+
+async def no_db(request):
+    return PlainTextResponse("ok")
+
+
+async def read(request):
+    db.session
+    return PlainTextResponse("ok")
+
+
+async def write(request):
+    db.session.info[session_module.HAS_WRITES] = True
+    return PlainTextResponse("ok")
+
+
+def _client() -> AsyncClient:
+    app = Starlette(
+        routes=[
+            Route("/no-db", no_db, methods=["GET", "POST"]),
+            Route("/read", read, methods=["GET", "POST"]),
+            Route("/write", write, methods=["POST"]),
+        ]
+    )
+    app.add_middleware(SQLAlchemyMiddleware, db_url="unused", commit_on_exit=True)
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "method, path, expected",
+    [
+        ("GET", "/no-db", []),
+        ("POST", "/no-db", []),
+        ("GET", "/read", ["read-only session", "rollback", "close"]),
+        ("POST", "/read", ["session", "rollback", "close"]),
+        ("POST", "/write", ["session", "commit", "close"]),
+    ],
+)
+async def test_session_lifecycle(calls: list, method: str, path: str, expected):
+    async with _client() as client:
+        response = await client.request(method, path)
+
+    assert response.status_code == 200
+    assert calls == expected
+
+
+@pytest.mark.anyio
+async def test_after_commit_callbacks_only_run_once_committed(calls: list):
+    async def write_and_watch(fail: bool):
+        async with db(commit_on_exit=True):
+            db.session.info[session_module.HAS_WRITES] = True
+            db.after_commit(lambda: calls.append("after commit"))
+            if fail:
+                raise RuntimeError()
+
+    with pytest.raises(RuntimeError):
+        await write_and_watch(fail=True)
+    await write_and_watch(fail=False)
+
+    assert calls == [
+        "session",
+        "rollback",
+        "close",
+        "session",
+        "commit",
+        "after commit",
+        "close",
+    ]
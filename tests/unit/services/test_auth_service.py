@@ -0,0 +1,187 @@
+"""Unit tests for the auth service."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.configs.envs import Config
+from src.database.models.users import User
+from src.exceptions.http_exceptions import CredentialsException
+from src.schemas.auth import VerifyTokenRequest
+from src.schemas.user import TokenPrincipal
+from src.services import auth as services_auth
+from src.services.auth import AuthService
+from src.utils.enums import UserPermissionsEnum, UserTypeEnum
+from src.utils.permissions import CAN_LOGIN, CAN_READ_ALL, CAN_READ_OWN
+from src.utils.token_cache import TokenCache
+from src.utils.token_revocations import TokenRevocations
+from src.utils.user_type_table import UserTypeTable
+
+
+def _user(user_id: int, email: str, is_blocked: bool = False) -> User:
+    now = datetime.now(timezone.utc)
+    return User(
+        id=user_id,
+        created_at=now,
+        updated_at=now,
+        name="John Doe",
+        email=email,
+        user_type_id=4,
+        is_active=True,
+        is_blocked=is_blocked,
+        security_version=0,
+    )
+
+
+@pytest.fixture
+def get_by_emails(mocker):
+    now = datetime.now(timezone.utc)
+    table = UserTypeTable(ttl_seconds=60)
+    table.replace(
+        [
+            SimpleNamespace(
+                id=4,
+                created_at=now,
+                updated_at=now,
+                title=UserTypeEnum.USER,
+                description="Regular user.",
+                can_login=True,
+                can_create_own=True,
+                can_read_own=True,
+                can_update_own=True,
+                can_delete_own=True,
+                can_create_all=False,
+                can_read_all=False,
+                can_update_all=False,
+                can_delete_all=False,
+            )
+        ]
+    )
+    mocker.patch("src.database.models.users.user_type_table", table)
+    mocker.patch("src.services.auth.user_type_table", table)
+    mocker.patch(
+        "src.services.auth.token_cache", TokenCache(max_size=10, ttl_seconds=60)
+    )
+    mocker.patch(
+        "src.services.auth.token_revocations", TokenRevocations(ttl_seconds=60)
+    )
+    return mocker.patch.object(
+        User,
+        "get_by_emails",
+        return_value=[
+            _user(1, "john@example.com"),
+            _user(2, "blocked@example.com", is_blocked=True),
+        ],
+    )
+
+
+def _token(email: str) -> str:
+    return AuthService.create_access_token(data={"sub": email})[0]
+
+
+@pytest.mark.anyio
+async def test_verify_tokens_returns_verdicts_in_order(get_by_emails):
+    john = _token("john@example.com")
+
+    verdicts = await AuthService.verify_tokens(
+        [
+            VerifyTokenRequest(token=john, action=[UserPermissionsEnum.can_read_own]),
+            VerifyTokenRequest(token="not a token"),
+            VerifyTokenRequest(token=john, action=[UserPermissionsEnum.can_read_all]),
+            VerifyTokenRequest(token=_token("blocked@example.com")),
+            VerifyTokenRequest(token=_token("unknown@example.com")),
+        ]
+    )
+
+    assert [verdict.valid for verdict in verdicts] == [True, False, False, False, False]
+    assert verdicts[2].reason == "Missing permission(s): can_read_all"
+    get_by_emails.assert_awaited_once()
+    assert set(get_by_emails.await_args.args[0]) == {
+        "john@example.com",
+        "blocked@example.com",
+        "unknown@example.com",
+    }
+
+
+@pytest.mark.anyio
+async def test_verify_tokens_reuses_the_token_cache(get_by_emails):
+    request = VerifyTokenRequest(token=_token("john@example.com"))
+
+    await AuthService.verify_tokens([request])
+    verdicts = await AuthService.verify_tokens([request])
+
+    assert verdicts[0].valid
+    get_by_emails.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_users_of_unknown_user_types_are_not_authenticated(get_by_emails, mocker):
+    stranger = _user(3, "stranger@example.com")
+    stranger.user_type_id = 9
+    get_by_emails.return_value.append(stranger)
+    get_all = mocker.patch(
+        "src.utils.user_type_table.UserType.get_all",
+        return_value=list(services_auth.user_type_table._by_id.values()),
+    )
+    mocker.patch.object(User, "get_by_email", return_value=stranger)
+
+    verdicts = await AuthService.verify_tokens(
+        [
+            VerifyTokenRequest(token=_token("john@example.com")),
+            VerifyTokenRequest(token=_token("stranger@example.com")),
+        ]
+    )
+    with pytest.raises(CredentialsException):
+        await AuthService.get_current_user(_token("stranger@example.com"))
+
+    assert [verdict.valid for verdict in verdicts] == [True, False]
+    # The table is rebuilt in case the user type was just created elsewhere.
+    assert get_all.await_count == 2
+
+
+@pytest.fixture
+def self_contained_tokens(mocker, get_by_emails):
+    mocker.patch.object(Config.AUTH, "SELF_CONTAINED_TOKENS", True)
+
+
+@pytest.mark.anyio
+async def test_self_contained_tokens_need_no_query(self_contained_tokens, mocker):
+    get_by_email = mocker.patch.object(User, "get_by_email")
+    token, _ = await AuthService.create_user_access_token(_user(1, "john@example.com"))
+
+    principal = await AuthService.get_current_principal(token)
+    verdicts = await AuthService.verify_tokens(
+        [VerifyTokenRequest(token=token, action=[UserPermissionsEnum.can_read_own])]
+    )
+
+    assert isinstance(principal, TokenPrincipal)
+    assert principal.id == 1
+    assert principal.has_permissions(CAN_LOGIN | CAN_READ_OWN)
+    assert not principal.has_permissions(CAN_READ_ALL)
+    assert verdicts[0].valid
+    get_by_email.assert_not_called()
+
+
+@pytest.mark.anyio
+async def test_self_contained_tokens_of_inactive_users_grant_nothing(
+    self_contained_tokens,
+):
+    user = _user(2, "blocked@example.com", is_blocked=True)
+    token, _ = await AuthService.create_user_access_token(user)
+
+    principal = await AuthService.get_current_principal(token)
+
+    assert principal.permissions == 0
+    with pytest.raises(CredentialsException):
+        await AuthService.get_current_active_principal(principal)
+
+
+@pytest.mark.anyio
+async def test_revoked_self_contained_tokens_are_rejected(self_contained_tokens):
+    token, _ = await AuthService.create_user_access_token(_user(1, "john@example.com"))
+
+    services_auth.token_revocations.revoke_user(1, security_version=1)
+
+    with pytest.raises(CredentialsException):
+        await AuthService.get_current_principal(token)
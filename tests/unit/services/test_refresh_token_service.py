@@ -0,0 +1,107 @@
+"""Unit tests for the rotating refresh tokens."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from src.exceptions.http_exceptions import CredentialsException
+from src.services import refresh_token_service
+from src.services.refresh_token_service import RefreshTokenService
+
+
+class _StoredToken(SimpleNamespace):
+    async def update(self, **kwargs):
+        self.__dict__.update(kwargs)
+        return self
+
+
+@pytest.fixture
+def models(mocker):
+    tokens = {}
+
+    async def new(**row):
+        tokens[row["token_hash"]] = _StoredToken(revoked_at=None, **row)
+
+    async def get_by_token_hash_for_update(token_hash):
+        return tokens.get(token_hash)
+
+    async def revoke_family(family_id):
+        revoked = 0
+        for token in tokens.values():
+            if token.family_id == family_id and token.revoked_at is None:
+                token.revoked_at = datetime.now(timezone.utc)
+                revoked += 1
+        return revoked
+
+    refresh_token = mocker.patch.object(refresh_token_service, "RefreshToken")
+    refresh_token.new.side_effect = new
+    refresh_token.get_by_token_hash_for_update.side_effect = (
+        get_by_token_hash_for_update
+    )
+    refresh_token.revoke_family.side_effect = revoke_family
+    mocker.patch.object(
+        refresh_token_service.User,
+        "get_by_id",
+        return_value=SimpleNamespace(id=1, user_type_id=4),
+    )
+    mocker.patch.object(refresh_token_service.AuthService, "require_user_types")
+    is_active_user = mocker.patch.object(
+        refresh_token_service.AuthService, "is_active_user", return_value=True
+    )
+    return SimpleNamespace(tokens=tokens, is_active_user=is_active_user)
+
+
+@pytest.mark.anyio
+async def test_issue_stores_only_a_digest_of_the_token(models):
+    token = await RefreshTokenService().issue(1)
+
+    (stored,) = models.tokens.values()
+    assert token not in models.tokens
+    assert stored.token_hash == RefreshTokenService._hash(token)
+    assert stored.user_id == 1
+
+
+@pytest.mark.anyio
+async def test_rotate_replaces_the_token_within_its_family(models):
+    service = RefreshTokenService()
+    token = await service.issue(1)
+
+    user, new_token = await service.rotate(token)
+
+    old, new = models.tokens.values()
+    assert user.id == 1
+    refresh_token_service.User.get_by_id.assert_awaited_once_with(1, from_primary=True)
+    assert new_token != token
+    assert old.revoked_at is not None
+    assert new.revoked_at is None
+    assert new.family_id == old.family_id
+
+
+@pytest.mark.anyio
+async def test_reusing_a_token_revokes_its_family(models):
+    service = RefreshTokenService()
+    token = await service.issue(1)
+    _, new_token = await service.rotate(token)
+
+    with pytest.raises(CredentialsException):
+        await service.rotate(token)
+    with pytest.raises(CredentialsException):
+        await service.rotate(new_token)
+
+
+@pytest.mark.anyio
+async def test_rotate_rejects_expired_tokens_and_inactive_users(models):
+    service = RefreshTokenService()
+    expired = await service.issue(1)
+    for stored in models.tokens.values():
+        stored.expires_at = datetime.now(timezone.utc) - timedelta(seconds=1)
+    token = await service.issue(1)
+    models.is_active_user.return_value = False
+
+    with pytest.raises(CredentialsException):
+        await service.rotate(expired)
+    with pytest.raises(CredentialsException):
+        await service.rotate(token)
+    with pytest.raises(CredentialsException):
+        await service.rotate("unknown")
@@ -0,0 +1,126 @@
+"""Unit tests for the user service."""
+
+import json
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from src.services import user_service
+from src.services.user_service import UserService
+
+
+def _line(email: str, password: str = "P@ssw0rd1") -> bytes:
+    return json.dumps(
+        {"name": "John Doe", "email": email, "password": password}
+    ).encode()
+
+
+async def _body(*lines: bytes):
+    yield b"\n".join(lines)
+
+
+@pytest.fixture
+def models(mocker):
+    @asynccontextmanager
+    async def begin_nested():
+        yield
+
+    db = mocker.patch("src.services.user_service.db")
+    db.session.begin_nested = begin_nested
+    mocker.patch(
+        "src.services.user_service.UserType.get_by_title",
+        return_value=SimpleNamespace(id=4),
+    )
+    mocker.patch(
+        "src.services.user_service.User.get_registered_emails",
+        return_value={"taken@example.com"},
+    )
+    mocker.patch(
+        "src.services.user_service.hash_passwords_async",
+        side_effect=lambda passwords: [f"hashed-{p}" for p in passwords],
+    )
+    new_many = mocker.patch(
+        "src.services.user_service.User.new_many",
+        side_effect=lambda rows: rows,
+    )
+    revoke_refresh_tokens = mocker.patch(
+        "src.services.user_service.RefreshToken.revoke_user"
+    )
+    return SimpleNamespace(
+        new_many=new_many, revoke_refresh_tokens=revoke_refresh_tokens
+    )
+
+
+@pytest.mark.anyio
+async def test_bulk_import_users_reports_failures_per_line(models):
+    result = await UserService().bulk_import_users(
+        _body(
+            _line("first@example.com"),
+            b"not json",
+            _line("taken@example.com"),
+            _line("first@example.com"),
+            _line("second@example.com", password="short"),
+            _line("third@example.com"),
+        )
+    )
+
+    assert result.created == 2
+    assert [failure.line for failure in result.failed] == [2, 5, 3, 4]
+    (rows,) = models.new_many.call_args.args
+    assert [row["email"] for row in rows] == [
+        "first@example.com",
+        "third@example.com",
+    ]
+    assert rows[0]["password"] == "hashed-P@ssw0rd1"
+    assert rows[0]["user_type_id"] == 4
+
+
+@pytest.mark.anyio
+async def test_delete_user_evicts_cached_tokens_again_once_committed(models, mocker):
+    token_cache = mocker.patch.object(user_service, "token_cache")
+    mocker.patch.object(user_service, "token_revocations")
+    user = SimpleNamespace(security_version=0, delete=mocker.AsyncMock())
+    mocker.patch.object(UserService, "get_user", return_value=user)
+
+    await UserService().delete_user(1)
+    token_cache.invalidate_user.assert_called_once_with(1)
+
+    (after_commit,) = user_service.db.after_commit.call_args.args
+    after_commit()
+    assert token_cache.invalidate_user.call_count == 2
+
+
+@pytest.mark.anyio
+async def test_user_changes_read_the_user_from_the_primary(models, mocker):
+    mocker.patch.object(user_service, "token_cache")
+    revocations = mocker.patch.object(user_service, "token_revocations")
+    user = SimpleNamespace(security_version=2, update=mocker.AsyncMock())
+    get_by_id = mocker.patch.object(user_service.User, "get_by_id", return_value=user)
+    updated_user = SimpleNamespace(model_dump_hashed=mocker.AsyncMock(return_value={}))
+
+    await UserService().update_user(1, updated_user)
+
+    # A lagging replica could return an older `security_version`, which would
+    # leave tokens issued since valid.
+    get_by_id.assert_awaited_once_with(1, from_primary=True)
+    user.update.assert_awaited_once_with(security_version=3)
+    revocations.revoke_user.assert_called_once_with(1, 3)
+
+
+@pytest.mark.anyio
+async def test_user_changes_revoke_the_users_refresh_tokens(models, mocker):
+    mocker.patch.object(user_service, "token_cache")
+    mocker.patch.object(user_service, "token_revocations")
+    user = SimpleNamespace(
+        security_version=0, update=mocker.AsyncMock(), delete=mocker.AsyncMock()
+    )
+    mocker.patch.object(user_service.User, "get_by_id", return_value=user)
+    updated_user = SimpleNamespace(model_dump_hashed=mocker.AsyncMock(return_value={}))
+
+    await UserService().update_user(1, updated_user)
+    models.revoke_refresh_tokens.assert_awaited_once_with(1)
+
+    models.revoke_refresh_tokens.reset_mock()
+    await UserService().delete_user(1)
+    models.revoke_refresh_tokens.assert_awaited_once_with(1)
@@ -0,0 +1,101 @@
+"""Unit tests for the lazily loaded application."""
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from src.lazy_app import LazyApp
+
+
+class _App:
+    """A minimal ASGI application recording its requests and lifespan."""
+
+    def __init__(self):
+        self.paths = []
+        self.events = []
+        self.router = SimpleNamespace(lifespan_context=self._lifespan)
+
+    @asynccontextmanager
+    async def _lifespan(self, app):
+        self.events.append("startup")
+        yield
+        self.events.append("shutdown")
+
+    async def __call__(self, scope, receive, send):
+        self.paths.append(scope["path"])
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+
+async def _request(app, path, method="GET"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app({"type": "http", "path": path, "method": method}, receive, send)
+    return messages[0]["status"], messages[1]["body"]
+
+
+class _Lifespan:
+    """Drives an ASGI lifespan as a server would."""
+
+    def __init__(self, app):
+        self.received = asyncio.Queue()
+        self.sent = asyncio.Queue()
+        self.task = asyncio.create_task(
+            app({"type": "lifespan"}, self.received.get, self.sent.put)
+        )
+
+    async def send(self, message_type):
+        await self.received.put({"type": message_type})
+        return (await self.sent.get())["type"]
+
+
+@pytest.fixture
+def loading(mocker):
+    inner = _App()
+    imported = threading.Event()
+    mocker.patch.object(
+        LazyApp, "_import", side_effect=lambda: imported.wait(5) and (lambda: inner)
+    )
+    return SimpleNamespace(app=inner, imported=imported)
+
+
+@pytest.mark.anyio
+async def test_health_is_served_while_the_app_is_imported(loading):
+    app = LazyApp("app:factory")
+    lifespan = _Lifespan(app)
+
+    assert await lifespan.send("lifespan.startup") == "lifespan.startup.complete"
+    assert await _request(app, "/health") == (200, b"null")
+    assert await _request(app, "/health", method="HEAD") == (200, b"")
+    assert loading.app.paths == []
+
+    loading.imported.set()
+    assert await _request(app, "/user/me") == (204, b"")
+    assert await _request(app, "/health") == (204, b"")
+    assert loading.app.paths == ["/user/me", "/health"]
+
+    assert await lifespan.send("lifespan.shutdown") == "lifespan.shutdown.complete"
+    assert loading.app.events == ["startup", "shutdown"]
+
+
+@pytest.mark.anyio
+async def test_requests_wait_for_the_app(loading):
+    app = LazyApp("app:factory")
+
+    request = asyncio.create_task(_request(app, "/user/me"))
+    await asyncio.sleep(0.01)
+    assert not request.done()
+
+    loading.imported.set()
+    assert await request == (204, b"")
+    # Without a lifespan from the server, the app's own is not run either.
+    assert loading.app.events == []
@@ -1,8 +1,12 @@
 from fastapi import FastAPI
 
+from src.lazy_app import LazyApp
 
-def test_app_is_fastapi_app():
+
+def test_app_is_lazily_loaded_fastapi_app():
     from src.vercel import app
 
-    assert isinstance(app, FastAPI)
-    assert app.title == "fastapi-backend-template"
+    assert isinstance(app, LazyApp)
+    built = app._import()()
+    assert isinstance(built, FastAPI)
+    assert built.title == "fastapi-backend-template"
@@ -0,0 +1,46 @@
+"""Unit tests for the password hashing helpers."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.exceptions.http_exceptions import ServiceBusyException
+from src.utils.auth_util import PasswordHashingPool, get_password_hash, verify_password
+
+
+@pytest.fixture
+def pool():
+    pool = PasswordHashingPool(
+        pool_size=1,
+        max_concurrency=1,
+        queue_timeout_seconds=0.05,
+        use_processes=False,
+    )
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.anyio
+async def test_hash_and_verify_in_pool(pool: PasswordHashingPool):
+    hashed = await pool.run(get_password_hash, "P@ssw0rd")
+
+    assert await pool.run(verify_password, "P@ssw0rd", hashed)
+    assert not await pool.run(verify_password, "wrong-password", hashed)
+    stats = pool.stats()
+    assert stats["completed"] == 3
+    assert stats["queue_depth"] == 0
+    assert stats["in_flight"] == 0
+    assert stats["hash_seconds_max"] > 0
+
+
+@pytest.mark.anyio
+async def test_waiting_callers_time_out(pool: PasswordHashingPool):
+    holder = asyncio.create_task(pool.run(time.sleep, 0.2))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(ServiceBusyException):
+        await pool.run(get_password_hash, "P@ssw0rd")
+
+    await holder
+    assert pool.stats()["rejected"] == 1
@@ -0,0 +1,75 @@
+"""Unit tests for the ETag helpers."""
+
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from fastapi import Response
+
+from src.utils.etag import (
+    collection_etag,
+    conditional_get,
+    entity_etag,
+    etag_matches,
+)
+
+UPDATED_AT = datetime(2025, 5, 24, 11, 36, 43, 225486, tzinfo=timezone.utc)
+
+
+def test_entity_etag_changes_with_updated_at():
+    etag = entity_etag(1, UPDATED_AT)
+
+    assert etag.startswith('W/"1-')
+    assert entity_etag(1, UPDATED_AT) == etag
+    assert entity_etag(1, UPDATED_AT + timedelta(microseconds=1)) != etag
+    assert entity_etag(2, UPDATED_AT) != etag
+
+
+def test_collection_etag_covers_order_and_extra_values():
+    first = SimpleNamespace(id=1, updated_at=UPDATED_AT)
+    second = SimpleNamespace(id=2, updated_at=UPDATED_AT)
+
+    etag = collection_etag([first, second], None)
+
+    assert collection_etag([first, second], None) == etag
+    assert collection_etag([second, first], None) != etag
+    assert collection_etag([first, second], "cursor") != etag
+
+
+@pytest.mark.parametrize(
+    "if_none_match, matches",
+    [
+        (None, False),
+        ('W/"1-a"', True),
+        ('"1-a"', True),
+        ('W/"0-a", W/"1-a"', True),
+        ("*", True),
+        ('W/"1-b"', False),
+    ],
+)
+def test_etag_matches(if_none_match, matches):
+    assert etag_matches(if_none_match, 'W/"1-a"') is matches
+
+
+def test_conditional_get_returns_not_modified_with_the_response_headers():
+    response = Response(media_type="application/json")
+    response.headers["X-Next-Cursor"] = "cursor"
+    response.set_cookie("a", "1")
+    response.set_cookie("b", "2")
+
+    not_modified = conditional_get(response, 'W/"1-a"', 'W/"1-a"')
+
+    assert not_modified.status_code == 304
+    assert not_modified.headers["ETag"] == 'W/"1-a"'
+    assert not_modified.headers["X-Next-Cursor"] == "cursor"
+    assert len(not_modified.headers.getlist("set-cookie")) == 2
+    # But no header describing a body, such as the `Response()` content length.
+    assert "content-length" not in not_modified.headers
+    assert "content-type" not in not_modified.headers
+
+
+def test_conditional_get_tags_the_response_otherwise():
+    response = Response()
+
+    assert conditional_get(response, 'W/"1-a"', 'W/"1-b"') is None
+    assert response.headers["ETag"] == 'W/"1-a"'
@@ -0,0 +1,61 @@
+"""Unit tests for the pre-serialized JSON responses."""
+
+from datetime import datetime, timezone
+from typing import List
+
+import pytest
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from src.database.models.users import User
+from src.schemas.user import UserOut
+from src.utils.json_response import serialized_response, type_adapter
+
+
+def _users() -> List[User]:
+    now = datetime(2025, 5, 24, 11, 36, 43, 225486, tzinfo=timezone.utc)
+    return [
+        User(
+            id=user_id,
+            created_at=now,
+            updated_at=now,
+            name="John Doe",
+            email=f"john{user_id}@example.com",
+            password="hash",
+            user_type_id=1,
+        )
+        for user_id in range(3)
+    ]
+
+
+@pytest.mark.anyio
+async def test_body_matches_fastapi_serialization():
+    users = _users()
+    field = create_model_field(
+        name="Response", type_=List[UserOut], mode="serialization"
+    )
+    content = await serialize_response(
+        field=field, response_content=users, is_coroutine=True
+    )
+
+    response = serialized_response(List[UserOut], users)
+
+    assert response.body == JSONResponse(content).body
+    assert response.headers["content-type"] == "application/json"
+    assert b"password" not in response.body
+
+
+def test_headers_set_on_the_endpoint_response_are_kept():
+    endpoint_response = Response()
+    endpoint_response.headers["ETag"] = 'W/"1-a"'
+
+    response = serialized_response(UserOut, _users()[0], endpoint_response)
+
+    assert response.headers["ETag"] == 'W/"1-a"'
+    assert response.headers["content-length"] == str(len(response.body))
+
+
+def test_type_adapters_are_built_once():
+    assert type_adapter(List[UserOut]) is type_adapter(List[UserOut])
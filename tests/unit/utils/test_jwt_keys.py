@@ -0,0 +1,126 @@
+"""Unit tests for the access token signing keys."""
+
+import json
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+from src.utils.jwt_keys import KeyRing
+
+
+def _write_key(keys_dir, kid: str, algorithm: str) -> None:
+    if algorithm == "EdDSA":
+        key = ed25519.Ed25519PrivateKey.generate()
+    else:
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    (keys_dir / f"{kid}.pem").write_bytes(
+        key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    )
+
+
+def _sign(key_ring: KeyRing, payload: dict) -> str:
+    key, headers = key_ring.signing_key()
+    return jwt.encode(payload, key, algorithm=key_ring.algorithm, headers=headers)
+
+
+def test_hmac_algorithms_use_the_secret_key(tmp_path):
+    key_ring = KeyRing("HS256", secret_key="secret", keys_dir=tmp_path)
+
+    token = _sign(key_ring, {"sub": "john@example.com"})
+
+    assert jwt.get_unverified_header(token).get("kid") is None
+    assert key_ring.verification_key(token) == "secret"
+    assert json.loads(key_ring.jwks()[0]) == {"keys": []}
+
+
+@pytest.mark.parametrize("algorithm", ["RS256", "EdDSA"])
+def test_tokens_verify_with_the_published_keys(tmp_path, algorithm):
+    _write_key(tmp_path, "2026-01", algorithm)
+    key_ring = KeyRing(algorithm, secret_key=None, keys_dir=tmp_path)
+
+    token = _sign(key_ring, {"sub": "john@example.com"})
+
+    (jwk,) = json.loads(key_ring.jwks()[0])["keys"]
+    assert jwt.get_unverified_header(token)["kid"] == jwk["kid"] == "2026-01"
+    assert "d" not in jwk
+    public_key = jwt.PyJWK(jwk).key
+    assert jwt.decode(token, public_key, algorithms=[algorithm])["sub"] == (
+        "john@example.com"
+    )
+
+
+def test_rotation_keeps_verifying_tokens_of_older_keys(tmp_path):
+    _write_key(tmp_path, "2026-01", "EdDSA")
+    old_key_ring = KeyRing("EdDSA", secret_key=None, keys_dir=tmp_path)
+    old_token = _sign(old_key_ring, {"sub": "john@example.com"})
+    _, old_etag = old_key_ring.jwks()
+    _write_key(tmp_path, "2026-02", "EdDSA")
+
+    key_ring = KeyRing("EdDSA", secret_key=None, keys_dir=tmp_path)
+    token = _sign(key_ring, {"sub": "john@example.com"})
+
+    assert jwt.get_unverified_header(token)["kid"] == "2026-02"
+    for signed in (old_token, token):
+        jwt.decode(signed, key_ring.verification_key(signed), algorithms=["EdDSA"])
+    assert key_ring.jwks()[1] != old_etag
+
+
+def test_unknown_key_ids_are_rejected(tmp_path):
+    _write_key(tmp_path, "2026-01", "EdDSA")
+    key_ring = KeyRing("EdDSA", secret_key=None, keys_dir=tmp_path)
+    forged = jwt.encode(
+        {"sub": "john@example.com"},
+        ed25519.Ed25519PrivateKey.generate(),
+        algorithm="EdDSA",
+        headers={"kid": "2025-12"},
+    )
+
+    with pytest.raises(jwt.InvalidTokenError):
+        key_ring.verification_key(forged)
+    with pytest.raises(ValueError):
+        KeyRing("EdDSA", None, tmp_path, active_kid="2025-12").signing_key()
+
+
+def test_rotated_keys_are_picked_up_without_a_restart(tmp_path):
+    _write_key(tmp_path, "2026-01", "EdDSA")
+    key_ring = KeyRing("EdDSA", secret_key=None, keys_dir=tmp_path)
+    old_token = _sign(key_ring, {"sub": "john@example.com"})
+    _write_key(tmp_path, "2026-02", "EdDSA")
+
+    # Another worker already signing with the new key.
+    other_worker = KeyRing("EdDSA", secret_key=None, keys_dir=tmp_path)
+    token = _sign(other_worker, {"sub": "john@example.com"})
+    jwt.decode(token, key_ring.verification_key(token), algorithms=["EdDSA"])
+    jwt.decode(old_token, key_ring.verification_key(old_token), algorithms=["EdDSA"])
+
+    key_ring.reload_seconds = 0
+    assert jwt.get_unverified_header(_sign(key_ring, {}))["kid"] == "2026-02"
+
+
+def test_unknown_key_ids_reload_the_keys_at_most_once_per_interval(tmp_path, mocker):
+    _write_key(tmp_path, "2026-01", "EdDSA")
+    key_ring = KeyRing("EdDSA", secret_key=None, keys_dir=tmp_path)
+    key_ring.jwks()
+    read = mocker.spy(key_ring, "_read")
+    forged = jwt.encode(
+        {"sub": "john@example.com"},
+        ed25519.Ed25519PrivateKey.generate(),
+        algorithm="EdDSA",
+        headers={"kid": "2025-12"},
+    )
+
+    for _ in range(3):
+        with pytest.raises(jwt.InvalidTokenError):
+            key_ring.verification_key(forged)
+
+    assert read.call_count == 1
+    key_ring.min_reload_seconds = 0
+    with pytest.raises(jwt.InvalidTokenError):
+        key_ring.verification_key(forged)
+    assert read.call_count == 2
@@ -0,0 +1,42 @@
+"""Unit tests for the background batching log sink."""
+
+import io
+import threading
+
+from src.utils.log_sink import BackgroundBatchSink
+
+
+class BlockingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.unblocked = threading.Event()
+
+    def write(self, message: str) -> int:
+        self.unblocked.wait()
+        return super().write(message)
+
+
+def test_records_are_written_in_order_on_stop():
+    stream = io.StringIO()
+    sink = BackgroundBatchSink(stream, batch_size=2)
+
+    for index in range(5):
+        sink.write(f"line {index}\n")
+    sink.stop()
+
+    assert stream.getvalue() == "".join(f"line {index}\n" for index in range(5))
+    assert sink.stats() == {"queued": 0, "written": 5, "dropped": 0}
+
+
+def test_records_are_dropped_when_queue_is_full():
+    stream = BlockingStream()
+    sink = BackgroundBatchSink(stream, max_queue_size=2, batch_size=1)
+
+    for index in range(10):
+        sink.write(f"line {index}\n")
+    stream.unblocked.set()
+    sink.stop()
+
+    stats = sink.stats()
+    assert stats["dropped"] > 0
+    assert stats["written"] + stats["dropped"] == 10
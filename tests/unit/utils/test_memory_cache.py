@@ -0,0 +1,113 @@
+"""Unit tests for the bounded in-process cache backend."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from src.utils import memory_cache
+from src.utils.memory_cache import BoundedMemoryBackend
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1000.0
+
+    # Patch the module's view of `time` only; the event loop relies on monotonic.
+    monkeypatch.setattr(
+        memory_cache, "time", SimpleNamespace(monotonic=lambda: Clock.now)
+    )
+    return Clock
+
+
+def _backend(max_entries: int = 10, max_bytes: int = 1000) -> BoundedMemoryBackend:
+    return BoundedMemoryBackend(
+        max_entries=max_entries, max_bytes=max_bytes, sweep_interval_seconds=0.01
+    )
+
+
+@pytest.mark.anyio
+async def test_set_then_get_with_ttl(clock):
+    backend = _backend()
+    await backend.set("key", b"value", expire=5)
+    await backend.set("forever", b"value")
+
+    assert await backend.get_with_ttl("key") == (5, b"value")
+    assert await backend.get_with_ttl("forever") == (-1, b"value")
+    assert await backend.get("missing") is None
+    assert (backend.hits, backend.misses) == (2, 1)
+
+
+@pytest.mark.anyio
+async def test_expired_entries_are_misses(clock):
+    backend = _backend()
+    await backend.set("key", b"value", expire=5)
+
+    clock.now += 5
+
+    assert await backend.get("key") is None
+    assert backend.expirations == 1
+    assert backend.stats()["entries"] == 0
+
+
+@pytest.mark.anyio
+async def test_least_recently_used_entry_is_evicted_past_max_entries(clock):
+    backend = _backend(max_entries=2)
+    await backend.set("a", b"1", expire=60)
+    await backend.set("b", b"2", expire=60)
+    await backend.get("a")
+
+    await backend.set("c", b"3", expire=60)
+
+    assert await backend.get("b") is None
+    assert await backend.get("a") == b"1"
+    assert backend.evictions == 1
+
+
+@pytest.mark.anyio
+async def test_entries_are_evicted_to_stay_within_max_bytes(clock):
+    backend = _backend(max_bytes=20)
+    await backend.set("a", b"x" * 9, expire=60)
+    await backend.set("b", b"x" * 10, expire=60)
+
+    assert await backend.get("a") is None
+    assert backend.stats()["bytes"] == 11
+
+
+@pytest.mark.anyio
+async def test_value_larger_than_max_bytes_is_not_cached(clock):
+    backend = _backend(max_bytes=20)
+    await backend.set("a", b"1", expire=60)
+
+    await backend.set("a", b"x" * 20, expire=60)
+
+    assert await backend.get("a") is None
+    assert backend.stats()["bytes"] == 0
+
+
+@pytest.mark.anyio
+async def test_clear_by_namespace_and_key(clock):
+    backend = _backend()
+    await backend.set("ns:a", b"1", expire=60)
+    await backend.set("ns:b", b"2", expire=60)
+    await backend.set("other", b"3", expire=60)
+
+    assert await backend.clear(namespace="ns:") == 2
+    assert await backend.clear(key="other") == 1
+    assert backend.stats()["bytes"] == 0
+
+
+@pytest.mark.anyio
+async def test_sweeper_removes_expired_entries_nobody_reads(clock):
+    backend = _backend()
+    await backend.set("expired", b"1", expire=5)
+    await backend.set("live", b"2", expire=60)
+    clock.now += 10
+
+    backend.start_sweeper()
+    await asyncio.sleep(0.05)
+    await backend.stop_sweeper()
+
+    assert backend.stats()["entries"] == 1
+    assert backend.expirations == 1
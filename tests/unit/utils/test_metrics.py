@@ -0,0 +1,48 @@
+"""Unit tests for the in-process metrics primitives."""
+
+from src.utils.metrics import (
+    Histogram,
+    RequestMetrics,
+    format_labels,
+    histogram_samples,
+)
+
+
+def test_histogram_buckets_are_inclusive_upper_bounds():
+    histogram = Histogram(bounds=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value)
+
+    assert histogram.counts == [2, 1, 1]
+    assert histogram.cumulative_counts() == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert histogram.count == 4
+
+
+def test_request_metrics_keeps_one_histogram_per_method_route_and_status():
+    metrics = RequestMetrics(bounds=(1.0,))
+
+    metrics.observe("GET", "/user/{user_id}", 200, 0.5)
+    metrics.observe("GET", "/user/{user_id}", 200, 0.2)
+    metrics.observe("GET", "/user/{user_id}", 404, 0.1)
+
+    counts = {labels["status"]: h.count for labels, h in metrics.histograms()}
+    assert counts == {"200": 2, "404": 1}
+
+
+def test_histogram_samples_use_the_prometheus_text_format():
+    histogram = Histogram(bounds=(1.0,))
+    histogram.observe(0.5)
+
+    lines = histogram_samples("latency", {"route": "/"}, histogram)
+
+    assert lines == [
+        'latency_bucket{route="/",le="1.0"} 1',
+        'latency_bucket{route="/",le="+Inf"} 1',
+        'latency_sum{route="/"} 0.5',
+        'latency_count{route="/"} 1',
+    ]
+
+
+def test_label_values_are_escaped():
+    assert format_labels({"path": 'a"b\\c'}) == '{path="a\\"b\\\\c"}'
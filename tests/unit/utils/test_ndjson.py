@@ -0,0 +1,22 @@
+"""Unit tests for the NDJSON stream splitter."""
+
+import pytest
+
+from src.utils.ndjson import iter_ndjson_lines
+
+
+async def _chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.anyio
+async def test_lines_spanning_chunks_are_reassembled():
+    lines = [
+        line
+        async for line in iter_ndjson_lines(
+            _chunks(b'{"a": 1}\n{"b"', b": 2}\n\n", b'{"c": 3}')
+        )
+    ]
+
+    assert lines == [(1, b'{"a": 1}'), (2, b'{"b": 2}'), (4, b'{"c": 3}')]
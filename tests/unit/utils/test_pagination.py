@@ -0,0 +1,22 @@
+"""Unit tests for the keyset pagination cursor helpers."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from src.utils.pagination import InvalidCursorError, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2025, 5, 24, 11, 36, 43, 225486, tzinfo=timezone.utc)
+
+    cursor = encode_cursor(created_at, 42)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, 42)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "e30"])
+def test_invalid_cursor(cursor: str):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
@@ -0,0 +1,77 @@
+"""Unit tests for the permission bitmasks."""
+
+from datetime import datetime, timezone
+
+from src.schemas.user import AuthenticatedUser
+from src.schemas.user_type import CachedUserType
+from src.utils.enums import UserPermissionsEnum
+from src.utils.permissions import (
+    CAN_LOGIN,
+    CAN_READ_ALL,
+    CAN_READ_OWN,
+    PERMISSION_BITS,
+    missing_permissions,
+    permission_mask,
+)
+
+
+def _user_type(**flags) -> CachedUserType:
+    now = datetime.now(timezone.utc)
+    return CachedUserType(
+        id=4,
+        created_at=now,
+        updated_at=now,
+        title="USER",
+        description="Regular user.",
+        **flags,
+    )
+
+
+def test_every_permission_has_its_own_bit():
+    bits = [*PERMISSION_BITS.values(), CAN_LOGIN]
+
+    assert len(set(bits)) == len(UserPermissionsEnum) + 1
+    assert all(bit and not bit & (bit - 1) for bit in bits)
+
+
+def test_user_type_permissions_match_its_flags():
+    user_type = _user_type(can_read_all=True, can_delete_own=False)
+
+    for permission, bit in PERMISSION_BITS.items():
+        assert bool(user_type.permissions & bit) == getattr(user_type, permission)
+    assert user_type.permissions & CAN_LOGIN
+    assert not _user_type(can_login=False).permissions & CAN_LOGIN
+
+
+def test_missing_permissions_is_the_bitwise_difference():
+    granted = CAN_READ_OWN | CAN_LOGIN
+    required = permission_mask(
+        [UserPermissionsEnum.can_read_all, UserPermissionsEnum.can_read_own]
+    )
+
+    assert missing_permissions(required, granted) == [UserPermissionsEnum.can_read_all]
+    assert missing_permissions(CAN_READ_OWN, granted) == []
+    assert missing_permissions(permission_mask([]), granted) == []
+
+
+def test_authenticated_user_checks_permissions_against_the_mask():
+    now = datetime.now(timezone.utc)
+    user_type = _user_type(can_read_all=True)
+    user = AuthenticatedUser(
+        id=1,
+        created_at=now,
+        updated_at=now,
+        name="John Doe",
+        email="john@example.com",
+        user_type_id=4,
+        is_active=True,
+        is_blocked=False,
+        user_type_data=user_type,
+    )
+
+    assert user.user_type_data is user_type
+    assert user.permissions == user_type.permissions
+    assert user.has_permissions(CAN_READ_ALL | CAN_READ_OWN)
+    assert user.can_read_all
+    assert not user.can_create_all
+    assert user.can_login
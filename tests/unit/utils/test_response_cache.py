@@ -0,0 +1,297 @@
+"""Unit tests for the endpoint response cache and its request coalescing."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from httpx import ASGITransport, AsyncClient
+
+from src.database import session as session_module
+from src.utils import response_cache
+from src.utils.response_cache import ResponseCacheStats, cache
+from src.utils.single_flight import SingleFlight
+
+
+@pytest.fixture
+def single_flight(monkeypatch, request) -> SingleFlight:
+    single_flight = SingleFlight()
+    monkeypatch.setattr(response_cache, "cache_single_flight", single_flight)
+    monkeypatch.setattr(FastAPICache, "_backend", InMemoryBackend())
+    monkeypatch.setattr(FastAPICache, "_enable", True)
+    # Every `InMemoryBackend` shares one store; keep each test's keys apart.
+    monkeypatch.setattr(FastAPICache, "_prefix", request.node.name)
+    return single_flight
+
+
+@pytest.fixture
+def stats(monkeypatch) -> ResponseCacheStats:
+    stats = ResponseCacheStats()
+    monkeypatch.setattr(response_cache, "cache_stats", stats)
+    return stats
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = time.time()
+
+    # `InMemoryBackend` reads the time through `time.time`.
+    monkeypatch.setattr(time, "time", lambda: Clock.now)
+    return Clock
+
+
+@pytest.fixture
+def calls() -> list:
+    return []
+
+
+def _client(calls: list, failing: bool = False, **cache_args) -> AsyncClient:
+    app = FastAPI()
+
+    @app.get("/slow")
+    @cache(**cache_args)
+    async def slow():
+        calls.append(None)
+        await asyncio.sleep(0.05)
+        if failing and len(calls) > 1:
+            raise RuntimeError("boom")
+        return {"call": len(calls)}
+
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.fixture
+async def client(single_flight, calls):
+    async with _client(calls, expire=60) as client:
+        yield client
+
+
+@pytest.mark.anyio
+async def test_responses_are_cached(client, calls):
+    first = await client.get("/slow")
+    second = await client.get("/slow")
+
+    assert first.headers["X-FastAPI-Cache"] == "MISS"
+    assert second.headers["X-FastAPI-Cache"] == "HIT"
+    assert first.json() == second.json() == {"call": 1}
+    assert len(calls) == 1
+
+
+@pytest.mark.anyio
+async def test_concurrent_misses_are_coalesced(client, calls, single_flight):
+    responses = await asyncio.gather(*(client.get("/slow") for _ in range(5)))
+
+    assert [response.json() for response in responses] == [{"call": 1}] * 5
+    assert len(calls) == 1
+    assert single_flight.calls == 1
+    assert single_flight.coalesced == 4
+    assert len(single_flight) == 0
+
+
+@pytest.mark.anyio
+async def test_no_store_bypasses_the_cache(client, calls):
+    await client.get("/slow")
+    response = await client.get("/slow", headers={"Cache-Control": "no-store"})
+
+    assert "X-FastAPI-Cache" not in response.headers
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio
+async def test_matching_etag_is_not_modified(client):
+    etag = (await client.get("/slow")).headers["ETag"]
+
+    response = await client.get("/slow", headers={"If-None-Match": etag})
+    listed = await client.get("/slow", headers={"If-None-Match": f'"a", {etag}'})
+    wildcard = await client.get("/slow", headers={"If-None-Match": "*"})
+
+    assert etag.startswith('W/"')
+    assert response.status_code == listed.status_code == wildcard.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+@pytest.mark.anyio
+async def test_single_flight_shares_exceptions():
+    single_flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        single_flight.run("key", fail),
+        single_flight.run("key", fail),
+        return_exceptions=True,
+    )
+
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    assert single_flight.calls == 1
+    assert len(single_flight) == 0
+
+
+@pytest.mark.anyio
+async def test_cancelled_caller_does_not_cancel_the_call():
+    single_flight = SingleFlight()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "value"
+
+    first = asyncio.create_task(single_flight.run("key", compute))
+    second = asyncio.create_task(single_flight.run("key", compute))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "value"
+
+
+async def _background_tasks_done() -> None:
+    await asyncio.sleep(0.1)
+
+
+@pytest.mark.anyio
+async def test_stale_response_is_served_while_refreshed(
+    single_flight, stats, clock, calls
+):
+    async with _client(calls, expire=5, stale_ttl=60) as client:
+        await client.get("/slow")
+        clock.now += 10
+
+        stale = await client.get("/slow")
+        await _background_tasks_done()
+        refreshed = await client.get("/slow")
+
+    assert stale.headers["X-FastAPI-Cache"] == "HIT"
+    assert stale.json() == {"call": 1}
+    assert refreshed.json() == {"call": 2}
+    assert stats.stale_hits == 1
+    assert stats.background_refreshes == 1
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio
+async def test_response_past_the_stale_window_is_recomputed(
+    single_flight, stats, clock, calls
+):
+    async with _client(calls, expire=5, stale_ttl=60) as client:
+        await client.get("/slow")
+        clock.now += 70
+
+        response = await client.get("/slow")
+
+    assert response.headers["X-FastAPI-Cache"] == "MISS"
+    assert response.json() == {"call": 2}
+    assert stats.stale_hits == 0
+
+
+@pytest.mark.anyio
+async def test_failed_refresh_keeps_serving_the_stale_response(
+    single_flight, stats, clock, calls
+):
+    async with _client(calls, failing=True, expire=5, stale_ttl=60) as client:
+        await client.get("/slow")
+        clock.now += 10
+
+        await client.get("/slow")
+        await _background_tasks_done()
+        response = await client.get("/slow")
+
+    assert response.json() == {"call": 1}
+    assert stats.failed_refreshes == 1
+
+
+@pytest.mark.anyio
+async def test_fresh_response_is_refreshed_early_with_a_high_beta(
+    single_flight, stats, calls
+):
+    async with _client(calls, expire=60, early_refresh_beta=1e9) as client:
+        await client.get("/slow")
+        response = await client.get("/slow")
+        await _background_tasks_done()
+
+    assert response.json() == {"call": 1}
+    assert stats.background_refreshes == 1
+    assert len(calls) == 2
+
+
+@pytest.mark.anyio
+async def test_fresh_response_is_not_refreshed_without_early_refresh(
+    single_flight, stats, calls
+):
+    async with _client(calls, expire=60) as client:
+        await client.get("/slow")
+        await client.get("/slow")
+        await _background_tasks_done()
+
+    assert stats.background_refreshes == 0
+    assert len(calls) == 1
+
+
+@pytest.mark.anyio
+async def test_misses_are_computed_outside_the_callers_unit_of_work(single_flight):
+    units_of_work = []
+    app = FastAPI()
+
+    @app.get("/db")
+    @cache(expire=60)
+    async def uses_db():
+        units_of_work.append(session_module._unit_of_work.get())
+        return {}
+
+    token = session_module._unit_of_work.set(object())
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            await client.get("/db")
+    finally:
+        session_module._unit_of_work.reset(token)
+
+    assert units_of_work == [None]
+
+
+_ETAG_SCRIPT = """
+import asyncio
+from fastapi import FastAPI
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from httpx import ASGITransport, AsyncClient
+from src.utils.response_cache import cache
+
+FastAPICache.init(InMemoryBackend())
+app = FastAPI()
+
+@app.get("/body")
+@cache(expire=60)
+async def body():
+    return {"body": "the same"}
+
+async def main():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://t") as c:
+        print((await c.get("/body")).headers["ETag"])
+
+asyncio.run(main())
+"""
+
+
+def test_workers_compute_the_same_etag_for_the_same_body():
+    # Each worker process salts `hash()` differently.
+    etags = {
+        subprocess.run(
+            [sys.executable, "-c", _ETAG_SCRIPT],
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        for seed in ("1", "2")
+    }
+
+    assert len(etags) == 1
+    assert etags.pop().startswith('W/"')
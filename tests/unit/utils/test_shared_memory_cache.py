@@ -0,0 +1,117 @@
+"""Unit tests for the cross-worker shared memory cache backend."""
+
+import multiprocessing
+
+import pytest
+
+from src.utils import shared_memory_cache
+from src.utils.shared_memory_cache import SharedMemoryBackend
+
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "cache")
+
+
+@pytest.fixture
+def backend(path):
+    backend = SharedMemoryBackend(path, slots=8, slot_size=128)
+    yield backend
+    backend.close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    class Clock:
+        now = 1000.0
+
+    monkeypatch.setattr(shared_memory_cache.time, "time", lambda: Clock.now)
+    return Clock
+
+
+@pytest.mark.anyio
+async def test_set_then_get_with_ttl(backend, clock):
+    await backend.set("key", b"value", expire=5)
+
+    assert await backend.get("key") == b"value"
+    assert await backend.get_with_ttl("key") == (5, b"value")
+    assert await backend.get("missing") is None
+
+
+@pytest.mark.anyio
+async def test_entries_expire(backend, clock):
+    await backend.set("key", b"value", expire=5)
+
+    clock.now += 5
+
+    assert await backend.get_with_ttl("key") == (0, None)
+
+
+@pytest.mark.anyio
+async def test_entries_are_shared_between_mappings(backend, path):
+    other_worker = SharedMemoryBackend(path, slots=8, slot_size=128)
+    try:
+        await backend.set("key", b"value", expire=60)
+        assert await other_worker.get("key") == b"value"
+    finally:
+        other_worker.close()
+
+
+def _set_in_child(path: str) -> None:
+    import asyncio
+
+    backend = SharedMemoryBackend(path, slots=8, slot_size=128)
+    asyncio.run(backend.set("from-child", b"hello", expire=60))
+    backend.close()
+
+
+@pytest.mark.anyio
+async def test_entries_are_shared_between_processes(backend, path):
+    process = multiprocessing.get_context("fork").Process(
+        target=_set_in_child, args=(path,)
+    )
+    process.start()
+    process.join(timeout=10)
+
+    assert await backend.get("from-child") == b"hello"
+
+
+@pytest.mark.anyio
+async def test_values_larger_than_a_slot_are_not_cached(backend):
+    await backend.set("key", b"x" * 128, expire=60)
+
+    assert await backend.get("key") is None
+
+
+@pytest.mark.anyio
+async def test_full_table_evicts_the_entry_closest_to_expiring(path, clock):
+    backend = SharedMemoryBackend(path, slots=2, slot_size=128)
+    await backend.set("a", b"1", expire=10)
+    await backend.set("b", b"2", expire=100)
+    await backend.set("c", b"3", expire=50)
+
+    assert await backend.get("a") is None
+    assert await backend.get("b") == b"2"
+    assert await backend.get("c") == b"3"
+    backend.close()
+
+
+@pytest.mark.anyio
+async def test_clear_by_namespace_and_key(backend):
+    await backend.set("ns:a", b"1", expire=60)
+    await backend.set("ns:b", b"2", expire=60)
+    await backend.set("other", b"3", expire=60)
+
+    assert await backend.clear(namespace="ns:") == 2
+    assert await backend.clear(key="other") == 1
+    assert await backend.get("other") is None
+
+
+@pytest.mark.anyio
+async def test_segment_with_another_layout_is_reinitialised(backend, path):
+    await backend.set("key", b"value", expire=60)
+
+    resized = SharedMemoryBackend(path, slots=16, slot_size=128)
+
+    assert await resized.get("key") is None
+    resized.close()
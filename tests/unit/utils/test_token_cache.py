@@ -0,0 +1,92 @@
+"""Unit tests for the access token to user cache."""
+
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from src.schemas.user import AuthenticatedUser
+from src.utils.token_cache import TokenCache
+
+
+def _user(user_id: int = 1, user_type_id: int = 4) -> AuthenticatedUser:
+    now = datetime.now(timezone.utc)
+    return AuthenticatedUser(
+        id=user_id,
+        created_at=now,
+        updated_at=now,
+        name="John Doe",
+        email=f"john{user_id}@example.com",
+        user_type_id=user_type_id,
+        is_active=True,
+        is_blocked=False,
+        user_type_data={
+            "id": user_type_id,
+            "created_at": now,
+            "updated_at": now,
+            "title": "USER",
+            "description": "Regular user.",
+        },
+    )
+
+
+@pytest.fixture
+def cache() -> TokenCache:
+    return TokenCache(max_size=2, ttl_seconds=60)
+
+
+def test_get_returns_cached_user(cache: TokenCache):
+    user = _user()
+    cache.set("token", user, token_expires_at=time.time() + 600)
+
+    assert cache.get("token") is user
+    assert cache.get("other-token") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entry_is_bounded_by_token_expiration(cache: TokenCache):
+    cache.set("token", _user(), token_expires_at=time.time() - 1)
+
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted(cache: TokenCache):
+    expires_at = time.time() + 600
+    cache.set("a", _user(1), token_expires_at=expires_at)
+    cache.set("b", _user(2), token_expires_at=expires_at)
+    cache.get("a")
+    cache.set("c", _user(3), token_expires_at=expires_at)
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_invalidate_user(cache: TokenCache):
+    expires_at = time.time() + 600
+    cache.set("a", _user(1), token_expires_at=expires_at)
+    cache.set("b", _user(2), token_expires_at=expires_at)
+
+    cache.invalidate_user(1)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+
+def test_invalidate_user_type(cache: TokenCache):
+    expires_at = time.time() + 600
+    cache.set("a", _user(1, user_type_id=4), token_expires_at=expires_at)
+    cache.set("b", _user(2, user_type_id=2), token_expires_at=expires_at)
+
+    cache.invalidate_user_type(4)
+
+    assert cache.get("a") is None
+    assert cache.get("b") is not None
+
+
+def test_disabled_cache_never_stores():
+    cache = TokenCache(max_size=10, ttl_seconds=0)
+    cache.set("token", _user(), token_expires_at=time.time() + 600)
+
+    assert cache.get("token") is None
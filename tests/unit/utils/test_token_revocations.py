@@ -0,0 +1,36 @@
+"""Unit tests for the revocation set of self-contained access tokens."""
+
+import time
+
+from src.utils.token_revocations import TokenRevocations
+
+
+def test_revoke_user_rejects_older_security_versions():
+    revocations = TokenRevocations(ttl_seconds=60)
+
+    revocations.revoke_user(1, security_version=3)
+
+    assert revocations.is_revoked(1, 2, user_type_id=4, issued_at=time.time())
+    assert not revocations.is_revoked(1, 3, user_type_id=4, issued_at=time.time())
+    assert not revocations.is_revoked(2, 0, user_type_id=4, issued_at=time.time())
+
+
+def test_revoke_user_type_rejects_tokens_issued_before():
+    revocations = TokenRevocations(ttl_seconds=60)
+    issued_before = time.time()
+
+    revocations.revoke_user_type(4)
+
+    assert revocations.is_revoked(1, 0, user_type_id=4, issued_at=issued_before)
+    assert not revocations.is_revoked(1, 0, user_type_id=4, issued_at=time.time())
+    assert not revocations.is_revoked(1, 0, user_type_id=5, issued_at=issued_before)
+
+
+def test_purge_drops_entries_once_their_tokens_expired():
+    revocations = TokenRevocations(ttl_seconds=0)
+    revocations.revoke_user(1, security_version=1)
+    revocations.revoke_user_type(4)
+
+    revocations.purge()
+
+    assert len(revocations) == 0
@@ -0,0 +1,121 @@
+"""Unit tests for the in-process user type table."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from pydantic import ValidationError
+
+from src.database.models.users import User
+from src.utils import user_type_table as user_type_table_module
+from src.utils.enums import UserTypeEnum
+from src.utils.user_type_table import UnknownUserTypeError, UserTypeTable
+
+
+def _user_type(user_type_id: int = 4, can_read_all: bool = False):
+    now = datetime.now(timezone.utc)
+    return SimpleNamespace(
+        id=user_type_id,
+        created_at=now,
+        updated_at=now,
+        title=UserTypeEnum.USER,
+        description="Regular user.",
+        can_login=True,
+        can_create_own=True,
+        can_read_own=True,
+        can_update_own=True,
+        can_delete_own=True,
+        can_create_all=False,
+        can_read_all=can_read_all,
+        can_update_all=False,
+        can_delete_all=False,
+    )
+
+
+@pytest.fixture
+def get_all(mocker):
+    return mocker.patch.object(
+        user_type_table_module.UserType, "get_all", return_value=[_user_type()]
+    )
+
+
+def test_replace_swaps_in_immutable_snapshots():
+    table = UserTypeTable(ttl_seconds=60)
+
+    table.replace([_user_type()])
+
+    user_type = table.get(4)
+    assert user_type.can_read_own
+    with pytest.raises(ValidationError):
+        user_type.can_read_all = True
+    with pytest.raises(TypeError):
+        table._by_id[5] = user_type
+    with pytest.raises(UnknownUserTypeError):
+        table.get(5)
+
+
+@pytest.mark.anyio
+async def test_refresh_if_stale_loads_once_within_the_ttl(get_all):
+    table = UserTypeTable(ttl_seconds=60)
+
+    await table.refresh_if_stale()
+    await table.refresh_if_stale()
+
+    assert get_all.await_count == 1
+    # Never from a replica, which could still have the rows of before a change.
+    get_all.assert_awaited_with(from_primary=True)
+    assert table.get(4).title == UserTypeEnum.USER
+
+
+@pytest.mark.anyio
+async def test_refresh_if_stale_reloads_after_the_ttl(get_all):
+    table = UserTypeTable(ttl_seconds=0)
+
+    await table.refresh_if_stale()
+    await table.refresh_if_stale()
+
+    assert get_all.await_count == 2
+
+
+def test_user_permissions_resolve_from_the_table(mocker):
+    table = UserTypeTable(ttl_seconds=60)
+    table.replace([_user_type(can_read_all=True)])
+    mocker.patch("src.database.models.users.user_type_table", table)
+
+    user = User(id=1, user_type_id=4, is_active=True, is_blocked=False)
+
+    assert user.user_type_data is table.get(4)
+    assert user.can_read_all
+    assert user.can_login
+
+
+@pytest.mark.anyio
+async def test_require_reloads_once_for_unknown_user_types(get_all):
+    table = UserTypeTable(ttl_seconds=60)
+    table.replace([])
+
+    await table.require(4)
+    await table.require(4)
+    assert get_all.await_count == 1
+    assert 4 in table
+
+    with pytest.raises(UnknownUserTypeError):
+        await table.require(6)
+    assert get_all.await_count == 2
+
+
+@pytest.mark.anyio
+async def test_mark_stale_wins_over_a_concurrent_reload(get_all):
+    table = UserTypeTable(ttl_seconds=60)
+
+    async def get_all_marked_stale_meanwhile(**kwargs):
+        table.mark_stale()
+        return [_user_type()]
+
+    get_all.side_effect = get_all_marked_stale_meanwhile
+    await table.reload()
+    assert table.is_stale()
+
+    get_all.side_effect = None
+    await table.refresh_if_stale()
+    assert not table.is_stale()